@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+asyncio fetch engine for bulk scraping.
+
+Pages are fetched through the shared WikiClient on worker threads, bounded
+by a global concurrency limit and a per-host limit, while a single consumer
+parses and writes each finished page as soon as it arrives. The client's
+per-host token bucket still sets the politeness budget. A slow consumer
+holds up the fetchers, so the pages held in memory stay bounded.
+
+Run this file directly to benchmark throughput against a local stub server;
+tests/test_async_fetch.py checks the same scaling and the per-host limit.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from wiki_client import WikiClient
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PER_HOST_CONCURRENCY = 2
+
+class AsyncFetchEngine:
+    """
+    Fetches `(key, url)` jobs concurrently and hands each result to `handle`.
+
+    `handle(key, fetch_result)` runs on a single consumer thread in completion
+    order, so it can write shared files without extra locking.
+    """
+
+    def __init__(self, client, concurrency=DEFAULT_CONCURRENCY,
+                 per_host_concurrency=DEFAULT_PER_HOST_CONCURRENCY):
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self._host_semaphores = {}
+
+    def _host_semaphore(self, url):
+        host = self.client.host_of(url)
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_semaphores[host]
+
+    async def _fetch(self, loop, executor, semaphore, queue, key, url):
+        async with semaphore:
+            async with self._host_semaphore(url):
+                result = await loop.run_in_executor(executor, self.client.fetch_result, url)
+            # Hand off before releasing the slot: while the consumer is behind,
+            # at most `concurrency` fetched pages wait for the queue
+            await queue.put((key, result))
+
+    async def _consume(self, loop, executor, queue, handle, total):
+        for _ in range(total):
+            key, result = await queue.get()
+            await loop.run_in_executor(executor, handle, key, result)
+
+    async def run(self, jobs, handle):
+        """
+        Fetch every job and process results as they complete.
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as fetch_executor, \
+                ThreadPoolExecutor(max_workers=1) as handle_executor:
+            consumer = asyncio.create_task(self._consume(loop, handle_executor, queue, handle, len(jobs)))
+            fetchers = [
+                asyncio.create_task(self._fetch(loop, fetch_executor, semaphore, queue, key, url))
+                for key, url in jobs
+            ]
+            try:
+                await asyncio.gather(consumer, *fetchers)
+            except BaseException:
+                # A failing handler must not leave fetchers waiting on a full queue
+                for task in [consumer, *fetchers]:
+                    task.cancel()
+                raise
+
+def fetch_pages(client, jobs, handle, concurrency=DEFAULT_CONCURRENCY,
+                per_host_concurrency=DEFAULT_PER_HOST_CONCURRENCY):
+    """
+    Synchronous entry point: fetch all `(key, url)` jobs and call
+    `handle(key, fetch_result)` for each one.
+    """
+    engine = AsyncFetchEngine(client, concurrency, per_host_concurrency)
+    asyncio.run(engine.run(jobs, handle))
+
+def start_stub_server(latency=0.05, body=b"<html><body>stub</body></html>"):
+    """
+    Start a local HTTP server that answers every GET after `latency` seconds.
+    Returns the server; its base URL is http://127.0.0.1:<server.server_port>.
+    `server.peak_in_flight` maps each Host header to the most requests it
+    had open at once.
+    """
+    lock = threading.Lock()
+    in_flight = {}
+    peak_in_flight = {}
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            host = self.headers.get('Host', '')
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak_in_flight[host] = max(peak_in_flight.get(host, 0), in_flight[host])
+            try:
+                time.sleep(latency)
+            finally:
+                with lock:
+                    in_flight[host] -= 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.peak_in_flight = peak_in_flight
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def benchmark(pages=40, latency=0.05, levels=(1, 2, 4, 8)):
+    """
+    Measure pages/second against the stub server at several concurrency levels.
+    """
+    server = start_stub_server(latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    results = []
+    try:
+        for concurrency in levels:
+            client = WikiClient(min_interval=0, max_retries=1, pool_size=concurrency)
+            jobs = [(i, f"{base_url}/wiki/Page_{i}") for i in range(pages)]
+            handled = []
+            start = time.perf_counter()
+            fetch_pages(client, jobs, lambda key, result: handled.append(key),
+                        concurrency=concurrency, per_host_concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            client.close()
+            results.append((concurrency, len(handled), elapsed))
+    finally:
+        server.shutdown()
+
+    print(f"\n=== Fetch Engine Benchmark ({pages} pages, {latency * 1000:.0f} ms latency) ===")
+    print(f"{'concurrency':>11} | {'pages':>5} | {'seconds':>7} | {'pages/s':>7}")
+    for concurrency, handled, elapsed in results:
+        print(f"{concurrency:>11} | {handled:>5} | {elapsed:>7.2f} | {handled / elapsed:>7.1f}")
+    return results
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Eligibility of many stat allocations at once, for build-planning sweeps.
+
+`batch_eligibility` takes an (M x 5) matrix of stat vectors (columns in
+class_eligibility.STATS order: strength, dexterity, intelligence, faith,
+arcane) and compares it with the exported requirement matrix
+(requirements.u8) by broadcasting: each block of builds is compared with
+every item's requirements column by column, giving an (M x N) boolean
+matrix, a packed bitmatrix (one row per build, bit i of byte i // 8 is
+item row i, as in class_eligibility.json) or per-build counts. Blocks are
+sized so the temporary (block x N) arrays stay under MAX_BLOCK_BYTES,
+whatever M is.
+
+`stat_grid` builds the usual sweep: every starting class with every
+combination of the stat-boosting items it can wear at once (the Great
+Rune on or off, up to four talismans), duplicates removed.
+
+Usage:
+    python batch_eligibility.py [--one-hand]   counts for every class and item combination
+    python batch_eligibility.py bench          compare with the per-build object walk
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from class_eligibility import STARTING_CLASSES, STATS, STAT_ITEMS, class_stats, loadout_key, stat_loadouts
+from data_bundle import DEFAULT_RESOURCES_DIR, load_resource_records
+from frontend_items import processed_items
+from requirement_matrix import REQUIREMENT_COLUMNS, RequirementMatrix, _object_walk
+
+# Upper bound on the size of one block's (builds x items) comparison arrays
+MAX_BLOCK_BYTES = 8 * 1024 * 1024
+
+# Requirement matrix column compared with each stat (strength is picked by grip)
+STAT_COLUMNS = {
+    'dexterity': 2,
+    'intelligence': 3,
+    'faith': 4,
+    'arcane': 5,
+}
+
+def requirement_array(requirement_matrix):
+    """
+    The requirement matrix as an (N x 6) uint8 array over its bytes (no copy).
+    """
+    return np.frombuffer(requirement_matrix.matrix, dtype=np.uint8).reshape(
+        requirement_matrix.rows, len(REQUIREMENT_COLUMNS))
+
+def stat_matrix(stat_vectors):
+    """
+    An (M x 5) int32 matrix from stat dicts or sequences in STATS order.
+    """
+    rows = [[vector[stat] for stat in STATS] if isinstance(vector, dict) else list(vector)
+            for vector in stat_vectors]
+    return np.array(rows, dtype=np.int32).reshape(len(rows), len(STATS))
+
+def stat_grid(classes=STARTING_CLASSES, items=STAT_ITEMS):
+    """
+    (labels, M x 5 stat matrix) for every class with every wearable
+    combination of `items` (see stat_loadouts). Combinations giving a class the same stats as an earlier one
+    are dropped; a label is (class name, loadout key).
+    """
+    labels = []
+    vectors = []
+    for class_name in classes:
+        seen = set()
+        for combination in stat_loadouts(items):
+            stats = tuple(class_stats(class_name, combination).values())
+            if stats in seen:
+                continue
+            seen.add(stats)
+            labels.append((class_name, loadout_key(combination)))
+            vectors.append(stats)
+    return labels, stat_matrix(vectors)
+
+def _blocks(builds, items):
+    block = max(1, MAX_BLOCK_BYTES // max(1, items))
+    for start in range(0, builds, block):
+        yield start, min(builds, start + block)
+
+def _block_mask(requirements, stats, two_handed):
+    """
+    (block x N) mask: every requirement column <= the build's stat.
+    """
+    strength = requirements[:, 1 if two_handed else 0]
+    mask = strength[None, :] <= stats[:, 0, None]
+    for stat_number, stat in enumerate(STATS[1:], start=1):
+        mask &= requirements[:, STAT_COLUMNS[stat]][None, :] <= stats[:, stat_number, None]
+    return mask
+
+def batch_eligibility(requirement_matrix, stats, two_handed=True, packed=False):
+    """
+    Which items every build can use: an (M x N) boolean matrix, or with
+    `packed` an (M x ceil(N / 8)) uint8 bitmatrix. `stats` is an (M x 5)
+    matrix (see stat_matrix); strength is compared with the two-handed
+    requirement when `two_handed` is set.
+    """
+    requirements = requirement_array(requirement_matrix)
+    stats = np.asarray(stats, dtype=np.int32)
+    rows = requirement_matrix.rows
+    if packed:
+        result = np.zeros((len(stats), (rows + 7) // 8), dtype=np.uint8)
+    else:
+        result = np.zeros((len(stats), rows), dtype=np.bool_)
+    for start, stop in _blocks(len(stats), rows):
+        mask = _block_mask(requirements, stats[start:stop], two_handed)
+        result[start:stop] = np.packbits(mask, axis=1, bitorder='little') if packed else mask
+    return result
+
+def batch_counts(requirement_matrix, stats, two_handed=True, kind=None):
+    """
+    How many items each build can use, as an (M,) array. `kind` ('weapons'
+    or 'spells') counts only that table's rows.
+    """
+    requirements = requirement_array(requirement_matrix)
+    if kind is not None:
+        start, count = requirement_matrix.index['tables'][kind]
+        requirements = requirements[start:start + count]
+    stats = np.asarray(stats, dtype=np.int32)
+    counts = np.zeros(len(stats), dtype=np.int64)
+    for start, stop in _blocks(len(stats), len(requirements)):
+        counts[start:stop] = _block_mask(requirements, stats[start:stop], two_handed).sum(axis=1)
+    return counts
+
+def benchmark(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    Time the batch evaluation of the full class x item grid (both grips)
+    against the object walk, build by build; both must give the same rows.
+    """
+    weapons, spells = load_resource_records(resources_dir)
+    requirement_matrix = RequirementMatrix.load(resources_dir)
+    items = processed_items(weapons, spells)
+    labels, stats = stat_grid()
+    stat_dicts = [dict(zip(STATS, (int(value) for value in row))) for row in stats]
+
+    start = time.perf_counter()
+    walked = {two: [_object_walk(items, vector, two) for vector in stat_dicts] for two in (True, False)}
+    walk_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = {two: batch_eligibility(requirement_matrix, stats, two) for two in (True, False)}
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for two in (True, False):
+        batch_counts(requirement_matrix, stats, two)
+    count_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for two in (True, False) for mask, rows in zip(masks[two], walked[two])
+                     if np.flatnonzero(mask).tolist() != rows)
+    print(f"\n=== Batch Eligibility Benchmark ({len(labels)} builds x 2 grips, {requirement_matrix.rows} items) ===")
+    print(f"{'method':>11} | {'ms total':>8} | {'speedup':>7} | {'mismatches':>10}")
+    print(f"{'object walk':>11} | {walk_seconds * 1000:>8.1f} | {1:>6.2f}x | {0:>10}")
+    print(f"{'batch':>11} | {batch_seconds * 1000:>8.1f} | {walk_seconds / batch_seconds:>6.2f}x | {mismatches:>10}")
+    print(f"{'counts':>11} | {count_seconds * 1000:>8.1f} | {walk_seconds / count_seconds:>6.2f}x | {'-':>10}")
+    return walk_seconds, batch_seconds, mismatches
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['bench']:
+        benchmark()
+    else:
+        grid_labels, grid_stats = stat_grid()
+        matrix = RequirementMatrix.load()
+        two_hand = '--one-hand' not in sys.argv[1:]
+        weapon_counts = batch_counts(matrix, grid_stats, two_hand, 'weapons')
+        spell_counts = batch_counts(matrix, grid_stats, two_hand, 'spells')
+        for (class_name, key), stat_row, weapon_count, spell_count in zip(grid_labels, grid_stats, weapon_counts, spell_counts):
+            print(f"{class_name:>10} | {key or 'no items':<75} | {' '.join(f'{value:>2}' for value in stat_row)} | "
+                  f"{weapon_count:>3} weapons, {spell_count:>3} spells")
+        print(f"{len(grid_labels)} builds ({'two' if two_hand else 'one'}-handed)")
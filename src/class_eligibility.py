@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Per-starting-class eligibility bitsets for rune level 1 characters.
+
+A rune level 1 character keeps its starting class's stats, so "what can
+this class use" has a fixed answer per class. The export precomputes it
+for every starting class, one-handed and two-handed, with no stat items
+and with the usual stat-boosting items (Godrick's Great Rune, the
+soreseals and heirlooms), into resources/class_eligibility.json.
+
+Each bitset has one bit per row of the requirement matrix (bit i of byte
+i // 8 is row i; weapons, then spells, in data bundle order) and is stored
+base64 encoded. `usable_by_class` answers from the bitsets with a name
+lookup and one bit test.
+
+Usage:
+    python class_eligibility.py [resources_dir]                  write the bitsets
+    python class_eligibility.py <class> [items...] [--two-hand]  list what a class can use
+"""
+
+import base64
+import json
+import os
+import sys
+from functools import lru_cache
+from itertools import combinations, compress
+
+from data_bundle import DEFAULT_RESOURCES_DIR
+from requirement_matrix import RequirementMatrix
+
+ELIGIBILITY_FILENAME = "class_eligibility.json"
+ELIGIBILITY_VERSION = 1
+
+# Starting stats of each class (level, strength, dexterity, intelligence, faith, arcane)
+STARTING_CLASSES = {
+    'Vagabond': (9, 14, 13, 9, 9, 7),
+    'Warrior': (8, 10, 16, 10, 8, 9),
+    'Hero': (7, 16, 9, 7, 8, 11),
+    'Bandit': (5, 9, 13, 9, 8, 14),
+    'Astrologer': (6, 8, 12, 16, 7, 9),
+    'Prophet': (7, 11, 10, 7, 16, 10),
+    'Samurai': (9, 12, 15, 9, 8, 8),
+    'Prisoner': (9, 11, 14, 14, 6, 9),
+    'Confessor': (10, 12, 12, 9, 14, 9),
+    'Wretch': (1, 10, 10, 10, 10, 10),
+}
+STATS = ('strength', 'dexterity', 'intelligence', 'faith', 'arcane')
+
+# Stat bonuses of the common stat-boosting items
+STAT_ITEMS = {
+    "Godrick's Great Rune": {'strength': 5, 'dexterity': 5, 'intelligence': 5, 'faith': 5, 'arcane': 5},
+    "Radagon's Soreseal": {'strength': 5, 'dexterity': 5},
+    "Marika's Soreseal": {'intelligence': 5, 'faith': 5, 'arcane': 5},
+    "Starscourge Heirloom": {'strength': 5},
+    "Prosthesis-Wearer Heirloom": {'dexterity': 5},
+    "Stargazer Heirloom": {'intelligence': 5},
+    "Two Fingers Heirloom": {'faith': 5},
+}
+
+# Talismans worn at once; the Great Rune is not a talisman, and only one is active
+TALISMAN_SLOTS = 4
+GREAT_RUNES = {"Godrick's Great Rune"}
+
+# Item combinations with precomputed bitsets: none, each item alone, and
+# the Great Rune with both soreseals
+LOADOUTS = [()] + [(item,) for item in STAT_ITEMS] + [
+    ("Godrick's Great Rune", "Marika's Soreseal", "Radagon's Soreseal"),
+]
+
+def loadout_key(items=()):
+    """
+    The bitset key of a combination of stat items ('' for none).
+    """
+    unknown = [item for item in items if item not in STAT_ITEMS]
+    if unknown:
+        raise ValueError(f"Unknown stat items: {', '.join(unknown)}")
+    return ' + '.join(sorted(set(items)))
+
+def _wearable(items):
+    items = set(items)
+    return len(items & GREAT_RUNES) <= 1 and len(items - GREAT_RUNES) <= TALISMAN_SLOTS
+
+def stat_loadouts(items=STAT_ITEMS):
+    """
+    Every combination of `items` a character can have active at once: at
+    most one Great Rune and TALISMAN_SLOTS talismans. Fewest items first.
+    """
+    return [combination for size in range(len(items) + 1)
+            for combination in combinations(items, size) if _wearable(combination)]
+
+def class_stats(class_name, items=()):
+    """
+    The stats of a starting class with stat items applied. Raises
+    ValueError for items that cannot all be active at once.
+    """
+    if class_name not in STARTING_CLASSES:
+        raise ValueError(f"Unknown starting class '{class_name}'")
+    if not _wearable(items):
+        raise ValueError(f"More than one Great Rune or {TALISMAN_SLOTS} talismans: {', '.join(sorted(set(items)))}")
+    stats = dict(zip(STATS, STARTING_CLASSES[class_name][1:]))
+    for item in set(items):
+        for stat, bonus in STAT_ITEMS[item].items():
+            stats[stat] += bonus
+    return stats
+
+def _pack_bits(mask):
+    """
+    Pack a one-byte-per-row mask into a little-endian bitset.
+    """
+    bits = 0
+    for row in compress(range(len(mask)), mask):
+        bits |= 1 << row
+    return bits.to_bytes((len(mask) + 7) // 8, 'little')
+
+def build_class_eligibility(requirement_matrix):
+    """
+    The bitsets of every class, loadout and grip for a requirement matrix.
+    """
+    bitsets = {}
+    for class_name in STARTING_CLASSES:
+        for items in LOADOUTS:
+            stats = class_stats(class_name, items)
+            bitsets.setdefault(class_name, {})[loadout_key(items)] = {
+                grip: base64.b64encode(_pack_bits(requirement_matrix.eligible_mask(stats, two_handed))).decode('ascii')
+                for grip, two_handed in (('one_hand', False), ('two_hand', True))
+            }
+    return {
+        'version': ELIGIBILITY_VERSION,
+        'rows': requirement_matrix.rows,
+        'classes': {name: dict(zip(('level',) + STATS, values)) for name, values in STARTING_CLASSES.items()},
+        'items': STAT_ITEMS,
+        'bitsets': bitsets,
+    }
+
+def write_class_eligibility(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    Compute the bitsets from the exported requirement matrix and write them.
+    Returns the files written.
+    """
+    eligibility = build_class_eligibility(RequirementMatrix.load(resources_dir))
+    path = os.path.join(resources_dir, ELIGIBILITY_FILENAME)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(eligibility, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + ".tmp", path)
+    print(f"✓ Wrote {path} ({len(STARTING_CLASSES)} classes, {len(LOADOUTS)} item loadouts)")
+    return [path]
+
+class ClassEligibility:
+    """
+    Decoded bitsets plus a name -> row lookup.
+    """
+
+    def __init__(self, eligibility, requirement_matrix):
+        if eligibility.get('version') != ELIGIBILITY_VERSION:
+            raise ValueError(f"Unsupported class eligibility version {eligibility.get('version')} (expected {ELIGIBILITY_VERSION})")
+        if eligibility['rows'] != requirement_matrix.rows:
+            raise ValueError("Class eligibility bitsets do not match the requirement matrix")
+        self.requirement_matrix = requirement_matrix
+        self.bitsets = {
+            class_name: {key: {grip: base64.b64decode(bits) for grip, bits in grips.items()}
+                         for key, grips in loadouts.items()}
+            for class_name, loadouts in eligibility['bitsets'].items()
+        }
+        self.rows = {}  # (kind, name) -> row
+        for kind, (start, count) in requirement_matrix.index['tables'].items():
+            for row in range(start, start + count):
+                self.rows.setdefault((kind, requirement_matrix.names[row]), row)
+
+    def bitset(self, class_name, two_handed=False, items=()):
+        if class_name not in self.bitsets:
+            raise ValueError(f"Unknown starting class '{class_name}'")
+        key = loadout_key(items)
+        if key not in self.bitsets[class_name]:
+            raise ValueError(f"No precomputed bitset for the items: {key}")
+        return self.bitsets[class_name][key]['two_hand' if two_handed else 'one_hand']
+
+    def row(self, name, kind=None):
+        """
+        The row of a weapon or spell by name (weapons first unless `kind`
+        is 'weapons' or 'spells'), or None.
+        """
+        for table in ((kind,) if kind else ('weapons', 'spells')):
+            row = self.rows.get((table, name))
+            if row is not None:
+                return row
+        return None
+
+    def usable(self, name, class_name, two_handed=False, items=(), kind=None):
+        row = self.row(name, kind)
+        if row is None:
+            raise KeyError(name)
+        return bool(self.bitset(class_name, two_handed, items)[row >> 3] >> (row & 7) & 1)
+
+    def usable_names(self, class_name, two_handed=False, items=()):
+        bits = self.bitset(class_name, two_handed, items)
+        return [self.requirement_matrix.names[row] for row in range(self.requirement_matrix.rows)
+                if bits[row >> 3] >> (row & 7) & 1]
+
+@lru_cache(maxsize=None)
+def load_class_eligibility(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    Load the exported bitsets once.
+    """
+    with open(os.path.join(resources_dir, ELIGIBILITY_FILENAME), 'r', encoding='utf-8') as f:
+        eligibility = json.load(f)
+    return ClassEligibility(eligibility, RequirementMatrix.load(resources_dir))
+
+def usable_by_class(name, class_name, two_handed=False, items=(), kind=None):
+    """
+    Whether a rune level 1 `class_name` can use the weapon or spell `name`,
+    one- or two-handed, with the given stat items (a precomputed loadout).
+    """
+    return load_class_eligibility().usable(name, class_name, two_handed, tuple(items), kind)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] in STARTING_CLASSES:
+        two_handed = '--two-hand' in args
+        items = [arg for arg in args[1:] if arg != '--two-hand']
+        names = load_class_eligibility().usable_names(args[0], two_handed, items)
+        for item_name in names:
+            print(item_name)
+        print(f"{args[0]} ({'two' if two_handed else 'one'}-handed, items: {loadout_key(items) or 'none'}): "
+              f"{len(names)} usable")
+    else:
+        write_class_eligibility(*args[:1])
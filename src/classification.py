@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Classification tables for weapons and spells.
+
+Attack types, status buildup and spell damage types come from the versioned
+data file classification_data.json. It is loaded once into an immutable
+ClassificationIndex, where classifying an item takes a dictionary lookup
+instead of rebuilding every table on each call.
+
+Run this file directly to list table entries that match no item in the
+scraped resource files (usually a typo or a renamed wiki page).
+"""
+
+import glob
+import json
+import os
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+CLASSIFICATION_SCHEMA_VERSION = 1
+DEFAULT_CLASSIFICATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classification_data.json")
+DEFAULT_RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+
+SPELL_DAMAGE_TYPE_ORDER = ['Fire', 'Lightning', 'Holy', 'Physical', 'Magic']
+
+# Groups holding several keyed tables rather than a single table
+NESTED_TABLE_GROUPS = ('status_buildup', 'attack_types', 'damage_types')
+
+EMPTY = frozenset()
+
+def flatten_names(table):
+    """
+    A table is either a list of names or an object of commented groups of names.
+    """
+    if isinstance(table, dict):
+        return [name for group in table.values() for name in group]
+    return list(table)
+
+def _first_match_index(tables):
+    """
+    Map each name to the key of the first table containing it (tables are in precedence order).
+    """
+    index = {}
+    for key, table in tables.items():
+        for name in flatten_names(table):
+            index.setdefault(name, key)
+    return MappingProxyType(index)
+
+def _membership_index(tables):
+    """
+    Map each name to the frozenset of table keys containing it.
+    """
+    index = {}
+    for key, table in tables.items():
+        for name in flatten_names(table):
+            index.setdefault(name, set()).add(key)
+    return MappingProxyType({name: frozenset(keys) for name, keys in index.items()})
+
+class ClassificationIndex:
+    """
+    Read-only name -> classification lookups built from the data file.
+    All lookups are mapping proxies over frozen values.
+    """
+
+    def __init__(self, data, path=None):
+        version = data.get('version')
+        if version != CLASSIFICATION_SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported classification data version {version} in {path} "
+                f"(expected {CLASSIFICATION_SCHEMA_VERSION})"
+            )
+        self.path = path
+        self.version = version
+
+        weapons = data['weapons']
+        spells = data['spells']
+        # Kept for validation: table path -> names
+        self._tables = {}
+        for section, groups in (('weapons', weapons), ('spells', spells)):
+            for group, tables in groups.items():
+                if group in NESTED_TABLE_GROUPS:
+                    for key, table in tables.items():
+                        self._tables[f"{section}.{group}.{key}"] = tuple(flatten_names(table))
+                else:
+                    self._tables[f"{section}.{group}"] = tuple(flatten_names(tables))
+        self._tables = MappingProxyType(self._tables)
+
+        self._weapon_status = _first_match_index(weapons['status_buildup'])
+        # Attack tables named *_weapon_types list weapon types, the rest list weapon names
+        attack_types = weapons['attack_types']
+        self._weapon_type_tags = _membership_index(
+            {key: table for key, table in attack_types.items() if key.endswith('_weapon_types')}
+        )
+        self._weapon_name_tags = _membership_index(
+            {key: table for key, table in attack_types.items() if not key.endswith('_weapon_types')}
+        )
+        self._spell_status = _first_match_index(spells['status_buildup'])
+        spell_damage = _membership_index(spells['damage_types'])
+        self._spell_damage = MappingProxyType({
+            name: tuple(damage for damage in SPELL_DAMAGE_TYPE_ORDER if damage in damage_types)
+            for name, damage_types in spell_damage.items()
+        })
+        self._magic_sorcery_bonuses = frozenset(flatten_names(spells['magic_sorcery_bonuses']))
+        self._magic_sorcery_exceptions = frozenset(flatten_names(spells['magic_sorcery_exceptions']))
+
+    def weapon_status_buildup(self, weapon_name):
+        """
+        Status type of a weapon, or "none".
+        """
+        return self._weapon_status.get(weapon_name, "none")
+
+    def weapon_attack_types(self, weapon_name, weapon_type):
+        """
+        Primary and secondary attack types from the weapon's type and name.
+        """
+        type_tags = self._weapon_type_tags.get(weapon_type, EMPTY)
+        name_tags = self._weapon_name_tags.get(weapon_name, EMPTY)
+
+        # Determine primary attack type
+        if 'spell_weapon_types' in type_tags:
+            primary = "Spell"
+        elif 'slash_weapon_types' in type_tags or 'slash_specific_weapons' in name_tags:
+            primary = "Slash"
+        elif 'pierce_weapon_types' in type_tags or 'pierce_specific_weapons' in name_tags:
+            primary = "Pierce"
+        elif 'strike_weapon_types' in type_tags or 'strike_specific_weapons' in name_tags:
+            primary = "Strike"
+        else:
+            # Standard weapon classes, standard exceptions and the default fallback
+            primary = "Standard"
+
+        # Determine secondary attack type
+        if 'pierce_secondary_weapon_types' in type_tags:
+            secondary = "Pierce"
+        elif 'standard_secondary_weapon_types' in type_tags:
+            secondary = "Standard"
+        else:
+            # For now, secondary is the same as primary
+            secondary = primary
+
+        return {
+            "primary": primary,
+            "secondary": secondary
+        }
+
+    def spell_status_buildup(self, spell_name):
+        """
+        Status type of a spell, or "none".
+        """
+        return self._spell_status.get(spell_name, "none")
+
+    def spell_damage_types(self, spell_name, spell_type, bonus):
+        """
+        Damage types of a spell, in the order Fire, Lightning, Holy, Physical, Magic.
+        """
+        damage_types = list(self._spell_damage.get(spell_name, ()))
+        if ('Magic' not in damage_types and spell_type == "Sorcery"
+                and bonus in self._magic_sorcery_bonuses and spell_name not in self._magic_sorcery_exceptions):
+            damage_types.append("Magic")
+        return damage_types
+
+    def tables(self):
+        """
+        Every table as {dotted path: names}.
+        """
+        return self._tables
+
+    def unmatched_names(self, weapon_names=(), weapon_types=(), spell_names=(), spell_bonuses=()):
+        """
+        Find table entries that never match a scraped item.
+        Weapon attack tables named `*_weapon_types` hold weapon types; every
+        other weapon table holds weapon names. `magic_sorcery_bonuses` holds
+        spell bonuses. Returns {dotted path: sorted unmatched names}.
+        """
+        known = {
+            'weapon_names': set(weapon_names),
+            'weapon_types': set(weapon_types),
+            'spell_names': set(spell_names),
+            'spell_bonuses': set(spell_bonuses)
+        }
+        unmatched = {}
+        for path, names in self._tables.items():
+            if path.startswith('weapons.'):
+                kind = 'weapon_types' if path.endswith('_weapon_types') else 'weapon_names'
+            else:
+                kind = 'spell_bonuses' if path == 'spells.magic_sorcery_bonuses' else 'spell_names'
+            if not known[kind]:
+                continue
+            missing = sorted(name for name in names if name not in known[kind])
+            if missing:
+                unmatched[path] = missing
+        return unmatched
+
+@lru_cache(maxsize=None)
+def load_classification_index(path=DEFAULT_CLASSIFICATION_FILE):
+    """
+    Load the classification data file once and return its frozen index.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return ClassificationIndex(data, path)
+
+def report_unmatched_names(index, **scraped):
+    """
+    Print the table entries that match no scraped item. Returns them.
+    """
+    unmatched = index.unmatched_names(**scraped)
+    if not unmatched:
+        print("Classification check: every table entry matches a scraped item")
+        return unmatched
+    total = sum(len(names) for names in unmatched.values())
+    print(f"\n=== Classification check: {total} table entries match no scraped item ===")
+    for path, names in unmatched.items():
+        for name in names:
+            print(f"Unmatched in {path}: {name}")
+    return unmatched
+
+def validate_resources(resources_dir=DEFAULT_RESOURCES_DIR, path=DEFAULT_CLASSIFICATION_FILE):
+    """
+    Check the classification tables against the weapon and spell resource files.
+    """
+    weapons = []
+    for filename in sorted(glob.glob(os.path.join(resources_dir, "weapons_*.json"))):
+        with open(filename, 'r', encoding='utf-8') as f:
+            weapons.extend(json.load(f))
+    spells = []
+    for filename in sorted(glob.glob(os.path.join(resources_dir, "spells_*.json"))):
+        with open(filename, 'r', encoding='utf-8') as f:
+            spells.extend(json.load(f))
+    print(f"Checking {path} against {len(weapons)} weapons and {len(spells)} spells")
+    return report_unmatched_names(
+        load_classification_index(path),
+        weapon_names=[weapon['weapon_name'] for weapon in weapons],
+        weapon_types=[weapon['weapon_type'] for weapon in weapons],
+        spell_names=[spell['spell_name'] for spell in spells],
+        spell_bonuses=[spell['bonus'] for spell in spells]
+    )
+
+if __name__ == "__main__":
+    validate_resources(*sys.argv[1:2])
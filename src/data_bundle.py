@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Build the single data bundle the frontend loads.
+
+The scrapers' per-type resource files (weapons_<type>.json, spells_<type>.json)
+are pretty-printed arrays of records that repeat every key. This folds them
+into one minified, columnar file, resources/data_bundle.json:
+
+- every field is a column (one array per field, row i of every column is
+  item i), so keys appear once instead of once per record
+- enumerated strings (weapon type, damage/attack types, status buildup,
+  spell type and bonus) are stored as integer codes into lookup tables
+- URL columns drop the prefix shared by every value, stored once per column
+- facet codes and masks (see facets.py) are plain integer columns, and
+  the facet vocabularies are copied in as `facet_vocabularies`
+
+The build decodes the bundle again and compares it with the source records
+before writing. src/utils/dataBundle.ts imports and decodes it; Vite inlines
+it into the JavaScript chunk, which the host compresses like any other
+asset, so no precompressed copies are written (old ones are removed).
+
+Usage:
+    python data_bundle.py [resources_dir]
+"""
+
+import glob
+import json
+import os
+import sys
+
+DEFAULT_RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+BUNDLE_FILENAME = "data_bundle.json"
+BUNDLE_VERSION = 1
+# Precompressed bundle copies earlier exports wrote next to the bundle
+OBSOLETE_BUNDLE_EXTENSIONS = ('.br', '.gz')
+FACET_DICTIONARY_FILENAME = "facet_dictionary.json"  # Written by facets.py
+
+# Weapon files in the order the frontend lists them; files not named here follow, sorted
+WEAPON_FILE_ORDER = [
+    "weapons_thrusting_shields.json",
+    "weapons_greatshields.json",
+    "weapons_medium_shields.json",
+    "weapons_small_shields.json",
+    "weapons_torches.json",
+    "weapons_sacred_seals.json",
+    "weapons_staves.json",
+    "weapons_ballista.json",
+    "weapons_crossbows.json",
+    "weapons_greatbows.json",
+    "weapons_bows.json",
+    "weapons_light_bows.json",
+    "weapons_perfume_bottles.json",
+    "weapons_beast_claws.json",
+    "weapons_claws.json",
+    "weapons_hand_to_hand.json",
+    "weapons_fists.json",
+    "weapons_whips.json",
+    "weapons_reapers.json",
+    "weapons_halberds.json",
+    "weapons_great_spears.json",
+    "weapons_spears.json",
+    "weapons_colossal_weapons.json",
+    "weapons_great_hammers.json",
+    "weapons_flails.json",
+    "weapons_hammers.json",
+    "weapons_greataxes.json",
+    "weapons_axes.json",
+    "weapons_twinblades.json",
+    "weapons_great_katanas.json",
+    "weapons_katanas.json",
+    "weapons_backhand_blades.json",
+    "weapons_curved_greatswords.json",
+    "weapons_curved_swords.json",
+    "weapons_heavy_thrusting_swords.json",
+    "weapons_thrusting_swords.json",
+    "weapons_colossal_swords.json",
+    "weapons_greatswords.json",
+    "weapons_light_greatswords.json",
+    "weapons_straight_swords.json",
+    "weapons_daggers.json",
+    "weapons_throwing_blades.json",
+]
+
+SPELL_FILE_ORDER = [
+    "spells_sorcery.json",
+    "spells_incantation.json",
+]
+
+# (column, path of keys into the record, encoding). An encoding is 'text',
+# 'url' (prefix stripped), 'int', 'bool', the name of an enum table, or an
+# enum table name with '[]' for lists of codes.
+WEAPON_COLUMNS = [
+    ('weapon_name', ('weapon_name',), 'text'),
+    ('weapon_type', ('weapon_type',), 'weapon_type'),
+    ('wikiGGLink', ('wikiGGLink',), 'url'),
+    ('wikiFextralifeLink', ('wikiFextralifeLink',), 'url'),
+    ('strength_one_hand', ('attributes', 'strength', 'one_hand'), 'int'),
+    ('strength_two_hand', ('attributes', 'strength', 'two_hand'), 'int'),
+    ('dexterity', ('attributes', 'dexterity'), 'int'),
+    ('intelligence', ('attributes', 'intelligence'), 'int'),
+    ('faith', ('attributes', 'faith'), 'int'),
+    ('arcane', ('attributes', 'arcane'), 'int'),
+    ('damage_major', ('damage_types', 'major'), 'damage_type'),
+    ('damage_minor', ('damage_types', 'minor'), 'damage_type[]'),
+    ('attack_primary', ('attack_types', 'primary'), 'attack_type'),
+    ('attack_secondary', ('attack_types', 'secondary'), 'attack_type'),
+    ('status_buildup', ('status_buildup',), 'status_buildup'),
+    ('image_src', ('image', 'src'), 'url'),
+    ('image_alt', ('image', 'alt'), 'text'),
+    ('image_title', ('image', 'title'), 'text'),
+    ('dlc_exclusive', ('dlc_exclusive',), 'bool'),
+    ('facet_weapon_type', ('facets', 'weapon_type'), 'int'),
+    ('facet_damage_major', ('facets', 'damage_major'), 'int'),
+    ('facet_damage_minor', ('facets', 'damage_minor'), 'int'),
+    ('facet_attack_primary', ('facets', 'attack_primary'), 'int'),
+    ('facet_attack_secondary', ('facets', 'attack_secondary'), 'int'),
+    ('facet_status_buildup', ('facets', 'status_buildup'), 'int'),
+    ('facet_dlc_exclusive', ('facets', 'dlc_exclusive'), 'int'),
+]
+
+SPELL_COLUMNS = [
+    ('spell_name', ('spell_name',), 'text'),
+    ('spell_type', ('spell_type',), 'spell_type'),
+    ('intelligence', ('requirements', 'intelligence'), 'int'),
+    ('faith', ('requirements', 'faith'), 'int'),
+    ('arcane', ('requirements', 'arcane'), 'int'),
+    ('bonus', ('bonus',), 'bonus'),
+    ('dlc_exclusive', ('dlc_exclusive',), 'bool'),
+    ('damage_types', ('damage_types',), 'damage_type[]'),
+    ('status_buildup', ('status_buildup',), 'status_buildup'),
+    ('wikiGGLink', ('wikiGGLink',), 'url'),
+    ('wikiFextralifeLink', ('wikiFextralifeLink',), 'url'),
+    ('imageUrl', ('imageUrl',), 'url'),
+    ('facet_spell_type', ('facets', 'spell_type'), 'int'),
+    ('facet_damage_types', ('facets', 'damage_types'), 'int'),
+    ('facet_status_buildup', ('facets', 'status_buildup'), 'int'),
+    ('facet_dlc_exclusive', ('facets', 'dlc_exclusive'), 'int'),
+]
+
+# Enum tables whose codes keep first-seen order (so weapon types follow the
+# file order); every other table is sorted
+ORDERED_ENUMS = {'weapon_type', 'spell_type'}
+
+def _get(record, path):
+    for key in path:
+        record = record[key]
+    return record
+
+def _set(record, path, value):
+    for key in path[:-1]:
+        record = record.setdefault(key, {})
+    record[path[-1]] = value
+
+def _common_prefix(values):
+    present = [value for value in values if value is not None]
+    return os.path.commonprefix(present) if len(present) > 1 else ''
+
+def load_resource_records(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    Weapon and spell records from the per-type resource files, in frontend order.
+    """
+    def ordered(pattern, order):
+        present = {os.path.basename(path) for path in glob.glob(os.path.join(resources_dir, pattern))}
+        return [name for name in order if name in present] + sorted(present - set(order))
+
+    def read(filenames):
+        records = []
+        for filename in filenames:
+            with open(os.path.join(resources_dir, filename), 'r', encoding='utf-8') as f:
+                records.extend(json.load(f))
+        return records
+
+    weapons = read(ordered('weapons_*.json', WEAPON_FILE_ORDER))
+    spells = read(ordered('spells_*.json', SPELL_FILE_ORDER))
+    return weapons, spells
+
+def _encode_table(records, columns, enums):
+    table = {'count': len(records), 'prefixes': {}, 'columns': {}}
+    for column, path, encoding in columns:
+        values = [_get(record, path) for record in records]
+        if encoding == 'url':
+            prefix = _common_prefix(values)
+            if prefix:
+                table['prefixes'][column] = prefix
+            values = [value[len(prefix):] if value is not None else None for value in values]
+        elif encoding == 'int':
+            values = [int(value) for value in values]
+        elif encoding == 'bool':
+            values = [1 if value else 0 for value in values]
+        elif encoding.endswith('[]'):
+            lookup = enums[encoding[:-2]]
+            values = [[lookup.index(item) for item in value] for value in values]
+        elif encoding != 'text':
+            values = [enums[encoding].index(value) for value in values]
+        table['columns'][column] = values
+    return table
+
+def _enum_tables(weapons, spells):
+    seen = {}
+    for records, columns in ((weapons, WEAPON_COLUMNS), (spells, SPELL_COLUMNS)):
+        for column, path, encoding in columns:
+            if encoding in ('text', 'url', 'int', 'bool'):
+                continue
+            name = encoding[:-2] if encoding.endswith('[]') else encoding
+            values = seen.setdefault(name, {})
+            for record in records:
+                value = _get(record, path)
+                for item in (value if encoding.endswith('[]') else [value]):
+                    values.setdefault(item, len(values))
+    return {name: list(values) if name in ORDERED_ENUMS else sorted(values) for name, values in seen.items()}
+
+def build_bundle(weapons, spells):
+    """
+    The bundle as a dict: enum tables plus a columnar table per item kind.
+    """
+    enums = _enum_tables(weapons, spells)
+    return {
+        'version': BUNDLE_VERSION,
+        'enums': enums,
+        'weapons': _encode_table(weapons, WEAPON_COLUMNS, enums),
+        'spells': _encode_table(spells, SPELL_COLUMNS, enums),
+    }
+
+def _decode_table(table, columns, enums):
+    records = [{} for _ in range(table['count'])]
+    for column, path, encoding in columns:
+        values = table['columns'][column]
+        if encoding == 'url':
+            prefix = table['prefixes'].get(column, '')
+            values = [prefix + value if value is not None else None for value in values]
+        elif encoding == 'bool':
+            values = [bool(value) for value in values]
+        elif encoding.endswith('[]'):
+            lookup = enums[encoding[:-2]]
+            values = [[lookup[code] for code in value] for value in values]
+        elif encoding not in ('text', 'int'):
+            values = [enums[encoding][code] for code in values]
+        for record, value in zip(records, values):
+            _set(record, path, value)
+    return records
+
+def decode_bundle(bundle):
+    """
+    (weapons, spells) records from a bundle; the inverse of build_bundle.
+    """
+    if bundle.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported data bundle version {bundle.get('version')} (expected {BUNDLE_VERSION})")
+    enums = bundle['enums']
+    return (_decode_table(bundle['weapons'], WEAPON_COLUMNS, enums),
+            _decode_table(bundle['spells'], SPELL_COLUMNS, enums))
+
+def load_bundle(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    The written bundle as a dict (decode it with decode_bundle).
+    """
+    with open(os.path.join(resources_dir, BUNDLE_FILENAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_bytes_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_bundle(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    Build the bundle from the resource files in `resources_dir`, check that
+    it decodes back to the same records and write it. Returns the files written.
+    """
+    weapons, spells = load_resource_records(resources_dir)
+    bundle = build_bundle(weapons, spells)
+    if decode_bundle(bundle) != (weapons, spells):
+        raise ValueError("Data bundle does not decode back to the resource records")
+    dictionary_path = os.path.join(resources_dir, FACET_DICTIONARY_FILENAME)
+    if os.path.exists(dictionary_path):
+        with open(dictionary_path, 'r', encoding='utf-8') as f:
+            bundle['facet_vocabularies'] = json.load(f)['vocabularies']
+
+    data = json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    bundle_path = os.path.join(resources_dir, BUNDLE_FILENAME)
+    _write_bytes_atomic(bundle_path, data)
+    print(f"✓ Wrote {bundle_path} ({len(data)} bytes)")
+    # Precompressed copies from earlier exports would be stale; nothing serves them
+    for extension in OBSOLETE_BUNDLE_EXTENSIONS:
+        if os.path.exists(bundle_path + extension):
+            os.remove(bundle_path + extension)
+            print(f"✓ Removed {bundle_path + extension}")
+    print(f"Bundled {len(weapons)} weapons and {len(spells)} spells")
+    return [bundle_path]
+
+if __name__ == "__main__":
+    write_bundle(*sys.argv[1:2])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Persistent dead-letter queue for URLs the scrapers could not fetch.
+
+Entries survive between runs, so a failed page is retried by the next pass
+instead of silently leaving a hole in the output files.
+"""
+
+import json
+import os
+import threading
+import time
+
+DEFAULT_DEAD_LETTER_FILE = os.path.join("progress", "dead_letter.json")
+
+class DeadLetterQueue:
+    """
+    JSON-backed map of url -> {'reason', 'failures', 'last_failed_at'}.
+    """
+
+    def __init__(self, path=DEFAULT_DEAD_LETTER_FILE):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._entries = json.load(f)
+                except Exception as e:
+                    print(f"Could not load dead-letter file {self.path}: {e}")
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def add(self, url, reason):
+        """
+        Record a URL that failed after all retries.
+        """
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(url, {'failures': 0})
+            entries[url] = {
+                'reason': reason,
+                'failures': entry['failures'] + 1,
+                'last_failed_at': time.time()
+            }
+            self._save()
+        print(f"Added to dead-letter file: {url}")
+
+    def remove(self, url):
+        """
+        Drop a URL once it has been fetched successfully.
+        """
+        with self._lock:
+            entries = self._load()
+            if url in entries:
+                del entries[url]
+                self._save()
+                print(f"Recovered from dead-letter file: {url}")
+
+    def urls(self):
+        with self._lock:
+            return list(self._load())
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._load()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Staged fetch -> extract -> write pipeline for bulk scraping.
+
+Fetchers (async_fetch or the MediaWiki API) hand each page to `submit`,
+which puts it on a bounded queue. A dispatcher thread feeds a
+ProcessPoolExecutor of extractor workers, so BeautifulSoup parsing runs on
+every core instead of between network waits. A single writer thread gets
+every result in completion order and calls `write`, and `flush` once per
+batch, so output files are rewritten once per batch instead of once per
+page.
+
+Memory stays bounded: `submit` blocks while the queue is full, and no more
+than `max_pending` pages are extracting or waiting for the writer at once.
+A blocked `submit` holds up the fetch consumer, which in turn holds up the
+fetchers.
+
+Each stage keeps throughput counters, and `report` says whether a run was
+limited by the network or by extraction.
+"""
+
+import contextlib
+import io
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+DEFAULT_QUEUE_SIZE = 16  # Fetched pages waiting for an extractor
+DEFAULT_BATCH_SIZE = 25  # Results written between flushes
+DEFAULT_FLUSH_INTERVAL = 30  # Seconds between flushes when results trickle in
+
+_EXTRACT = 'extract'
+_PASS_THROUGH = 'pass'
+_DONE = object()
+
+def _run_extract(extract, payload):
+    """
+    Worker entry point: run `extract(payload)` with its output captured.
+    Returns (result, captured output, CPU seconds).
+    """
+    output = io.StringIO()
+    start = time.process_time()
+    with contextlib.redirect_stdout(output):
+        result = extract(payload)
+    return result, output.getvalue(), time.process_time() - start
+
+class StageCounter:
+    """
+    Items handled by one stage, and where its time went.
+    `busy` is time doing work, `blocked` is time waiting on the next stage
+    and `idle` is time waiting on the previous one.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.idle = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, items=0, busy=0.0, blocked=0.0, idle=0.0):
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.blocked += blocked
+            self.idle += idle
+
+class ExtractPipeline:
+    """
+    Runs `extract(payload)` in worker processes and hands every result to
+    `write(key, result, error)` on a single writer thread.
+
+    `extract` must be a module-level function (workers import it by name).
+    `write` gets `error` set, and `result` None, when extraction raised.
+    `flush()` runs on the writer thread after every `batch_size` results,
+    after `flush_interval` seconds with unflushed results, and on close.
+    """
+
+    def __init__(self, extract, write, flush=None, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL, max_pending=None):
+        self.extract = extract
+        self.write = write
+        self.flush = flush
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.counters = {
+            'fetch': StageCounter('fetch'),
+            'extract': StageCounter('extract'),
+            'write': StageCounter('write'),
+        }
+        self.flushes = 0
+        self._inbox = queue.Queue(maxsize=max(1, queue_size))
+        self._results = queue.Queue()
+        # Pages extracting or extracted but not yet written
+        self._max_pending = max_pending or self.workers * 2
+        self._pending = threading.BoundedSemaphore(self._max_pending)
+        self._executor = None
+        self._threads = []
+        self._started = None
+        self._elapsed = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Start the workers now, before this process has other threads to fork
+        self._executor.submit(os.getpid).result()
+        self._threads = [
+            threading.Thread(target=self._dispatch, name="extract-dispatcher", daemon=True),
+            threading.Thread(target=self._write_results, name="extract-writer", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _put(self, item):
+        start = time.perf_counter()
+        self._inbox.put(item)
+        self.counters['fetch'].add(items=1, blocked=time.perf_counter() - start)
+
+    def submit(self, key, payload):
+        """
+        Queue a fetched page for extraction. Blocks while the queue is full.
+        """
+        self._put((_EXTRACT, key, payload))
+
+    def pass_through(self, key, result):
+        """
+        Send a result that needs no extraction (a failed fetch, an unchanged
+        page) to the writer, through the same bounded queue.
+        """
+        self._put((_PASS_THROUGH, key, result))
+
+    def _dispatch(self):
+        counter = self.counters['extract']
+        while True:
+            start = time.perf_counter()
+            item = self._inbox.get()
+            waited = time.perf_counter() - start
+            if item is _DONE:
+                counter.add(idle=waited)
+                # Every slot free again means every page has been written
+                for _ in range(self._max_pending):
+                    self._pending.acquire()
+                self._results.put(_DONE)
+                return
+            start = time.perf_counter()
+            self._pending.acquire()
+            counter.add(idle=waited, blocked=time.perf_counter() - start)
+
+            kind, key, payload = item
+            if kind == _PASS_THROUGH:
+                self._results.put((key, None, payload))
+                continue
+            future = self._executor.submit(_run_extract, self.extract, payload)
+            future.add_done_callback(lambda done, key=key: self._results.put((key, done, None)))
+
+    def _write_results(self):
+        counter = self.counters['write']
+        unflushed = 0
+        last_flush = time.perf_counter()
+        while True:
+            start = time.perf_counter()
+            try:
+                timeout = max(0.0, last_flush + self.flush_interval - start) if unflushed else None
+                item = self._results.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            counter.add(idle=time.perf_counter() - start)
+
+            if item is not None and item is not _DONE:
+                key, future, result = item
+                error = None
+                if future is not None:
+                    try:
+                        result, output, cpu_seconds = future.result()
+                        self.counters['extract'].add(items=1, busy=cpu_seconds)
+                    except Exception as e:
+                        result, output, error = None, "", e
+                        self.counters['extract'].add(items=1)
+                    if output:
+                        print(output, end='')
+                start = time.perf_counter()
+                try:
+                    self.write(key, result, error)
+                except Exception:
+                    # Keep writing the rest; a dead writer would stall the fetchers
+                    traceback.print_exc()
+                finally:
+                    self._pending.release()
+                counter.add(items=1, busy=time.perf_counter() - start)
+                unflushed += 1
+
+            due = unflushed >= self.batch_size or (
+                unflushed and time.perf_counter() - last_flush >= self.flush_interval
+            )
+            if item is _DONE or due:
+                if unflushed and self.flush:
+                    start = time.perf_counter()
+                    try:
+                        self.flush()
+                    except Exception:
+                        traceback.print_exc()
+                    counter.add(busy=time.perf_counter() - start)
+                    self.flushes += 1
+                unflushed = 0
+                last_flush = time.perf_counter()
+            if item is _DONE:
+                return
+
+    def close(self):
+        """
+        Wait for every queued page to be extracted, written and flushed.
+        """
+        if self._executor is None:
+            return
+        self._inbox.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        self._executor.shutdown()
+        self._executor = None
+        self._elapsed = time.perf_counter() - self._started
+
+    def report(self):
+        """
+        Print per-stage throughput and the likely bottleneck. Returns the bottleneck.
+        """
+        elapsed = self._elapsed or (time.perf_counter() - self._started if self._started else 0.0)
+        fetch, extract, write = (self.counters[name] for name in ('fetch', 'extract', 'write'))
+        print(f"\n=== Pipeline Throughput ({elapsed:.1f}s, {self.workers} extractor workers) ===")
+        print(f"{'stage':>7} | {'items':>5} | {'items/s':>7} | {'busy s':>7} | {'blocked s':>9} | {'idle s':>7}")
+        for counter in (fetch, extract, write):
+            rate = counter.items / elapsed if elapsed else 0.0
+            print(f"{counter.name:>7} | {counter.items:>5} | {rate:>7.2f} | {counter.busy:>7.1f} | "
+                  f"{counter.blocked:>9.1f} | {counter.idle:>7.1f}")
+        print(f"Writer flushes: {self.flushes}")
+
+        # Waiting for a free extractor (or on a full queue) means extraction
+        # cannot keep up; waiting on an empty queue means the network cannot
+        if write.busy > elapsed / 2:
+            bottleneck = 'write'
+            print("Bottleneck: writer (flush less often with a larger batch size)")
+        elif extract.blocked + fetch.blocked > extract.idle:
+            bottleneck = 'extract'
+            print("Bottleneck: extraction (pages waited for a free worker; add workers)")
+        else:
+            bottleneck = 'fetch'
+            print("Bottleneck: network (extractors waited for pages)")
+        return bottleneck
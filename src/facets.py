@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Integer codes and bitmasks for the categorical fields of weapons and spells.
+
+The export adds a "facets" object to every record, with one integer per
+facet. A single-valued facet (weapon type, major damage type, status
+buildup, ...) holds the index of the record's value in that facet's
+vocabulary, so a filter is an integer comparison or a lookup in a set of
+selected codes. A multi-valued facet (minor damage types, spell damage
+types) holds a bitmask: bit i is set when the record has value i, and a
+filter is one AND with the mask of the selected values. Those
+vocabularies are small, so their masks fit JavaScript's 32-bit bitwise
+operators; a mask vocabulary that outgrows that fails the export.
+
+The vocabularies are shared by weapons and spells (damage types and status
+buildups mean the same thing in both) and are written to
+resources/facet_dictionary.json. They are append-only: the export starts
+from the stored dictionary and adds values it has not seen at the end, so
+the code or bit of an existing value never moves. Only a new
+FACET_DICTIONARY_VERSION starts the vocabularies afresh (sorted).
+
+Usage:
+    python facets.py [resources_dir]   add facets to the resource files and write the dictionary
+"""
+
+import glob
+import json
+import os
+import sys
+
+from data_bundle import DEFAULT_RESOURCES_DIR, FACET_DICTIONARY_FILENAME
+
+FACET_DICTIONARY_VERSION = 2
+
+CODE = 'code'
+MASK = 'mask'
+
+# (facet, path of keys into the record, vocabulary, encoding)
+WEAPON_FACETS = [
+    ('weapon_type', ('weapon_type',), 'weapon_type', CODE),
+    ('damage_major', ('damage_types', 'major'), 'damage_type', CODE),
+    ('damage_minor', ('damage_types', 'minor'), 'damage_type', MASK),
+    ('attack_primary', ('attack_types', 'primary'), 'attack_type', CODE),
+    ('attack_secondary', ('attack_types', 'secondary'), 'attack_type', CODE),
+    ('status_buildup', ('status_buildup',), 'status_buildup', CODE),
+    ('dlc_exclusive', ('dlc_exclusive',), 'dlc_exclusive', CODE),
+]
+
+SPELL_FACETS = [
+    ('spell_type', ('spell_type',), 'spell_type', CODE),
+    ('damage_types', ('damage_types',), 'damage_type', MASK),
+    ('status_buildup', ('status_buildup',), 'status_buildup', CODE),
+    ('dlc_exclusive', ('dlc_exclusive',), 'dlc_exclusive', CODE),
+]
+
+# Codes of a boolean facet: 0 is False, 1 is True
+BOOLEAN_VOCABULARIES = {'dlc_exclusive'}
+
+# Most values a mask vocabulary may have, for JavaScript's 32-bit bitwise operators
+MAX_MASK_BITS = 31
+
+def _get(record, path):
+    for key in path:
+        record = record[key]
+    return record
+
+def _values(value):
+    return value if isinstance(value, list) else [value]
+
+def field_values(record, path):
+    """
+    The values of the record field at `path` a facet encodes, as a list
+    (one value for a single-valued field).
+    """
+    return _values(_get(record, path))
+
+def load_facet_dictionary(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    The stored facet dictionary, or None if there is none.
+    """
+    path = os.path.join(resources_dir, FACET_DICTIONARY_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_facet_dictionary(weapons, spells, previous=None):
+    """
+    The shared vocabularies and each facet's vocabulary and encoding.
+    Vocabularies of a `previous` dictionary of the same version keep their
+    order, with new values appended (sorted); otherwise they are sorted.
+    """
+    stored = previous['vocabularies'] if previous and previous.get('version') == FACET_DICTIONARY_VERSION else {}
+    found = {}
+    mask_vocabularies = set()
+    for records, facets in ((weapons, WEAPON_FACETS), (spells, SPELL_FACETS)):
+        for _, path, vocabulary, encoding in facets:
+            values = found.setdefault(vocabulary, set())
+            if encoding == MASK:
+                mask_vocabularies.add(vocabulary)
+            if vocabulary in BOOLEAN_VOCABULARIES:
+                values.update((False, True))
+                continue
+            for record in records:
+                values.update(field_values(record, path))
+
+    vocabularies = {}
+    for vocabulary, values in sorted(found.items()):
+        if vocabulary in BOOLEAN_VOCABULARIES:
+            vocabularies[vocabulary] = [False, True]
+            continue
+        kept = list(stored.get(vocabulary, []))
+        vocabularies[vocabulary] = kept + sorted(values.difference(kept))
+        if vocabulary in mask_vocabularies and len(vocabularies[vocabulary]) > MAX_MASK_BITS:
+            raise ValueError(f"Facet vocabulary {vocabulary} has {len(vocabularies[vocabulary])} values, "
+                             f"more than {MAX_MASK_BITS} mask bits")
+    return {
+        'version': FACET_DICTIONARY_VERSION,
+        'vocabularies': vocabularies,
+        'facets': {
+            kind: {facet: {'vocabulary': vocabulary, 'encoding': encoding}
+                   for facet, _, vocabulary, encoding in facets}
+            for kind, facets in (('weapons', WEAPON_FACETS), ('spells', SPELL_FACETS))
+        },
+    }
+
+def facet_code(dictionary, vocabulary, value):
+    """
+    The code of one value of a vocabulary.
+    """
+    return dictionary['vocabularies'][vocabulary].index(value)
+
+def facet_mask(dictionary, vocabulary, values):
+    """
+    The mask of some values of a vocabulary (for building filters).
+    """
+    lookup = dictionary['vocabularies'][vocabulary]
+    mask = 0
+    for value in _values(values):
+        mask |= 1 << lookup.index(value)
+    return mask
+
+def decode_facet(dictionary, vocabulary, encoding, facet_value):
+    """
+    The value a code stands for, or the list of values whose bits are set
+    in a mask.
+    """
+    lookup = dictionary['vocabularies'][vocabulary]
+    if encoding == CODE:
+        return lookup[facet_value]
+    return [value for bit, value in enumerate(lookup) if facet_value >> bit & 1]
+
+def annotate_records(records, facets, dictionary):
+    """
+    Set record['facets'] on every record.
+    """
+    for record in records:
+        record['facets'] = {
+            facet: (facet_code if encoding == CODE else facet_mask)(dictionary, vocabulary, _get(record, path))
+            for facet, path, vocabulary, encoding in facets
+        }
+    return records
+
+def annotate_all(weapons, spells, previous=None):
+    """
+    Build the dictionary for these records (extending `previous`, see
+    build_facet_dictionary) and add facets to all of them. Returns the
+    dictionary.
+    """
+    dictionary = build_facet_dictionary(weapons, spells, previous)
+    annotate_records(weapons, WEAPON_FACETS, dictionary)
+    annotate_records(spells, SPELL_FACETS, dictionary)
+    return dictionary
+
+def write_facet_dictionary(dictionary, resources_dir=DEFAULT_RESOURCES_DIR):
+    path = os.path.join(resources_dir, FACET_DICTIONARY_FILENAME)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(dictionary, f, indent=2, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    print(f"✓ Wrote {path}")
+    return [path]
+
+def annotate_resource_files(resources_dir=DEFAULT_RESOURCES_DIR):
+    """
+    Add facets to the resource files in place and write the dictionary.
+    Returns the files written.
+    """
+    files = {}
+    for pattern in ('weapons_*.json', 'spells_*.json'):
+        for path in sorted(glob.glob(os.path.join(resources_dir, pattern))):
+            with open(path, 'r', encoding='utf-8') as f:
+                files[path] = json.load(f)
+    weapons = [record for path, records in files.items() if os.path.basename(path).startswith('weapons_') for record in records]
+    spells = [record for path, records in files.items() if os.path.basename(path).startswith('spells_') for record in records]
+    dictionary = annotate_all(weapons, spells, load_facet_dictionary(resources_dir))
+
+    written = []
+    for path, records in files.items():
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+        written.append(path)
+    print(f"✓ Added facets to {len(weapons)} weapons and {len(spells)} spells in {len(written)} files")
+    return written + write_facet_dictionary(dictionary, resources_dir)
+
+if __name__ == "__main__":
+    annotate_resource_files(*sys.argv[1:2])
@@ -3,445 +3,135 @@
 Script to fetch HTML content from Elden Ring wiki pages for spells.
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import os
-from urllib.parse import quote
-import time
-import gzip
-import zlib
+import sys
+from urllib.parse import urlparse
 
-# Global rate limiting for bulk scraping
-last_request_time = 0
-MIN_REQUEST_INTERVAL = 15  # Minimum 15 seconds between requests
+from mediawiki_api import (
+    MediaWikiAPI,
+    diff_revision_ids,
+    load_revision_ids,
+    title_from_href,
+)
+from classification import load_classification_index, report_unmatched_names
+from html_archive import default_archive, read_html
+from html_parsing import ParseTargets, configure_parser_from_argv, parse_html
+from http_archive import configure_from_argv
+from scrape_store import ScrapeStore, spell_resource_filename
+from spell_names import CRUCIBLE_PREFIX, SpellImageIndex, canonical_spell_name
+from table_spec import Field, TableSpec
+from wiki_client import WikiClient
 
-# Spell types array - will be populated based on the spells page structure
-SPELL_TYPES = []
+# Source pages, downloaded when no local copy exists
+SPELLS_PAGE_URL = "https://eldenring.wiki.fextralife.com/Spells"
+WIKI_GG_SPELLS_PAGE_URL = "https://eldenring.wiki.gg/wiki/Spells"
+WIKI_GG_SPELLS_PAGE_TITLE = "Spells"
+WIKI_GG_API_URL = "https://eldenring.wiki.gg/api.php"
 
-def get_blood_loss_spells():
-    """
-    Get the list of spells that have blood loss status buildup.
-    """
-    return {
-        # Incantations
-        "Bloodboon",
-        "Bloodflame Blade", 
-        "Bloodflame Talons",
-        "Furious Blade of Ansbach",
-        "Swarm of Flies",
-        
-        # Sorceries
-        "Briars of Punishment",
-        "Briars of Sin", 
-        "Impenetrable Thorns"
-    }
+# Revision IDs of the spell pages as of the last incremental refresh
+REVISIONS_FILE = os.path.join("progress", "spell_page_revisions.json")
 
-def get_poison_spells():
-    """
-    Get the list of spells that have poison status buildup.
-    """
-    return {
-        # Incantations
-        "Poison Armament",
-        "Poison Mist"
-    }
+# Spell records, revisions and run metadata (shared with fetch-weapons.py)
+STORE_FILE = os.path.join("progress", "scrape.db")
 
-def get_scarlet_rot_spells():
-    """
-    Get the list of spells that have scarlet rot status buildup.
-    """
-    return {
-        # Incantations
-        "Ekzykes's Decay",
-        "Rotten Breath",
-        "Rotten Butterflies",
-        "Scarlet Aeonia"
-    }
+# Per-host rate limiting for bulk scraping
+MIN_REQUEST_INTERVAL = 15  # Minimum 15 seconds between requests on average
+REQUEST_BURST = 1  # Requests allowed back-to-back before the interval applies
 
-def get_frostbite_spells():
-    """
-    Get the list of spells that have frostbite status buildup.
-    """
-    return {
-        # Sorceries
-        "Adula's Moonblade",
-        "Explosive Ghostflame",
-        "Freezing Mist",
-        "Frozen Armament",
-        "Glintstone Icecrag",
-        "Mass of Putrescence",
-        "Ranni's Dark Moon",
-        "Rings of Spectral Light",
-        "Vortex of Putrescence",
-        "Zamor Ice Storm",
-        
-        # Incantations
-        "Borealis's Mist",
-        "Dragonice",
-        "Ghostflame Breath",
-        "Frozen Lightning Spear"
-    }
-
-def get_madness_spells():
-    """
-    Get the list of spells that have madness status buildup.
-    """
-    return {
-        # Incantations
-        "Frenzied Burst",
-        "Howl of Shabriri",
-        "Inescapable Frenzy",
-        "Midra's Flame of Frenzy",
-        "The Flame of Frenzy",
-        "Unendurable Frenzy"
-    }
-
-def get_fire_damage_spells():
-    """
-    Get the list of spells that deal fire damage.
-    """
-    return {
-        # Sorceries
-        "Gelmir's Fury",
-        "Magma Shot",
-        "Roiling Magma",
-        "Rykard's Rancor",
-        
-        # Incantations
-        "Agheel's Flame",
-        "Aspects of the Crucible: Breath",
-        "Bayle's Flame Lightning",
-        "Bayle's Tyranny",
-        "Black Flame",
-        "Black Flame Blade",
-        "Black Flame Ritual",
-        "Bloodboon",
-        "Bloodflame Blade",
-        "Bloodflame Talons",
-        "Burn, O Flame!",
-        "Flame, Grant me Strength",
-        "Catch Flame",
-        "Dragonfire",
-        "Fire's Deadly Sin",
-        "Fire Serpent",
-        "Flame of the Fell God",
-        "Flame Sling",
-        "Flame, Fall Upon Them",
-        "Frenzied Burst",
-        "Furious Blade of Ansbach",
-        "Giantsflame Take Thee",
-        "Howl of Shabriri",
-        "Inescapable Frenzy",
-        "Magma Breath",
-        "Midra's Flame of Frenzy",
-        "Messmer's Orb",
-        "Noble Presence",
-        "O, Flame!",
-        "Placidusax's Ruin",
-        "Rain of Fire",
-        "Scouring Black Flame",
-        "Surge, O Flame!",
-        "The Flame of Frenzy",
-        "Theodorix's Magma",
-        "Unendurable Frenzy",
-        "Whirl, O Flame!"
-    }
-
-def get_lightning_damage_spells():
-    """
-    Get the list of spells that deal lightning damage.
-    """
-    return {
-        # Incantations
-        "Ancient Dragons' Lightning Spear",
-        "Ancient Dragons' Lightning Strike",
-        "Bayle's Flame Lightning",
-        "Bayle's Tyranny",
-        "Death Lightning",
-        "Electrocharge",
-        "Electrify Armament",
-        "Frozen Lightning Spear",
-        "Fortissax's Lightning Spear",
-        "Honed Bolt",
-        "Knight's Lightning Spear",
-        "Lansseax's Glaive",
-        "Lightning Spear",
-        "Lightning Strike",
-        "Placidusax's Ruin",
-        "Vyke's Dragonbolt"
-    }
+# Shared client: one keep-alive connection pool and token bucket per host
+wiki_client = WikiClient(min_interval=MIN_REQUEST_INTERVAL, burst=REQUEST_BURST)
 
-def get_holy_damage_spells():
-    """
-    Get the list of spells that deal holy damage.
-    """
-    return {
-        # Incantations
-        "Aspects of the Crucible: Bloom",
-        "Black Blade",
-        "Discus of Light",
-        "Elden Stars",
-        "Giant Golden Arc",
-        "Golden Arcs",
-        "Land of Shadow",
-        "Law of Causality",
-        "Light of Miquella",
-        "Litany of Proper Death",
-        "Multilayered Ring of Light",
-        "Radagon's Rings of Light",
-        "Spira",
-        "Triple Rings of Light",
-        "Watchful Spirit",
-        "Wrath from Afar",
-        "Wrath of Gold",
-        "Order's Blade"
-    }
+# Elements the spell extractors read
+SPELL_TABLE_TARGETS = ParseTargets('div[class="tabcontent 1-tab"]')
+WIKI_GG_IMAGE_TABLE_TARGETS = ParseTargets('table[class="sortable wikitable"]')
 
-def get_physical_damage_spells():
+def parse_requirement(cell_text):
     """
-    Get the list of spells that deal physical damage.
+    Requirement cell text as an int: the digits in it, or 0 when there are none.
     """
-    return {
-        # Sorceries - Gravity Sorceries
-        "Blades of Stone",
-        "Meteorite",
-        "Meteorite of Astel",
-        "Rock Sling",
-        
-        # Incantations - Bestial Incantations
-        "Beast Claw",
-        "Bestial Sling",
-        "Gurranq's Beast Claw",
-        "Stone of Gurranq",
-        
-        # Incantations - Blood Incantations
-        "Swarm of Flies",
-        
-        # Incantations - Dragon Communion Incantations
-        "Dragonclaw",
-        "Dragonmaw",
-        "Rotten Breath",
-        "Ekzykes's Decay",
-        "Greyoll's Roar",
-        
-        # Incantations - Erdtree Incantations
-        "Aspects of the Crucible: Horns",
-        "Aspects of the Crucible: Tail",
-        "Aspects of the Crucible: Thorns",
-        
-        # Incantations - Frenzied Flame Incantations
-        "Howl of Shabriri",
-        
-        # Incantations - Servants of Rot Incantations
-        "Pest Threads",
-        "Pest-Thread Spears",
-        "Rotten Butterflies",
-        "Scarlet Aeonia",
-        
-        # Incantations - Finger Sorceries
-        "Cherishing Fingers",
+    cleaned = ''.join(filter(str.isdigit, cell_text))
+    return int(cleaned) if cleaned else 0
 
-        # Incantations - Spiral Tower
-        "Roar of Rugalea",
-        "Divine Beast Tornado",
-        "Divine Bird Feathers",
-    }
+# Spells table: one spell per row, exactly 11 columns
+SPELL_TABLE_SPEC = TableSpec(
+    "Spells table",
+    table=['div[class="tabcontent 1-tab"]', 'div.table-responsive', 'table'],
+    cell_count=11,
+    records=True,
+    fields=[
+        Field('name', column=0),
+        Field('link', column=0, read='link_href'),
+        Field('type', column=1),
+        Field('intelligence', column=5, parse=parse_requirement),
+        Field('faith', column=6, parse=parse_requirement),
+        Field('arcane', column=7, parse=parse_requirement),
+        Field('bonus', column=9),
+        Field('dlc', column=10),
+    ]
+)
 
-def get_magic_damage_incantations():
-    """
-    Get the list of incantations that deal magic damage.
-    """
-    return {
-        "Borealis's Mist",
-        "Dragonice",
-        "Ghostflame Breath",
-        "Glintstone Breath",
-        "Smarag's Glintstone Breath"
-    }
+# Damage type and status buildup tables (classification_data.json), loaded once
+classification_index = load_classification_index()
 
-def get_magic_damage_sorcery_exceptions():
-    """
-    Get the list of sorceries that have magic bonuses but don't deal magic damage.
-    """
-    return {
-        # Carian exceptions
-        "Lucidity",
-        "Miriam's Vanishing",
-        
-        # Finger exceptions
-        "Cherishing Fingers",
-        
-        # Gravity exceptions
-        "Rock Sling",
-        "Blades of Stone",
-        
-        # Glintstone exceptions
-        "Scholar's Shield",
-        "Starlight",
-        "Thops's Barrier",
-        
-        # Night exceptions
-        "Night's Maiden Mist",
-        "Unseen Blade",
-        "Unseen Form"
-    }
-
-def get_magic_damage_sorcery_bonuses():
-    """
-    Get the list of bonus types that indicate magic damage for sorceries.
-    """
-    return {
-        "Thorn",
-        "Carian",
-        "Oracle",
-        "Crystalian",
-        "Cold",
-        "Death",
-        "Finger",
-        "Moon",
-        "Gravity",
-        "Glintstone",
-        "Sellian"
-    }
+# Spell types array - will be populated based on the spells page structure
+SPELL_TYPES = []
 
 def get_damage_types(spell_name, spell_type, bonus):
     """
     Determine the damage types for a spell.
-    Returns a dictionary with 'major' and 'minor' damage types.
+    Returns a list of damage types.
     """
-    fire_damage_spells = get_fire_damage_spells()
-    lightning_damage_spells = get_lightning_damage_spells()
-    holy_damage_spells = get_holy_damage_spells()
-    physical_damage_spells = get_physical_damage_spells()
-    magic_damage_incantations = get_magic_damage_incantations()
-    magic_damage_sorcery_exceptions = get_magic_damage_sorcery_exceptions()
-    magic_damage_sorcery_bonuses = get_magic_damage_sorcery_bonuses()
-    
-    damage_types = []
-    
-    if spell_name in fire_damage_spells:
-        damage_types.append("Fire")
-    
-    if spell_name in lightning_damage_spells:
-        damage_types.append("Lightning")
-    
-    if spell_name in holy_damage_spells:
-        damage_types.append("Holy")
-    
-    if spell_name in physical_damage_spells:
-        damage_types.append("Physical")
-    
-    # Check for magic damage
-    if spell_name in magic_damage_incantations:
-        damage_types.append("Magic")
-    elif spell_type == "Sorcery" and bonus in magic_damage_sorcery_bonuses and spell_name not in magic_damage_sorcery_exceptions:
-        damage_types.append("Magic")
-    
-    return damage_types
+    return classification_index.spell_damage_types(spell_name, spell_type, bonus)
 
 def check_status_buildup(spell_name):
     """
     Check if a spell has any status buildup.
     Returns the status type as a string, or "none" if no status.
     """
-    blood_loss_spells = get_blood_loss_spells()
-    poison_spells = get_poison_spells()
-    scarlet_rot_spells = get_scarlet_rot_spells()
-    frostbite_spells = get_frostbite_spells()
-    madness_spells = get_madness_spells()
-    
-    if spell_name in blood_loss_spells:
-        return "blood_loss"
-    elif spell_name in poison_spells:
-        return "poison"
-    elif spell_name in scarlet_rot_spells:
-        return "scarlet_rot"
-    elif spell_name in frostbite_spells:
-        return "frostbite"
-    elif spell_name in madness_spells:
-        return "madness"
-    else:
-        return "none"
+    return classification_index.spell_status_buildup(spell_name)
 
 def read_local_html(filename):
     """
-    Read HTML content from a local file.
+    Read HTML content from a local file (archiving new content), or from
+    the HTML archive when there is no local copy.
     """
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        print(f"Successfully read local HTML file: {filename} ({len(content)} characters)")
-        return content
-    except FileNotFoundError:
-        print(f"Local HTML file not found: {filename}")
-        return None
-    except Exception as e:
-        print(f"Error reading local HTML file {filename}: {e}")
-        return None
-    
+    return read_html(filename)
+
+def fetch_wiki_page(url):
+    """
+    Fetch HTML content from a wiki page through the shared pooled client.
+    """
+    return wiki_client.fetch(url)
+
+def read_or_fetch_html(filename, url):
+    """
+    Read a page from the HTML archive or its local copy, downloading and
+    archiving it first if neither has it.
+    """
+    if filename not in default_archive() and not os.path.exists(filename):
+        print(f"Local {filename} not found, downloading from {url}")
+        html_content = fetch_wiki_page(url)
+        if not html_content:
+            return None
+        default_archive().put(filename, html_content)
+        print(f"Archived downloaded page in: {default_archive().path}")
+    return read_local_html(filename)
+
 def transform_spell_name(spell_name):
     """
     Transform the spell name to match the format of the wiki.gg link.
     """
-    if (spell_name == "Land of Shadow (Incantation)"):
-        return "Land of Shadow"
-    if (spell_name == "Aspect of the Crucible: Horns"):
-        return "Aspects of the Crucible: Horns"
-    if (spell_name == "Aspect of the Crucible: Tail"):
-        return "Aspects of the Crucible: Tail"
-    if (spell_name == "Aspect of the Crucible: Thorns"):
-        return "Aspects of the Crucible: Thorns"
-    if (spell_name == "Aspect of the Crucible: Bloom"):
-        return "Aspects of the Crucible: Bloom"
-    if (spell_name == "Aspect of the Crucible: Breath"):
-        return "Aspects of the Crucible: Breath"
-    if (spell_name == "Aspects of the Crucible: Horns"):
-        return "Aspects of the Crucible: Horns"
-    if (spell_name == "Aspects of the Crucible: Tail"):
-        return "Aspects of the Crucible: Tail"
-    if (spell_name == "Aspects of the Crucible: Thorns"):
-        return "Aspects of the Crucible: Thorns"
-    if (spell_name == "Aspects of the Crucible: Bloom"):
-        return "Aspects of the Crucible: Bloom"
-    if (spell_name == "Aspects of the Crucible: Breath"):
-        return "Aspects of the Crucible: Breath"
-    if (spell_name == "Gurrang's Beast Claw"):
-        return "Gurranq's Beast Claw"
-    if (spell_name == "Flame, Grant me Strength"):
-        return "Flame, Grant Me Strength"
-    return spell_name
+    return canonical_spell_name(spell_name)
 
 def transform_spell_name_for_image_url(spell_name):
     """
     Transform the spell name to match the format of the wiki.gg link.
     """
-    if (spell_name == "Land of Shadow (Incantation)"):
-        return "Land of Shadow"
-    if (spell_name == "Aspect of the Crucible: Horns"):
-        return "Aspects of the Crucible:Horns"
-    if (spell_name == "Aspect of the Crucible: Tail"):
-        return "Aspects of the Crucible:Tail"
-    if (spell_name == "Aspect of the Crucible: Thorns"):
-        return "Aspects of the Crucible:Thorns"
-    if (spell_name == "Aspect of the Crucible: Bloom"):
-        return "Aspects of the Crucible:Bloom"
-    if (spell_name == "Aspect of the Crucible: Breath"):
-        return "Aspects of the Crucible:Breath"
-    if (spell_name == "Aspects of the Crucible: Horns"):
-        return "Aspects of the Crucible:Horns"
-    if (spell_name == "Aspects of the Crucible: Tail"):
-        return "Aspects of the Crucible:Tail"
-    if (spell_name == "Aspects of the Crucible: Thorns"):
-        return "Aspects of the Crucible:Thorns"
-    if (spell_name == "Aspects of the Crucible: Bloom"):
-        return "Aspects of the Crucible:Bloom"
-    if (spell_name == "Aspects of the Crucible: Breath"):
-        return "Aspects of the Crucible:Breath"
-    if (spell_name == "Gurrang's Beast Claw"):
-        return "Gurranq's Beast Claw"
-    if (spell_name == "Flame, Grant me Strength"):
-        return "Flame, Grant Me Strength"
+    spell_name = canonical_spell_name(spell_name)
+    if spell_name.startswith(CRUCIBLE_PREFIX):
+        # wiki.gg writes these without a space after the colon
+        return spell_name.replace(f"{CRUCIBLE_PREFIX} ", CRUCIBLE_PREFIX, 1)
     return spell_name
 
 def extract_image_urls_from_wiki_gg(html_content):
@@ -452,7 +142,7 @@ def extract_image_urls_from_wiki_gg(html_content):
     if not html_content:
         return {}
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content, targets=WIKI_GG_IMAGE_TABLE_TARGETS)
     image_map = {}
     
     # Find all tables in the page
@@ -512,143 +202,84 @@ def extract_spells_from_table(html_content, image_map=None):
     Extract spell names, types, and requirements from the table within the "tabcontent 1-tab" div.
     Looks for div with classes "tabcontent 1-tab", then "table-responsive", then table.
     Extracts spell names from the first cell, spell types from the second cell,
-    and requirements from cells 6-8 (intelligence, faith, arcane).
+    and requirements from cells 6-8 (intelligence, faith, arcane); see SPELL_TABLE_SPEC.
     """
     if not html_content:
         return None
     
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find the div with classes "tabcontent 1-tab"
-    tab_content = soup.find('div', class_='tabcontent 1-tab')
-    if not tab_content:
-        print("No div with class 'tabcontent 1-tab' found")
-        return None
-
-    # Find the table-responsive div within the tab content
-    table_responsive = tab_content.find('div', class_='table-responsive')
-    if not table_responsive:
-        print("No div with class 'table-responsive' found within tabcontent")
-        return None
-    
-    # Find the table within table-responsive
-    table = table_responsive.find('table')
-    if not table:
-        print("No table found within table-responsive div")
-        return None
-    
-    # Find the table body
-    tbody = table.find('tbody')
-    if not tbody:
-        print("No tbody found in the table")
-        return None
-    
-    # Get all rows from the table body
-    rows = tbody.find_all('tr')
-    if not rows:
-        print("No rows found in the table body")
+    rows = SPELL_TABLE_SPEC.extract(parse_html(html_content, targets=SPELL_TABLE_TARGETS))
+    if rows is None:
         return None
     
     spells_data = []
-    used_images = set()  # Track which images are used
+    image_index = SpellImageIndex(image_map) if image_map else None
+    image_matches = image_index.lookup_all(
+        [transform_spell_name(values['name']) for _, values in rows]) if image_index else {}
     
-    for i, row in enumerate(rows):
-        # Get all cells in the row
-        cells = row.find_all(['td', 'th'])
-            
-        if len(cells) == 11:  # Exactly 11 columns as specified
-            # Get the first cell (spell name)
-            first_cell = cells[0]
-            spell_name = first_cell.get_text(strip=True)
-            transformed_spell_name = transform_spell_name(spell_name)
-            # Get the second cell (spell type)
-            second_cell = cells[1]
-            second_cell_text = second_cell.get_text(strip=True)
-            if (second_cell_text == "Incantations"): # resolve inconsistency in the wiki
-                second_cell_text = "Incantation"
-            spell_type = second_cell_text
-            
-            # Get requirements from cells 6, 7, 8 (intelligence, faith, arcane)
-            intelligence_cell = cells[5].get_text(strip=True)  # 6th cell (index 5)
-            faith_cell = cells[6].get_text(strip=True)         # 7th cell (index 6)
-            arcane_cell = cells[7].get_text(strip=True)        # 8th cell (index 7)
-            
-            # Get bonus from cell 10 (index 9)
-            bonus_cell = cells[9]        # 10th cell (index 9)
-            spell_bonus = bonus_cell.get_text(strip=True)
-            
-            # Get DLC status from cell 11 (index 10)
-            dlc_cell = cells[10]          # 11th cell (index 10)
-            dlc_text = dlc_cell.get_text(strip=True)
-            is_dlc = dlc_text == "Shadow of the Erdtree DLC"
-            
-            # Extract numeric values, handling empty cells or non-numeric content
-            def parse_requirement(cell_text):
-                try:
-                    # Remove any non-numeric characters and convert to int
-                    cleaned = ''.join(filter(str.isdigit, cell_text))
-                    return int(cleaned) if cleaned else 0
-                except (ValueError, AttributeError):
-                    return 0
-            
-            intelligence = parse_requirement(intelligence_cell)
-            faith = parse_requirement(faith_cell)
-            arcane = parse_requirement(arcane_cell)
-            
-            # Look for links within the first cell
-            link = first_cell.find('a')
-            wiki_fextralife_link = "https://eldenring.wiki.fextralife.com/" + link.get('href')
-            
-            # Construct wiki.gg link using established convention
-            wiki_gg_link = f"https://eldenring.wiki.gg/wiki/{spell_name.replace(' ', '_').replace(':', '')}"
-
-            # Get image URL from image map or use fallback
-            image_url = None
-            transformed_spell_name_for_image_url = transform_spell_name_for_image_url(transformed_spell_name)
-            if image_map and transformed_spell_name_for_image_url in image_map:
-                image_url = image_map[transformed_spell_name_for_image_url]
-                used_images.add(transformed_spell_name_for_image_url)  # Mark as used
-                # Remove from image map to avoid duplicates
-                del image_map[transformed_spell_name_for_image_url]
-            else:
-                # Fallback to hardcoded URL if not found in image map
-                url_name = transformed_spell_name_for_image_url.replace(' ', '_').replace(':', '')
-                image_url = f"https://eldenring.wiki.gg/images/thumb/0/08/ER_Icon_Spell_{url_name}.png/300px-ER_Icon_Spell_{url_name}.png"
-                print(f"Warning: No image found for {transformed_spell_name}, using fallback URL")
-            
-            spell_data = {
-                'spell_name': transformed_spell_name,
-                'spell_type': spell_type,
-                'requirements': {
-                    'intelligence': intelligence,
-                    'faith': faith,
-                    'arcane': arcane
-                },
-                'bonus': spell_bonus,
-                'dlc_exclusive': is_dlc,
-                'damage_types': get_damage_types(transformed_spell_name, spell_type, spell_bonus),
-                'status_buildup': check_status_buildup(transformed_spell_name),
-                'wikiGGLink': wiki_gg_link,
-                'wikiFextralifeLink': wiki_fextralife_link,
-                'imageUrl': image_url
-            }
-            
-            spells_data.append(spell_data)
-            dlc_status = "DLC" if is_dlc else "Base Game"
-            print(f"Found spell {i + 1}: {spell_name} ({spell_type}) - INT:{intelligence} FTH:{faith} ARC:{arcane} Bonus:{spell_bonus} {dlc_status}")
+    for row_number, values in rows:
+        spell_name = values['name']
+        transformed_spell_name = transform_spell_name(spell_name)
+        spell_type = values['type']
+        if (spell_type == "Incantations"): # resolve inconsistency in the wiki
+            spell_type = "Incantation"
+        intelligence = values['intelligence']
+        faith = values['faith']
+        arcane = values['arcane']
+        spell_bonus = values['bonus']
+        is_dlc = values['dlc'] == "Shadow of the Erdtree DLC"
+        wiki_fextralife_link = "https://eldenring.wiki.fextralife.com/" + values['link']
+        
+        # Construct wiki.gg link using established convention
+        wiki_gg_link = f"https://eldenring.wiki.gg/wiki/{spell_name.replace(' ', '_').replace(':', '')}"
+
+        # Get image URL from the image index (normalized, then fuzzy match)
+        image_url = None
+        image_match = image_matches.get(transformed_spell_name)
+        if image_match:
+            image_name, image_url, score = image_match
+            if score < 1.0:
+                print(f"Fuzzy-matched image for {transformed_spell_name}: {image_name} ({score:.2f})")
         else:
-            # Skip rows that don't have exactly 11 columns
-            print(f"Skipping row {i + 1}: Expected 11 columns, found {len(cells)}")
+            # No guessed URL: a broken link costs a failing request in the frontend
+            print(f"Warning: No image found for {transformed_spell_name}, leaving imageUrl empty")
+        
+        spell_data = {
+            'spell_name': transformed_spell_name,
+            'spell_type': spell_type,
+            'requirements': {
+                'intelligence': intelligence,
+                'faith': faith,
+                'arcane': arcane
+            },
+            'bonus': spell_bonus,
+            'dlc_exclusive': is_dlc,
+            'damage_types': get_damage_types(transformed_spell_name, spell_type, spell_bonus),
+            'status_buildup': check_status_buildup(transformed_spell_name),
+            'wikiGGLink': wiki_gg_link,
+            'wikiFextralifeLink': wiki_fextralife_link,
+            'imageUrl': image_url
+        }
+        
+        spells_data.append(spell_data)
+        dlc_status = "DLC" if is_dlc else "Base Game"
+        print(f"Found spell {row_number}: {spell_name} ({spell_type}) - INT:{intelligence} FTH:{faith} ARC:{arcane} Bonus:{spell_bonus} {dlc_status}")
     
     # Print unused images for troubleshooting
-    if image_map:
-        print(f"\n=== UNUSED IMAGE URLS ({len(image_map)} total) ===")
-        for spell_name, image_url in sorted(image_map.items()):
+    unused_images = image_index.unused() if image_index else {}
+    if unused_images:
+        print(f"\n=== UNUSED IMAGE URLS ({len(unused_images)} total) ===")
+        for spell_name, image_url in sorted(unused_images.items()):
             print(f"Unused: {spell_name} -> {image_url}")
         print("=== END UNUSED IMAGE URLS ===\n")
     
     return spells_data
 
+def get_spell_type_filename(spell_type):
+    """
+    Get the per-type JSON filename for a spell type.
+    """
+    return spell_resource_filename(spell_type)
+
 def save_spells_by_type(spells_data):
     """
     Save spells data to separate JSON files based on spell type.
@@ -668,9 +299,7 @@ def save_spells_by_type(spells_data):
     
     # Save each type to a separate file
     for spell_type, spells in spells_by_type.items():
-        # Create a safe filename from the spell type
-        safe_type_name = spell_type.lower().replace(' ', '_').replace('-', '_').replace('/', '_')
-        filename = f"spells_{safe_type_name}.json"
+        filename = get_spell_type_filename(spell_type)
         
         try:
             with open(filename, 'w', encoding='utf-8') as f:
@@ -691,28 +320,119 @@ def save_spells_by_type(spells_data):
     
     return True
 
+def refresh_spells(api_url=WIKI_GG_API_URL):
+    """
+    Incremental refresh: ask wiki.gg for the latest revision IDs of the spells
+    list page and every spell page in batched queries, and compare them with the
+    IDs saved by the previous run. Only when something changed are the source
+    pages downloaded again; changed spells are re-extracted and only the
+    affected spells_*.json files are rewritten.
+    """
+    api = MediaWikiAPI(wiki_client, api_url)
+    store = ScrapeStore(STORE_FILE)
+    store.start_run("spell refresh")
+
+    # Load the spells saved by the previous run
+    existing_by_type = {}
+    for spell_type in ("Sorcery", "Incantation"):
+        filename = get_spell_type_filename(spell_type)
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                existing_by_type[spell_type] = json.load(f)
+    spell_titles = {
+        title_from_href(urlparse(spell['wikiGGLink']).path): spell['spell_name']
+        for spells in existing_by_type.values() for spell in spells
+    }
+
+    print(f"\n=== Starting Incremental Spell Refresh ===")
+    print(f"Checking revisions of {len(spell_titles) + 1} spell pages...")
+    # Revision IDs saved before the scrape store existed are still a valid baseline
+    previous = store.revision_ids("spells") or load_revision_ids(REVISIONS_FILE)
+    current = api.latest_revision_ids([WIKI_GG_SPELLS_PAGE_TITLE] + sorted(spell_titles))
+    diff = diff_revision_ids(previous, current)
+    stale_titles = set(diff['changed'] + diff['added'])
+    print(f"Revision check used {api.requests_made} API requests")
+
+    updated_files = []
+    changed_spells = []
+    if stale_titles:
+        # Something changed: download fresh copies of the source pages
+        html_content = fetch_wiki_page(SPELLS_PAGE_URL)
+        wiki_gg_html_content = fetch_wiki_page(WIKI_GG_SPELLS_PAGE_URL)
+        if not html_content:
+            print("Could not download the spells page, nothing refreshed")
+            return diff
+        image_map = extract_image_urls_from_wiki_gg(wiki_gg_html_content) if wiki_gg_html_content else {}
+        spells_data = extract_spells_from_table(html_content, image_map) or []
+
+        # A changed list page can touch any spell; otherwise only the changed spell pages
+        list_page_changed = WIKI_GG_SPELLS_PAGE_TITLE in stale_titles
+        stale_names = {spell_titles[title] for title in stale_titles if title in spell_titles}
+
+        for spell_type in {spell['spell_type'] for spell in spells_data} | set(existing_by_type):
+            existing = existing_by_type.get(spell_type, [])
+            position_by_name = {spell['spell_name']: i for i, spell in enumerate(existing)}
+            updated = list(existing)
+            for spell in spells_data:
+                if spell['spell_type'] != spell_type:
+                    continue
+                name = spell['spell_name']
+                if name not in position_by_name:
+                    updated.append(spell)
+                    changed_spells.append(f"+ {name}")
+                elif (list_page_changed or name in stale_names) and existing[position_by_name[name]] != spell:
+                    updated[position_by_name[name]] = spell
+                    changed_spells.append(f"~ {name}")
+            if updated != existing:
+                filename = get_spell_type_filename(spell_type)
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(updated, f, indent=2, ensure_ascii=False)
+                updated_files.append(filename)
+                store.upsert_spells(updated)
+
+    store.save_revision_ids("spells", current, replace=True)
+    store.finish_run(changed=len(diff['changed']), added=len(diff['added']), updated=len(changed_spells))
+    store.close()
+
+    print(f"\n=== Incremental Spell Refresh Summary ===")
+    print(f"Unchanged pages: {len(diff['unchanged'])}")
+    print(f"Changed pages: {len(diff['changed'])}")
+    for title in diff['changed']:
+        print(f"  ~ {title} (rev {previous[title]} -> {current[title]})")
+    print(f"New pages: {len(diff['added'])}")
+    if diff['removed']:
+        print(f"Pages no longer found: {', '.join(diff['removed'])}")
+    print(f"Spell records changed: {len(changed_spells)}")
+    for change in changed_spells:
+        print(f"  {change}")
+    print(f"Files updated: {len(updated_files)}")
+    for filename in updated_files:
+        print(f"  - {filename}")
+
+    return diff
+
 def main():
     """
     Main function to fetch the Spells page HTML and extract spell data from the table.
     """
     # Try to read from local file first
-    html_content = read_local_html('spells_page.html')
+    html_content = read_or_fetch_html('spells_page.html', SPELLS_PAGE_URL)
     if not html_content:
-        print("Local spells_page.html not found. Please download the spells page first.")
+        print("Could not read or download spells_page.html.")
         return
     
     print("Using local spells_page.html file")
     print(f"Successfully read HTML content ({len(html_content)} characters)")
     
     # Read wiki.gg spells page for image URLs
-    wiki_gg_html_content = read_local_html('wiki_gg_spells_page.html')
+    wiki_gg_html_content = read_or_fetch_html('wiki_gg_spells_page.html', WIKI_GG_SPELLS_PAGE_URL)
     image_map = {}
     if wiki_gg_html_content:
         print("Reading wiki.gg spells page for image URLs...")
         image_map = extract_image_urls_from_wiki_gg(wiki_gg_html_content)
         print(f"Found {len(image_map)} image URLs from wiki.gg page")
     else:
-        print("Warning: wiki_gg_spells_page.html not found, will use fallback image URLs")
+        print("Warning: wiki_gg_spells_page.html not found, spells will have imageUrl: null")
     
     # Extract spells from the table
     spells_data = extract_spells_from_table(html_content, image_map)
@@ -720,6 +440,11 @@ def main():
     if spells_data:
         # Save spells data by type
         save_spells_by_type(spells_data)
+        with ScrapeStore(STORE_FILE) as store:
+            store.start_run("spells")
+            changed = store.upsert_spells(spells_data)
+            store.finish_run(spells=len(spells_data), changed=len(changed))
+        print(f"✓ {len(changed)} spell records changed in: {STORE_FILE}")
         
         # Print summary
         print(f"\n=== Spells Summary ===")
@@ -748,6 +473,20 @@ def main():
             print(f"  ... and {len(spells_data) - 5} more spells")
         else:
             print("No spells data found")
+        
+        # Flag classification entries that no scraped spell matched
+        report_unmatched_names(
+            classification_index,
+            spell_names=[spell['spell_name'] for spell in spells_data],
+            spell_bonuses=[spell['bonus'] for spell in spells_data]
+        )
 
 if __name__ == "__main__":
-    main()
+    # --record <archive.zip> saves every HTTP exchange; --replay <archive.zip> serves them offline
+    configure_from_argv(wiki_client, sys.argv[1:])
+    # --parser html.parser|lxml|selectolax picks the HTML parser backend
+    configure_parser_from_argv(sys.argv[1:])
+    if "--refresh" in sys.argv[1:]:
+        refresh_spells()
+    else:
+        main()
@@ -3,18 +3,78 @@
 Script to fetch HTML content from Elden Ring wiki pages.
 """
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import json
 import os
+import sys
 from urllib.parse import urljoin
-import time
-import gzip
-import zlib
 
-# Global rate limiting for bulk scraping
-last_request_time = 0
-MIN_REQUEST_INTERVAL = 15  # Minimum 15 seconds between requests
+from async_fetch import fetch_pages
+from classification import load_classification_index, report_unmatched_names
+from dead_letter import DeadLetterQueue
+from extract_pipeline import DEFAULT_WORKERS, ExtractPipeline
+from mediawiki_api import (
+    MediaWikiAPI,
+    diff_revision_ids,
+    fetch_pages_via_api,
+    load_revision_ids,
+    title_from_href,
+)
+from response_cache import ResponseCache
+from scrape_store import ScrapeStore, weapon_resource_filename
+from html_archive import read_html
+from html_parsing import ParseTargets, configure_parser_from_argv, get_parser_backend, parse_html
+from http_archive import configure_from_argv
+from weapon_page import build_weapon_record as build_record_from_html
+from weapon_page import (
+    damage_types_from_soup,
+    extract_weapon_page,
+    extract_weapon_record,
+    parse_page,
+    weapon_attributes_from_soup,
+    weapon_image_from_soup,
+    weapon_name_from_soup,
+)
+from wiki_client import WikiClient
+
+WIKI_BASE_URL = "https://eldenring.wiki.gg"
+WIKI_API_URL = f"{WIKI_BASE_URL}/api.php"
+
+# Weapon records, processed pages, raw pages, revisions and run metadata
+STORE_FILE = os.path.join("progress", "scrape.db")
+
+# Revision IDs saved by runs before the scrape store, read as a fallback baseline
+REVISIONS_FILE = os.path.join("progress", "page_revisions.json")
+
+# Per-host rate limiting for bulk scraping
+MIN_REQUEST_INTERVAL = 15  # Minimum 15 seconds between requests on average
+REQUEST_BURST = 1  # Requests allowed back-to-back before the interval applies
+FETCH_CONCURRENCY = 4  # Pages in flight at once across all hosts
+PER_HOST_CONCURRENCY = 2  # Pages in flight at once per host
+
+# Extraction pipeline: parsing runs in worker processes, files are written in batches
+EXTRACT_WORKERS = DEFAULT_WORKERS
+EXTRACT_QUEUE_SIZE = 16  # Fetched pages waiting for an extractor
+WRITE_BATCH_SIZE = 25  # Weapons written between scrape store commits
+
+# On-disk response cache: unchanged pages are revalidated with a 304
+response_cache = ResponseCache(os.path.join("progress", "http_cache"))
+
+# URLs that failed after all retries, retried by the next pass
+dead_letter = DeadLetterQueue(os.path.join("progress", "dead_letter.json"))
+DEAD_LETTER_RETRY_PASSES = 1  # Extra passes over the dead-letter file at the end of a bulk fetch
+
+# Shared client: one keep-alive connection pool and token bucket per host
+wiki_client = WikiClient(min_interval=MIN_REQUEST_INTERVAL, burst=REQUEST_BURST,
+                         pool_size=FETCH_CONCURRENCY, cache=response_cache)
+
+DLC_TITLE = "Elden Ring: Shadow of the Erdtree"
+
+# Elements extract_gallery_items reads from the weapons page
+GALLERY_TARGETS = ParseTargets('ul.gallery')
+
+# Attack type and status buildup tables (classification_data.json), loaded once
+classification_index = load_classification_index()
 
 # Weapon types array based on gallery order
 WEAPON_TYPES = [
@@ -64,152 +124,45 @@ WEAPON_TYPES = [
 
 def read_local_html(filename):
     """
-    Read HTML content from a local file.
+    Read HTML content from a local file (archiving new content), or from
+    the HTML archive when there is no local copy.
     """
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        print(f"Successfully read local HTML file: {filename} ({len(content)} characters)")
-        return content
-    except FileNotFoundError:
-        print(f"Local HTML file not found: {filename}")
-        return None
-    except Exception as e:
-        print(f"Error reading local HTML file {filename}: {e}")
-        return None
+    return read_html(filename)
 
-def get_headers():
+def fetch_wiki_page(url):
     """
-    Get consistent headers for all requests.
+    Fetch HTML content from a wiki page with proper headers to avoid being blocked.
+    Uses the shared pooled client, so connections are reused across pages.
     """
-    return {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',  # Request compressed content
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Sec-Fetch-User': '?1',
-        'Cache-Control': 'max-age=0',
-    }
+    return wiki_client.fetch(url)
 
-def decompress_content(response):
+def rate_limit(url=WIKI_BASE_URL):
     """
-    Decompress response content based on encoding.
+    Block until the token bucket for the URL's host allows another request.
     """
-    content_encoding = response.headers.get('content-encoding', '').lower()
-    
-    if content_encoding == 'gzip':
-        try:
-            decompressed_content = gzip.decompress(response.content).decode('utf-8')
-            print(f"Successfully fetched and decompressed {len(decompressed_content)} characters (was {len(response.content)} compressed)")
-            return decompressed_content
-        except Exception as e:
-            print(f"Gzip decompression failed: {e}. Falling back to raw content.")
-            return response.text
-    
-    elif content_encoding == 'deflate':
-        try:
-            decompressed_content = zlib.decompress(response.content).decode('utf-8')
-            print(f"Successfully fetched and decompressed {len(decompressed_content)} characters (was {len(response.content)} compressed)")
-            return decompressed_content
-        except Exception as e:
-            print(f"Deflate decompression failed: {e}. Falling back to raw content.")
-            return response.text
-    
-    elif content_encoding == 'br':
-        try:
-            import brotli
-            decompressed_content = brotli.decompress(response.content).decode('utf-8')
-            print(f"Successfully fetched and decompressed {len(decompressed_content)} characters (was {len(response.content)} compressed)")
-            return decompressed_content
-        except ImportError:
-            print("Brotli compression detected but brotli library not installed. Falling back to uncompressed.")
-            return response.text
-        except Exception as e:
-            print(f"Brotli decompression failed: {e}. Falling back to raw content.")
-            return response.text
-    
-    else:
-        print(f"Successfully fetched {len(response.text)} characters (uncompressed)")
-        return response.text
+    wiki_client.limiter_for(url).acquire()
 
-def fetch_wiki_page(url):
+def open_scrape_store(progress_dir="progress"):
     """
-    Fetch HTML content from a wiki page with proper headers to avoid being blocked.
-    Uses compression to reduce bandwidth and potentially avoid rate limiting.
+    Open the scrape store. The first time, progress saved as JSON files by
+    older runs is imported so a bulk fetch resumes where it left off.
     """
-    # Apply rate limiting
-    rate_limit()
-    
-    session = requests.Session()
-    session.headers.update(get_headers())
-    
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            print(f"Fetching content from: {url} (attempt {attempt + 1}/{max_retries})")
-            response = session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Check if we got HTML content
-            if 'text/html' in response.headers.get('content-type', ''):
-                return decompress_content(response)
-            else:
-                print(f"Warning: Response is not HTML. Content-Type: {response.headers.get('content-type')}")
-                return response.text
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {url} (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                # Longer wait time between retries to be respectful
-                wait_time = (attempt + 1) * 30  # 30, 60, 90 seconds
-                print(f"Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
-            else:
-                print("All retry attempts failed")
-                return None
-    
-    return None
-
-def rate_limit():
-    """
-    Ensure minimum time between requests to respect rate limits.
-    """
-    global last_request_time
-    current_time = time.time()
-    time_since_last = current_time - last_request_time
-    
-    if time_since_last < MIN_REQUEST_INTERVAL:
-        wait_time = MIN_REQUEST_INTERVAL - time_since_last
-        print(f"Rate limiting: waiting {wait_time:.1f} seconds...")
-        time.sleep(wait_time)
-    
-    last_request_time = time.time()
+    store = ScrapeStore(STORE_FILE)
+    if not store.processed_count() and os.path.exists(os.path.join(progress_dir, "weapon_fetch_progress.json")):
+        store.import_progress(progress_dir)
+    return store
 
 def save_html_content(html_content, filename):
     """
-    Save HTML content to a file in the progress folder.
+    Save HTML content through the scrape store (into the HTML archive), keyed by filename.
     """
-    # Create progress folder if it doesn't exist
-    progress_dir = "progress"
-    if not os.path.exists(progress_dir):
-        os.makedirs(progress_dir)
-        print(f"Created progress directory: {progress_dir}")
-    
-    # Save file in progress folder
-    filepath = os.path.join(progress_dir, filename)
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"HTML content saved to: {filepath}")
+        with ScrapeStore(STORE_FILE) as store:
+            store.save_page(filename, html_content)
+        print(f"HTML content saved to: {STORE_FILE} ({filename})")
         return True
     except Exception as e:
-        print(f"Error saving file {filepath}: {e}")
+        print(f"Error saving {filename} to {STORE_FILE}: {e}")
         return False
 
 def extract_weapon_name(html_content):
@@ -218,19 +171,7 @@ def extract_weapon_name(html_content):
     """
     if not html_content:
         return None
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find h2 tag with data-source="title"
-    title_h2 = soup.find('h2', attrs={'data-source': 'title'})
-    
-    if title_h2:
-        weapon_name = title_h2.get_text(strip=True)
-        print(f"Found weapon name: {weapon_name}")
-        return weapon_name
-    else:
-        print("No h2 tag with data-source='title' found")
-        return None
+    return weapon_name_from_soup(parse_page(html_content))
 
 def extract_weapon_attributes(html_content):
     """
@@ -240,123 +181,8 @@ def extract_weapon_attributes(html_content):
     """
     if not html_content:
         return None
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find all tables with class mw-collapsible
-    collapsible_tables = soup.find_all('table', class_='mw-collapsible')
-    
-    if len(collapsible_tables) < 2:
-        print(f"Not enough collapsible tables found. Found: {len(collapsible_tables)}")
-        return None
-    
-    # Get the second table
-    target_table = collapsible_tables[1]
-    
-    # Find the tbody
-    tbody = target_table.find('tbody')
-    if not tbody:
-        print("No tbody found in the second collapsible table")
-        return None
-    
-    # Get rows 3-7 (index 2-6, since we're 0-indexed)
-    rows = tbody.find_all('tr')
-    if len(rows) < 7:
-        print(f"Not enough rows in tbody. Found: {len(rows)}")
-        return None
-    
-    # Define the attribute names in order
-    attribute_names = ['strength', 'dexterity', 'intelligence', 'faith', 'arcane']
-    attributes = {}
-    
-    # Extract attributes from rows 3-7 (index 2-6)
-    for i in range(5):  # 5 attributes
-        row_index = i + 2  # Start from row 3 (index 2)
-        if row_index < len(rows):
-            row = rows[row_index]
-            cells = row.find_all(['td', 'th'])
-            
-            if len(cells) >= 2:  # Need at least 2 cells
-                # Get the second cell (index 1)
-                second_cell = cells[1]
-                
-                # Find span tags in the second cell
-                spans = second_cell.find_all('span')
-                
-                if spans:
-                    # Get the text from the first span
-                    attribute_value = spans[0].get_text(strip=True)
-                else:
-                    # If no spans, get the cell text directly
-                    attribute_value = second_cell.get_text(strip=True)
+    return weapon_attributes_from_soup(parse_page(html_content))
 
-                if not attribute_value or attribute_value == "-" or attribute_value == "":
-                    attribute_value = 0
-                
-                # Special handling for strength attribute
-                if attribute_names[i] == 'strength':
-                    strength_obj = parse_strength_requirement(attribute_value)
-                    attributes[attribute_names[i]] = strength_obj
-                    print(f"Found {attribute_names[i]}: {strength_obj}")
-                else:
-                    attributes[attribute_names[i]] = int(attribute_value)
-                    print(f"Found {attribute_names[i]}: {attribute_value}")
-            else:
-                print(f"Row {row_index + 1} doesn't have enough cells")
-        else:
-            print(f"Row {row_index + 1} not found")
-    
-    return attributes
-
-def parse_strength_requirement(strength_text):
-    """
-    Parse strength requirement text into one-hand and two-hand values.
-    Pattern: "[one_hand]\\1h[two_hand]\\2h" or single number.
-    """
-    print(f"Parsing strength requirement: {strength_text}")
-    if not strength_text:
-        return {"one_hand": 0, "two_hand": 0}
-    
-    # Check if the text contains the dual-hand pattern
-    if "\\1h" in strength_text and "\\2h" in strength_text:
-        try:
-            # Split by "\\1h" to get the one-hand value
-            parts = strength_text.split("\\1h")
-            if len(parts) >= 2:
-                one_hand = parts[0].strip()
-                print(f"One-hand value: {one_hand}")
-                # Get the two-hand value by splitting the remaining part
-                two_hand_part = parts[1].split("\\2h")[0].strip()
-                
-                # Extract just the numeric values before the "\\1h" and "\\2h" markers
-                one_hand_value = int(one_hand)
-                two_hand_value = int(two_hand_part)
-                
-                return {
-                    "one_hand": one_hand_value,
-                    "two_hand": two_hand_value
-                }
-        except (ValueError, IndexError) as e:
-            print(f"Error parsing strength requirement '{strength_text}': {e}")
-            # Fallback to single value
-            try:
-                single_value = int(''.join(filter(str.isdigit, strength_text)))
-                return {
-                    "one_hand": single_value,
-                    "two_hand": single_value
-                }
-            except ValueError:
-                return {"one_hand": 0, "two_hand": 0}
-    else:
-        # Single value - use for both one-hand and two-hand
-        try:
-            single_value = int(''.join(filter(str.isdigit, strength_text)))
-            return {
-                "one_hand": single_value,
-                "two_hand": single_value
-            }
-        except ValueError:
-            return {"one_hand": 0, "two_hand": 0}
 
 def extract_gallery_items(html_content):
     """
@@ -366,7 +192,7 @@ def extract_gallery_items(html_content):
     if not html_content:
         return None
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content, targets=GALLERY_TARGETS)
     
     # Find all ul elements with the "gallery" class
     gallery_lists = soup.find_all('ul', class_='gallery')
@@ -404,6 +230,9 @@ def extract_gallery_items(html_content):
                 'links': item_links,
                 'raw_html': str(item)
             }
+            # Computed once here so lookups never rescan the galleries
+            item_data['weapon_link'] = get_weapon_link(item_data)
+            item_data['dlc_exclusive'] = is_dlc_gallery_item(item, item_data['raw_html'])
             
             gallery_info['list_items'].append(item_data)
         
@@ -411,6 +240,37 @@ def extract_gallery_items(html_content):
     
     return gallery_data
 
+def is_dlc_gallery_item(li_element, raw_html):
+    """
+    Check if a parsed gallery list item is marked with the
+    "Elden Ring: Shadow of the Erdtree" title.
+    """
+    # Look for the DLC title in the second child of the li element
+    children = list(li_element.children)
+    if len(children) >= 2:
+        second_child = children[1]
+        if isinstance(second_child, Tag) and second_child.find(title=DLC_TITLE):
+            return True
+    
+    # Alternative: search for the DLC title anywhere in the item
+    return DLC_TITLE in raw_html
+
+def build_dlc_index(gallery_data):
+    """
+    Map every link href in the galleries to whether any item carrying it is DLC-exclusive.
+    Items loaded from an older gallery file without a 'dlc_exclusive' flag are parsed here.
+    """
+    dlc_index = {}
+    for gallery in gallery_data:
+        for item in gallery['list_items']:
+            dlc_exclusive = item.get('dlc_exclusive')
+            if dlc_exclusive is None:
+                li_element = BeautifulSoup(item['raw_html'], 'html.parser').find('li')
+                dlc_exclusive = bool(li_element) and is_dlc_gallery_item(li_element, item['raw_html'])
+            for link in item['links']:
+                dlc_index[link['href']] = dlc_index.get(link['href'], False) or dlc_exclusive
+    return dlc_index
+
 def save_gallery_data(gallery_data, filename):
     """
     Save gallery data to a JSON file.
@@ -424,8 +284,8 @@ def save_gallery_data(gallery_data, filename):
         print(f"Error saving gallery data: {e}")
         return False
 
-def fetch_first_weapon_page(gallery_data, base_url="https://eldenring.wiki.gg"):
-    """Fetch the webpage for the 1st item in the 1st gallery list."""
+def fetch_first_weapon_page(gallery_data, dlc_index, base_url="https://eldenring.wiki.gg"):
+    """Fetch the webpage for the 1st item in the 1st gallery list. `dlc_index` comes from build_dlc_index."""
     if not gallery_data or len(gallery_data) == 0:
         print("No gallery data available")
         return None
@@ -441,11 +301,7 @@ def fetch_first_weapon_page(gallery_data, base_url="https://eldenring.wiki.gg"):
     print(f"Text: {first_item['text']}")
     print(f"Number of links: {len(first_item['links'])}")
     
-    weapon_link = None
-    for link in first_item['links']:
-        if link['href'] and link['href'].startswith('/wiki/'):
-            weapon_link = link
-            break
+    weapon_link = get_weapon_link(first_item)
     
     if not weapon_link:
         print("No valid weapon link found in the first item")
@@ -459,14 +315,15 @@ def fetch_first_weapon_page(gallery_data, base_url="https://eldenring.wiki.gg"):
     
     if weapon_html:
         print(f"\n=== Extracting Weapon Data ===")
-        weapon_name = extract_weapon_name(weapon_html)
+        page = extract_weapon_page(weapon_html)
+        weapon_name = page.name
         weapon_type = get_weapon_type_from_gallery(0)  # First gallery (index 0)
-        attributes = extract_weapon_attributes(weapon_html)
-        damage_types = extract_damage_types(weapon_html)
-        image = extract_weapon_images(weapon_html, weapon_name)
+        attributes = page.attributes
+        damage_types = page.damage_types
+        image = page.image
         
         print(f"\n=== Checking DLC Status ===")
-        dlc_exclusive = check_dlc_exclusive(gallery_data, weapon_link)
+        dlc_exclusive = check_dlc_exclusive(weapon_link, dlc_index)
         
         final_weapon_name = weapon_name or weapon_link['text']
         weapon_data_filename = f"weapon_{final_weapon_name.replace(' ', '_').replace('/', '_').lower()}_data.json"
@@ -507,78 +364,7 @@ def extract_weapon_images(html_content, weapon_name):
     """
     if not html_content:
         return None
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    image = []
-    
-    # Look for image in various common locations
-    # 1. Main content area image
-    content_div = soup.find('div', {'id': 'mw-content-text'})
-    if content_div:
-        # Find all img tags in the content
-        img_tags = content_div.find_all('img')
-        for img in img_tags:
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            
-            if src and not src.startswith('data:'):  # Skip data URLs
-                # Convert relative URLs to absolute
-                if src.startswith('//'):
-                    src = 'https:' + src
-                elif src.startswith('/'):
-                    src = 'https://eldenring.wiki.gg' + src
-                
-                image_info = {
-                    'src': src,
-                    'alt': alt,
-                    'title': weapon_name
-                }
-                image.append(image_info)
-                # print(f"Found image: {src}")
-    
-    # 2. Look for specific weapon image (often in infoboxes)
-    infoboxes = soup.find_all('table', class_='infobox')
-    for infobox in infoboxes:
-        img_tags = infobox.find_all('img')
-        for img in img_tags:
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            title = img.get('title', '')
-            
-            if src and not src.startswith('data:'):
-                if src.startswith('//'):
-                    src = 'https:' + src
-                elif src.startswith('/'):
-                    src = 'https://eldenring.wiki.gg' + src
-                
-                image_info = {
-                    'src': src,
-                    'alt': alt,
-                    'title': title
-                }
-                image.append(image_info)
-                print(f"Found infobox image: {src}")
-    
-    # Remove duplicates based on src
-    unique_images = []
-    seen_srcs = set()
-    for img in image:
-        if img['src'] not in seen_srcs:
-            unique_images.append(img)
-            seen_srcs.add(img['src'])
-    
-    # Return only the second image (the weapon image itself)
-    if len(unique_images) >= 2:
-        weapon_image = unique_images[1]
-        print(f"Selected weapon image: {weapon_image['src']}")
-        return weapon_image
-    elif len(unique_images) == 1:
-        print(f"Only one image found, using: {unique_images[0]['src']}")
-        return unique_images[0]
-    else:
-        print("No image found")
-        return None
+    return weapon_image_from_soup(parse_page(html_content), weapon_name)
 
 def extract_damage_types(html_content):
     """
@@ -587,120 +373,17 @@ def extract_damage_types(html_content):
     """
     if not html_content:
         return None
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find all tables with class mw-collapsible
-    collapsible_tables = soup.find_all('table', class_='mw-collapsible')
-    
-    if len(collapsible_tables) == 0:
-        print("No collapsible tables found")
-        return None
-    
-    # Get the first table
-    target_table = collapsible_tables[0]
-    
-    # Find the tbody
-    tbody = target_table.find('tbody')
-    if not tbody:
-        print("No tbody found in the first collapsible table")
-        return None
-    
-    # Get rows 3-7 (index 2-6, since we're 0-indexed)
-    rows = tbody.find_all('tr')
-    if len(rows) < 7:
-        print(f"Not enough rows in tbody. Found: {len(rows)}")
-        return None
-    
-    # Define damage types in order
-    damage_types = ['Physical', 'Magic', 'Fire', 'Lightning', 'Holy']
-    damage_values = {}
-    
-    # Extract damage values from rows 3-7 (index 2-6)
-    for i in range(5):  # 5 damage types
-        row_index = i + 2  # Start from row 3 (index 2)
-        if row_index < len(rows):
-            row = rows[row_index]
-            cells = row.find_all(['td', 'th'])
-            
-            if len(cells) >= 2:  # Need at least 2 cells
-                # Get the second cell (index 1)
-                second_cell = cells[1]
-                
-                # Find span tags in the second cell
-                spans = second_cell.find_all('span')
-                
-                if spans:
-                    # Get the text from the first span
-                    try:
-                        damage_value = int(spans[0].get_text(strip=True))
-                        damage_values[damage_types[i]] = damage_value
-                        print(f"Found {damage_types[i]} damage: {damage_value}")
-                    except ValueError:
-                        print(f"Could not parse {damage_types[i]} damage value")
-                else:
-                    print(f"No span found in row {row_index + 1}")
-            else:
-                print(f"Row {row_index + 1} doesn't have enough cells")
-        else:
-            print(f"Row {row_index + 1} not found")
-    
-    if not damage_values:
-        print("No damage values found")
-        return None
-    
-    # Find the major damage type (highest value)
-    major_type = max(damage_values, key=damage_values.get)
-    major_value = damage_values[major_type]
-    
-    # Find minor damage types (all types with >0 damage, excluding major)
-    minor_types = []
-    for damage_type, value in damage_values.items():
-        if value > 0 and damage_type != major_type:
-            minor_types.append(damage_type)
-    
-    result = {
-        'major': major_type,
-        'minor': minor_types
-    }
-    
-    print(f"Major damage type: {major_type} ({major_value})")
-    print(f"Minor damage types: {minor_types}")
-    
-    return result
+    return damage_types_from_soup(parse_page(html_content))
 
-def check_dlc_exclusive(gallery_data, weapon_link):
+def check_dlc_exclusive(weapon_link, dlc_index):
     """
-    Check if a weapon is DLC-exclusive by looking for "Elden Ring: Shadow of the Erdtree" title.
+    Check if a weapon is DLC-exclusive ("Elden Ring: Shadow of the Erdtree" title in
+    its gallery item), using the index from build_dlc_index.
     """
-    # Find the weapon's list item in the gallery data
-    for gallery in gallery_data:
-        for item in gallery['list_items']:
-            for link in item['links']:
-                if link['href'] == weapon_link['href']:
-                    # Found the matching weapon, now check its structure
-                    soup = BeautifulSoup(item['raw_html'], 'html.parser')
-                    
-                    # Look for the second child of the li element
-                    li_element = soup.find('li')
-                    if li_element:
-                        children = list(li_element.children)
-                        if len(children) >= 2:
-                            second_child = children[1]
-                            
-                            # Check if the second child has a child with the DLC title
-                            if hasattr(second_child, 'find'):
-                                dlc_element = second_child.find(title="Elden Ring: Shadow of the Erdtree")
-                                if dlc_element:
-                                    print(f"Found DLC indicator: {dlc_element.get('title', '')}")
-                                    return True
-                    
-                    # Alternative: search for the DLC title anywhere in the item
-                    if "Elden Ring: Shadow of the Erdtree" in item['raw_html']:
-                        print("Found DLC indicator in raw HTML")
-                        return True
-    
-    return False
+    dlc_exclusive = dlc_index.get(weapon_link['href'], False)
+    if dlc_exclusive:
+        print(f"Found DLC indicator for: {weapon_link['href']}")
+    return dlc_exclusive
 
 def get_weapon_type_from_gallery(gallery_index):
     """Get weapon type based on gallery index."""
@@ -709,496 +392,50 @@ def get_weapon_type_from_gallery(gallery_index):
     else:
         return "Unknown"
 
+def get_gallery_filename(weapon_type):
+    """Get the per-type JSON filename for a weapon type."""
+    return weapon_resource_filename(weapon_type)
+
+def get_weapon_link(item):
+    """Get the first /wiki/ link of a gallery item, or None."""
+    if 'weapon_link' in item:
+        return item['weapon_link']
+    for link in item['links']:
+        if link['href'] and link['href'].startswith('/wiki/'):
+            return link
+    return None
+
 def get_attack_types(weapon_name, weapon_type):
     """
     Determine primary and secondary attack types based on weapon type and name.
     Returns a dictionary with 'primary' and 'secondary' attack types.
     """
-    # Slash damage weapons (all weapons from these classes) - PRIMARY attack type
-    slash_weapon_types = {
-        "Backhand Blades",
-        "Beast Claws", 
-        "Claws",
-        "Curved Greatswords",
-        "Curved Swords",
-        "Daggers",
-        "Great Katanas",
-        "Katanas",
-        "Reapers"
-    }
-    
-    # Specific weapons that deal slash damage (exceptions in their classes) - PRIMARY attack type
-    slash_specific_weapons = {
-        "Glaive",
-        "Loretta's War Sickle", 
-        "Nightrider Glaive",
-        "Pest's Glaive",
-        "Poleblade of the Bud",
-        "Spirit Glaive",
-        "Urumi"
-    }
-    
-    # Pierce damage weapon classes (all weapons from these classes) - PRIMARY attack type
-    pierce_weapon_types = {
-        "Ballista",
-        "Bows",
-        "Crossbows", 
-        "Great Spears",
-        "Greatbows",
-        "Heavy Thrusting Swords",
-        "Light Bows",
-        "Spears",
-        "Throwing Blades",
-        "Thrusting Swords"
-    }
-    
-    # Pierce damage weapon classes (Pierce is SECONDARY attack type)
-    pierce_secondary_weapon_types = {
-        "Colossal Swords",
-        "Daggers",
-        "Great Katanas",
-        "Greatswords", 
-        "Halberds",
-        "Katanas",
-        "Light Greatswords",
-        "Straight Swords",
-        "Thrusting Shields",
-        "Twinblades"
-    }
-    
-    # Specific weapons that deal Pierce damage (exceptions in their classes) - PRIMARY attack type
-    pierce_specific_weapons = {
-        # Backhand Blades
-        # Colossal Weapons
-        "Fallingstar Beast Jaw",
-        # Hammers
-        "Flowerstone Gavel",
-        # Axes
-        "Forked Hatchet",
-        # Fists
-        "Katar",
-        "Pata",
-        "Thiollier's Hidden Needle",
-        "Veteran's Prosthesis",
-        # Halberds
-        "Lucerne",
-        # Great Hammers
-        "Pickaxe",
-        # Greataxes
-        "Rusted Anchor",
-        # Hammers
-        "Warpick"
-    }
-    
-    # Strike damage weapon classes (with exceptions) - PRIMARY attack type
-    strike_weapon_types = {
-        "Hammers",
-        "Fists", 
-        "Flails",
-        "Great Hammers",
-        "Hand-to-Hand",
-        "Greatshields",
-        "Shields",
-        "Torches",
-        "Whips"
-    }
-    
-    # Specific weapons that deal strike damage (exceptions in their classes) - PRIMARY attack type
-    strike_specific_weapons = {
-        # Colossal Weapons
-        "Anvil Hammer",
-        "Bloodfiend's Arm",
-        "Devonia's Hammer", 
-        "Envoy's Greathorn",
-        "Gazing Finger",
-        "Giant-Crusher",
-        "Great Club",
-        "Prelate's Inferno Crozier",
-        "Rotten Staff",
-        "Shadow Sunflower Blossom",
-        "Staff of the Avatar",
-        "Troll's Hammer",
-        "Watchdog's Staff",
-        # Other classes
-        "Jawbone Axe",
-        "Spiked Spear",
-        "Stone-Sheathed Sword"
-    }
-    
-    # Standard damage weapon classes (all weapons from these classes) - PRIMARY attack type
-    standard_weapon_types = {
-        "Axes",
-        "Colossal Swords",
-        "Greataxes", 
-        "Greatbows",
-        "Great Spears",
-        "Greatswords",
-        "Halberds",
-        "Spears",
-        "Straight Swords",
-        "Twinblades"
-    }
-    
-    # Spell damage weapon classes (Staves and Sacred Seals) - PRIMARY attack type
-    spell_weapon_types = {
-        "Staves",
-        "Sacred Seals"
-    }
-    
-    # Standard damage weapon classes (Standard is SECONDARY attack type)
-    standard_secondary_weapon_types = {
-        "Heavy Thrusting Swords",
-        "Thrusting Swords"
-    }
-    
-    # Specific weapons that deal Standard damage (exceptions in their classes) - PRIMARY attack type
-    standard_specific_weapons = {
-        # Colossal Weapons
-        "Axe of Godfrey",
-        "Dragon Greatclaw", 
-        "Duelist Greataxe",
-        "Ghiza's Wheel",
-        "Golem's Halberd",
-        "Rotten Greataxe"
-    }
-    
-    # Weapons that DON'T deal Standard damage (exceptions to their classes)
-    non_standard_weapons = {
-        # Axes exceptions
-        "Jawbone Axe",
-        "Forked Hatchet",
-        # Greataxes exceptions
-        "Rusted Anchor",
-        # Spears exceptions
-        "Partisan",
-        "Spiked Spear", 
-        "Cross-Naginata",
-        # Straight Swords exceptions
-        "Coded Sword",
-        "Stone-Sheathed Sword"
-    }
-    
-    # Determine primary attack type
-    if weapon_type in spell_weapon_types:
-        primary = "Spell"
-    elif (weapon_type in slash_weapon_types or weapon_name in slash_specific_weapons):
-        primary = "Slash"
-    elif (weapon_type in pierce_weapon_types or weapon_name in pierce_specific_weapons):
-        primary = "Pierce"
-    elif (weapon_type in strike_weapon_types or weapon_name in strike_specific_weapons):
-        primary = "Strike"
-    elif ((weapon_type in standard_weapon_types and weapon_name not in non_standard_weapons) or
-          weapon_name in standard_specific_weapons):
-        primary = "Standard"
-    else:
-        primary = "Standard"  # Default fallback
-    
-    # Determine secondary attack type
-    if weapon_type in pierce_secondary_weapon_types:
-        # These weapon types have Pierce as secondary
-        secondary = "Pierce"
-    elif weapon_type in standard_secondary_weapon_types:
-        # These weapon types have Standard as secondary
-        secondary = "Standard"
-    else:
-        # For now, set secondary to same as primary
-        # This can be expanded later when you research secondary attack patterns
-        secondary = primary
-    
-    return {
-        "primary": primary,
-        "secondary": secondary
-    }
-
-def get_blood_loss_weapons():
-    """
-    Get the list of weapons that have blood loss status buildup.
-    Based on Fextralife data - only recording presence, not numbers.
-    """
-    return {
-        # Great Spears
-        "Barbed Staff-Spear",
-        "Bloodfiend's Sacred Spear",
-        "Mohgwyn's Sacred Spear",
-        
-        # Beast Claws
-        "Beast Claw",
-        "Red Bear's Claw",
-        
-        # Colossal Weapons
-        "Bloodfiend's Arm",
-        "Ghiza's Wheel",
-        
-        # Spears
-        "Bloodfiend's Fork",
-        "Cross-Naginata",
-        "Inquisitor's Girandole",
-        "Spiked Spear",
-        
-        # Claws
-        "Bloodhound Claws",
-        "Claws of Night",
-        "Hookclaws",
-        "Raptor Talons",
-        
-        # Curved Greatswords
-        "Bloodhound's Fang",
-        "Morgott's Cursed Sword",
-        
-        # Daggers
-        "Bloodstained Dagger",
-        "Great Knife",
-        "Reduvia",
-        "Wakizashi",
-        
-        # Heavy Thrusting Swords
-        "Bloody Helice",
-        
-        # Greatshields
-        "Briar Greatshield",
-        "Spiked Palisade Shield",
-        
-        # Flails
-        "Chainlink Flail",
-        "Flail",
-        "Nightrider Flail",
-        
-        # Backhand Blades
-        "Curseblade's Cirque",
-        
-        # Great Katanas
-        "Dragon-Hunter's Great Katana",
-        "Great Katana",
-        "Rakshasa's Great Katana",
-        
-        # Twinblades
-        "Eleonora's Poleblade",
-        
-        # Curved Swords
-        "Falx",
-        "Scavenger's Curved Sword",
-        
-        # Axes
-        "Forked Hatchet",
-        "Forked-Tongue Hatchet",
-        
-        # Greatswords
-        "Flamberge",
-        "Forked Greatsword",
-        "Sword of Milos",
-        
-        # Greataxes
-        "Great Omenkiller Cleaver",
-        
-        # Great Hammers
-        "Great Stars",
-        
-        # Reapers
-        "Grave Scythe",
-        "Halo Scythe",
-        "Obsidian Lamina",
-        "Scythe",
-        "Winged Scythe",
-        
-        # Katanas
-        "Hand of Malenia",
-        "Meteoric Ore Blade",
-        "Moonveil",
-        "Nagakiba",
-        "Rivers of Blood",
-        "Star-Lined Sword",
-        "Sword of Night",
-        "Uchigatana",
-        
-        # Whips
-        "Hoslow's Petal Whip",
-        "Thorned Whip",
-        
-        # Medium Shields
-        "Marred Leather Shield",
-        "Marred Wooden Shield",
-        
-        # Hammers
-        "Morning Star",
-        "Spiked Club",
-        "Varré's Bouquet",
-        
-        # Small Shields
-        "Shield of the Guilty",
-        "Spiralhorn Shield",
-        
-        # Fists
-        "Spiked Caestus",
-        "Star Fist",
-        
-        # Staves
-        "Staff of the Guilty",
-        
-        # Halberds
-        "Vulgar Militia Saw"
-    }
-
-def get_poison_weapons():
-    """
-    Get the list of weapons that have poison status buildup.
-    Based on Fextralife data - only recording presence, not numbers.
-    """
-    return {
-        # Shields
-        "Ant's Skull Plate",
-        "Coil Shield",
-        
-        # Perfume Bottles
-        "Deadly Poison Perfume Bottle",
-        
-        # Fists
-        "Poisoned Hand",
-        
-        # Katanas
-        "Serpentbone Blade",
-        
-        # Bows
-        "Serpent Bow",
-        
-        # Whips
-        "Tooth Whip",
-        
-        # Claws
-        "Venomous Fang"
-    }
-
-def get_scarlet_rot_weapons():
-    """
-    Get the list of weapons that have scarlet rot status buildup.
-    Based on Fextralife data - only recording presence, not numbers.
-    """
-    return {
-        # Thrusting Swords
-        "Antspur Rapier",
-        
-        # Halberds
-        "Poleblade of the Bud",
-        
-        # Warhammers
-        "Rotten Battle Hammer",
-        
-        # Spears
-        "Rotten Crystal Spear",
-        
-        # Staves
-        "Rotten Crystal Staff",
-        
-        # Straight Swords
-        "Rotten Crystal Sword",
-        
-        # Colossal Weapons
-        "Rotten Greataxe",
-        "Rotten Staff",
-        
-        # Daggers
-        "Scorpion's Stinger"
-    }
-
-def get_frostbite_weapons():
-    """
-    Get the list of weapons that have frostbite status buildup.
-    Based on Fextralife data - only recording presence, not numbers.
-    """
-    return {
-        # Perfume Bottles
-        "Chilling Perfume Bottle",
-        
-        # Greatswords
-        "Dark Moon Greatsword",
-        "Death's Poker",
-        
-        # Thrusting Swords
-        "Frozen Needle",
-        
-        # Torches
-        "Ghostflame Torch",
-        
-        # Axes
-        "Icerind Hatchet",
-        
-        # Greataxes
-        "Putrescence Cleaver",
-        
-        # Curved Greatswords
-        "Zamor Curved Sword"
-    }
+    return classification_index.weapon_attack_types(weapon_name, weapon_type)
 
-def get_sleep_weapons():
+def check_status_buildup(weapon_name):
     """
-    Get the list of weapons that have sleep status buildup.
-    Based on Fextralife data - only recording presence, not numbers.
+    Check if a weapon has any status buildup.
+    Returns the status type as a string, or "none" if no status.
     """
-    return {
-        # Torches
-        "St. Trina's Torch",
-        
-        # Straight Swords
-        "Sword of St Trina",
-        "Velvet Sword of St Trina",
-        
-        # Fists
-        "Thiollier's Hidden Needle"
-    }
+    return classification_index.weapon_status_buildup(weapon_name)
 
-def get_madness_weapons():
+def build_weapon_record(weapon_html, weapon_link, weapon_type, weapon_url, dlc_index):
     """
-    Get the list of weapons that have madness status buildup.
-    Based on Fextralife data - only recording presence, not numbers.
+    Extract every field of one weapon page into a weapon record.
     """
-    return {
-        # Great Spears
-        "Vyke's War Spear",
-        
-        # Greatshields
-        "Fingerprint Stone Shield",
-        
-        # Seals
-        "Frenzied Flame Seal",
-        
-        # Perfume Bottles
-        "Frenzyflame Perfume Bottle",
-        
-        # Fists
-        "Madding Hand",
-        
-        # Torches
-        "Nanaya's Torch"
-    }
+    dlc_exclusive = dlc_index.get(weapon_link['href'], False)
+    return build_record_from_html(weapon_html, weapon_link, weapon_type, weapon_url, dlc_exclusive)
 
-def check_status_buildup(weapon_name):
+def fetch_all_weapons(gallery_data, base_url="https://eldenring.wiki.gg", concurrency=FETCH_CONCURRENCY,
+                      backend="html", api_url=WIKI_API_URL, extract_workers=EXTRACT_WORKERS):
     """
-    Check if a weapon has any status buildup.
-    Returns the status type as a string, or "none" if no status.
+    Fetch all weapons from all galleries with progress tracking and resume capability.
+    With the "html" backend pages are fetched concurrently, one request each; with
+    the "api" backend they are fetched in batches of 50 through the MediaWiki API.
+    Fetched pages go through an ExtractPipeline: `extract_workers` processes parse
+    them while the next pages download, and one writer appends each weapon to
+    the scrape store, committed once per batch.
     """
-    blood_loss_weapons = get_blood_loss_weapons()
-    poison_weapons = get_poison_weapons()
-    scarlet_rot_weapons = get_scarlet_rot_weapons()
-    frostbite_weapons = get_frostbite_weapons()
-    sleep_weapons = get_sleep_weapons()
-    madness_weapons = get_madness_weapons()
-    
-    if weapon_name in blood_loss_weapons:
-        return "blood_loss"
-    elif weapon_name in poison_weapons:
-        return "poison"
-    elif weapon_name in scarlet_rot_weapons:
-        return "scarlet_rot"
-    elif weapon_name in frostbite_weapons:
-        return "frostbite"
-    elif weapon_name in sleep_weapons:
-        return "sleep"
-    elif weapon_name in madness_weapons:
-        return "madness"
-    else:
-        return "none"
-
-def fetch_all_weapons(gallery_data, base_url="https://eldenring.wiki.gg"):
-    """Fetch all weapons from all galleries with progress tracking and resume capability."""
     all_weapons = []
     total_weapons = sum(len(gallery['list_items']) for gallery in gallery_data)
     processed_count = 0
@@ -1213,121 +450,147 @@ def fetch_all_weapons(gallery_data, base_url="https://eldenring.wiki.gg"):
         os.makedirs(progress_dir)
         print(f"Created progress directory: {progress_dir}")
     
-    progress_file = os.path.join(progress_dir, "weapon_fetch_progress.json")
-    processed_weapons = set()
-    
-    if os.path.exists(progress_file):
-        try:
-            with open(progress_file, 'r') as f:
-                progress_data = json.load(f)
-                processed_weapons = set(progress_data.get('processed_weapons', []))
-                print(f"Resuming from previous run. Already processed: {len(processed_weapons)} weapons")
-        except:
-            print("Could not load progress file, starting fresh")
-    
-    # Dictionary to store weapons by gallery/type
-    weapons_by_gallery = {}
+    # Records, processed pages and raw pages all go to the scrape store
+    store = open_scrape_store(progress_dir)
+    store.start_run("weapons", backend=backend, base_url=base_url)
+    processed_before = store.processed_count()
+    if processed_before:
+        print(f"Resuming from previous run. Already processed: {processed_before} weapons")
+        if len(dead_letter):
+            print(f"Retrying {len(dead_letter)} URLs from the dead-letter file")
+    
+    # href -> DLC flag, built once for the whole run
+    dlc_index = build_dlc_index(gallery_data)
+    store.save_gallery_items(
+        (weapon_link['href'], get_weapon_type_from_gallery(gallery_index), gallery_index, item_index,
+         weapon_link['text'], dlc_index.get(weapon_link['href'], False))
+        for gallery_index, gallery in enumerate(gallery_data)
+        for item_index, weapon_link in enumerate(map(get_weapon_link, gallery['list_items']))
+        if weapon_link
+    )
+    
+    # Per-gallery state, keyed by gallery index
+    gallery_states = {}
+    # Fetch jobs: ((gallery_index, weapon_link), weapon_url)
+    jobs = []
     
     for gallery_index, gallery in enumerate(gallery_data):
         weapon_type = get_weapon_type_from_gallery(gallery_index)
-        gallery_filename = f"weapons_{weapon_type.lower().replace(' ', '_').replace('-', '_')}.json"
-        gallery_filepath = os.path.join(progress_dir, gallery_filename)
-        
-        # Load existing gallery data if it exists
-        existing_gallery_weapons = []
-        if os.path.exists(gallery_filepath):
-            try:
-                with open(gallery_filepath, 'r', encoding='utf-8') as f:
-                    existing_gallery_weapons = json.load(f)
-                print(f"Loaded {len(existing_gallery_weapons)} existing weapons from {gallery_filename}")
-            except Exception as e:
-                print(f"Error loading existing gallery data: {e}")
-                existing_gallery_weapons = []
         
-        # Create a set of existing weapon names for quick lookup
-        existing_weapon_names = {weapon['weapon_name'] for weapon in existing_gallery_weapons}
-        
-        gallery_weapons = existing_gallery_weapons.copy()  # Start with existing weapons
-        newly_processed_count = 0
-        
-        print(f"\n--- Processing Gallery {gallery_index + 1}/{len(gallery_data)}: {weapon_type} ---")
+        gallery_states[gallery_index] = {
+            'weapon_type': weapon_type,
+            # Existing weapons by link, for pages that have not changed
+            'existing_by_link': {weapon['wikiGGLink']: weapon for weapon in store.weapons(weapon_type)},
+            'newly_processed': 0
+        }
         
         for item_index, item in enumerate(gallery['list_items']):
-            processed_count += 1
-            
-            weapon_link = None
-            for link in item['links']:
-                if link['href'] and link['href'].startswith('/wiki/'):
-                    weapon_link = link
-                    break
-            
+            weapon_link = get_weapon_link(item)
             if not weapon_link:
-                print(f"Skipping item {item_index + 1} - no valid link")
+                print(f"Skipping {weapon_type} item {item_index + 1} - no valid link")
                 continue
             
-            weapon_id = weapon_link['href']
-            if weapon_id in processed_weapons:
+            if store.is_processed(weapon_link['href']):
                 print(f"Skipping {weapon_link['text']} - already processed")
                 continue
             
-            print(f"\n[{processed_count}/{total_weapons}] Processing: {weapon_link['text']}")
-            weapon_url = urljoin(base_url, weapon_link['href'])
-            weapon_html = fetch_wiki_page(weapon_url)
+            jobs.append(((gallery_index, weapon_link), urljoin(base_url, weapon_link['href'])))
+    
+    def fetched_weapon(pipeline, job, fetch_result):
+        """Queue one fetched weapon page for extraction (runs on the fetch consumer thread)."""
+        gallery_index, weapon_link = job
+        state = gallery_states[gallery_index]
+        weapon_url = urljoin(base_url, weapon_link['href'])
+        
+        if fetch_result.not_modified and weapon_url in state['existing_by_link']:
+            # Page unchanged since the cached copy: keep the existing record without parsing
+            pipeline.pass_through(job, ('unchanged', state['existing_by_link'][weapon_url]))
+        elif fetch_result.text:
+            store.save_page(weapon_url, fetch_result.text)
+            pipeline.submit(job, (fetch_result.text, weapon_link, state['weapon_type'], weapon_url,
+                                  dlc_index.get(weapon_link['href'], False), get_parser_backend()))
+        else:
+            pipeline.pass_through(job, ('failed', None))
+    
+    def write_weapon(job, result, error):
+        """Record one weapon (runs on the single writer thread)."""
+        nonlocal processed_count
+        gallery_index, weapon_link = job
+        state = gallery_states[gallery_index]
+        weapon_type = state['weapon_type']
+        weapon_id = weapon_link['href']
+        weapon_url = urljoin(base_url, weapon_id)
+        processed_count += 1
+        
+        # Extractor output for this page has just been printed above
+        position = f"[{processed_count}/{len(jobs)}]"
+        
+        if error is not None:
+            print(f"{position} ✗ Failed to extract: {weapon_link['text']} ({weapon_type}): {error}\n")
+            dead_letter.add(weapon_url, f"extraction failed: {error}")
+        elif isinstance(result, tuple) and result[0] == 'failed':
+            print(f"{position} ✗ Failed to fetch: {weapon_link['text']} ({weapon_type})\n")
+            dead_letter.add(weapon_url, "fetch failed after retries")
+        elif isinstance(result, tuple) and result[0] == 'unchanged':
+            weapon_data = result[1]
+            all_weapons.append(weapon_data)
+            store.mark_processed(weapon_id)
+            print(f"{position} ✓ Unchanged: {weapon_data['weapon_name']} ({weapon_type})\n")
+        else:
+            weapon_data = result
+            final_weapon_name = weapon_data['weapon_name']
             
-            if weapon_html:
-                weapon_name = extract_weapon_name(weapon_html)
-                attributes = extract_weapon_attributes(weapon_html)
-                damage_types = extract_damage_types(weapon_html)
-                image = extract_weapon_images(weapon_html, weapon_name)
-                dlc_exclusive = check_dlc_exclusive(gallery_data, weapon_link)
-                
-                final_weapon_name = weapon_name or weapon_link['text']
-                
-                weapon_data = {
-                    'weapon_name': final_weapon_name,
-                    'weapon_type': weapon_type,
-                    'wikiGGLink': weapon_url,
-                    'wikiFextralifeLink': f"https://eldenring.wiki.fextralife.com/{final_weapon_name.replace(' ', '+')}",
-                    'attributes': attributes,
-                    'damage_types': damage_types,
-                    'attack_types': get_attack_types(final_weapon_name, weapon_type),
-                    'status_buildup': check_status_buildup(final_weapon_name),
-                    'image': image,
-                    'dlc_exclusive': dlc_exclusive
-                }
-                
-                # Only add to gallery if it's not already there
-                if final_weapon_name not in existing_weapon_names:
-                    gallery_weapons.append(weapon_data)
-                    newly_processed_count += 1
-                    
-                    # Save gallery file immediately after adding new weapon
-                    with open(gallery_filepath, 'w', encoding='utf-8') as f:
-                        json.dump(gallery_weapons, f, indent=2, ensure_ascii=False)
-                    print(f"✓ Updated gallery file: {gallery_filepath} ({len(gallery_weapons)} weapons total)")
-                
-                all_weapons.append(weapon_data)
-                processed_weapons.add(weapon_id)
-                
-                # Save progress
-                with open(progress_file, 'w') as f:
-                    json.dump({
-                        'processed_weapons': list(processed_weapons),
-                        'total_processed': len(processed_weapons)
-                    }, f, indent=2)
-                
-                print(f"✓ Processed: {final_weapon_name}")
+            # Only added if the gallery does not have it already
+            if store.add_weapon(weapon_id, weapon_data):
+                state['newly_processed'] += 1
+            
+            all_weapons.append(weapon_data)
+            dead_letter.remove(weapon_url)
+            
+            print(f"{position} ✓ Processed: {final_weapon_name} ({weapon_type})\n")
+    
+    def run_fetch(run_jobs):
+        with ExtractPipeline(extract_weapon_record, write_weapon, store.commit, workers=extract_workers,
+                             queue_size=EXTRACT_QUEUE_SIZE, batch_size=WRITE_BATCH_SIZE) as pipeline:
+            handle_weapon = lambda job, fetch_result: fetched_weapon(pipeline, job, fetch_result)
+            if backend == "api":
+                print(f"Weapons to fetch this run: {len(run_jobs)} (MediaWiki API batch mode)")
+                revision_ids = fetch_pages_via_api(MediaWikiAPI(wiki_client, api_url), run_jobs, handle_weapon)
+                # Record revisions so a later incremental refresh has a baseline
+                store.save_revision_ids("weapons", revision_ids)
             else:
-                print(f"✗ Failed to fetch: {weapon_link['text']}")
-        
-        # Gallery file is now saved incrementally, just store the data for summary
-        if gallery_weapons:
-            weapons_by_gallery[weapon_type] = gallery_weapons
-            print(f"✓ Gallery {weapon_type} complete: {len(gallery_weapons)} weapons total ({newly_processed_count} newly processed)")
+                print(f"Weapons to fetch this run: {len(run_jobs)} (concurrency {concurrency})")
+                fetch_pages(wiki_client, run_jobs, handle_weapon, concurrency=concurrency,
+                            per_host_concurrency=PER_HOST_CONCURRENCY)
+        pipeline.report()
+    
+    run_fetch(jobs)
+    
+    # Give pages that failed after all retries another pass once the host has recovered
+    retry_jobs = [job for job in jobs if job[1] in dead_letter]
+    for retry_pass in range(DEAD_LETTER_RETRY_PASSES):
+        if not retry_jobs:
+            break
+        print(f"\n=== Dead-Letter Retry Pass {retry_pass + 1}: {len(retry_jobs)} weapons ===")
+        wiki_client.wait_for_breakers()
+        run_fetch(retry_jobs)
+        retry_jobs = [job for job in retry_jobs if job[1] in dead_letter]
+    if retry_jobs:
+        print(f"✗ {len(retry_jobs)} weapons are still in the dead-letter file: {dead_letter.path}")
+    
+    # Per-gallery totals come from the store, newly processed counts from this run
+    gallery_counts = store.gallery_summary()
+    for state in gallery_states.values():
+        count = gallery_counts.get(state['weapon_type'], 0)
+        if count:
+            print(f"✓ Gallery {state['weapon_type']} complete: {count} weapons total ({state['newly_processed']} newly processed)")
+    store.finish_run(processed=len(all_weapons), failed=len(retry_jobs), galleries=gallery_counts)
     
     print(f"\n=== Bulk Fetch Complete ===")
     print(f"Successfully processed: {len(all_weapons)} weapons")
     print(f"Total time: {len(all_weapons) * MIN_REQUEST_INTERVAL / 60:.1f} minutes")
+    response_cache.report()
+    response_cache.flush()
     
     # Save combined file as well
     combined_filename = "all_weapons_data.json"
@@ -1335,25 +598,108 @@ def fetch_all_weapons(gallery_data, base_url="https://eldenring.wiki.gg"):
         json.dump(all_weapons, f, indent=2, ensure_ascii=False)
     print(f"✓ Combined data saved to: {combined_filename}")
     
-    # Save gallery summary
-    gallery_summary = {
-        'total_weapons': len(all_weapons),
-        'galleries': {}
-    }
-    
-    for weapon_type, weapons in weapons_by_gallery.items():
-        gallery_summary['galleries'][weapon_type] = {
-            'count': len(weapons),
-            'filename': f"weapons_{weapon_type.lower().replace(' ', '_').replace('-', '_')}.json"
-        }
+    print(f"✓ Run {store.run_id} recorded in: {store.path}")
+    store.close()
     
-    gallery_summary_filepath = os.path.join(progress_dir, "gallery_summary.json")
-    with open(gallery_summary_filepath, 'w', encoding='utf-8') as f:
-        json.dump(gallery_summary, f, indent=2, ensure_ascii=False)
-    print(f"✓ Gallery summary saved to: {gallery_summary_filepath}")
+    # Flag classification entries that no scraped weapon matched
+    report_unmatched_names(
+        classification_index,
+        weapon_names=[weapon['weapon_name'] for weapon in all_weapons],
+        weapon_types=[weapon['weapon_type'] for weapon in all_weapons]
+    )
     
     return all_weapons
 
+def refresh_weapons(gallery_data, base_url="https://eldenring.wiki.gg", api_url=WIKI_API_URL):
+    """
+    Incremental refresh: ask the wiki for the latest revision ID of every weapon
+    page in batched queries, compare them with the IDs saved by the previous run,
+    and re-fetch and re-extract only the pages that changed. Only the changed
+    weapons are updated in the scrape store.
+    """
+    api = MediaWikiAPI(wiki_client, api_url)
+    store = open_scrape_store()
+    store.start_run("refresh")
+    
+    dlc_index = build_dlc_index(gallery_data)
+    
+    # Page title -> (gallery_index, weapon_link)
+    pages = {}
+    for gallery_index, gallery in enumerate(gallery_data):
+        for item in gallery['list_items']:
+            weapon_link = get_weapon_link(item)
+            if weapon_link:
+                pages[title_from_href(weapon_link['href'])] = (gallery_index, weapon_link)
+    
+    print(f"\n=== Starting Incremental Refresh ===")
+    print(f"Checking revisions of {len(pages)} weapon pages...")
+    # Revision IDs saved before the scrape store existed are still a valid baseline
+    previous = store.revision_ids("weapons") or load_revision_ids(REVISIONS_FILE)
+    current = api.latest_revision_ids(sorted(pages))
+    diff = diff_revision_ids(previous, current)
+    stale_titles = diff['changed'] + diff['added']
+    print(f"Revision check used {api.requests_made} API requests")
+    
+    # Re-fetch and re-extract only the stale pages
+    updated_weapons = []
+    refreshed_titles = []
+    
+    def handle_weapon(job, fetch_result):
+        title, gallery_index, weapon_link = job
+        weapon_url = urljoin(base_url, weapon_link['href'])
+        if not fetch_result.text:
+            print(f"✗ Failed to fetch: {weapon_link['text']}")
+            dead_letter.add(weapon_url, "refresh fetch failed")
+            return
+        weapon_type = get_weapon_type_from_gallery(gallery_index)
+        store.save_page(weapon_url, fetch_result.text, revision=current.get(title))
+        weapon_data = build_weapon_record(fetch_result.text, weapon_link, weapon_type, weapon_url, dlc_index)
+        dead_letter.remove(weapon_url)
+        # Replaces the stored record in place, keeping its position in the gallery
+        if store.upsert_weapon(weapon_link['href'], weapon_data):
+            updated_weapons.append(f"{weapon_type}: {weapon_data['weapon_name']}")
+        refreshed_titles.append(title)
+        print(f"✓ Re-extracted: {weapon_data['weapon_name']}")
+    
+    if stale_titles:
+        jobs = [
+            ((title, pages[title][0], pages[title][1]), urljoin(base_url, pages[title][1]['href']))
+            for title in stale_titles
+        ]
+        fetch_pages_via_api(api, jobs, handle_weapon)
+    
+    store.commit()
+    
+    # Keep the old revision for pages that failed so they are retried next time
+    saved_revision_ids = {title: previous[title] for title in diff['changed']}
+    saved_revision_ids.update({title: current[title] for title in diff['unchanged'] + refreshed_titles})
+    store.save_revision_ids("weapons", saved_revision_ids, replace=True)
+    store.finish_run(changed=len(diff['changed']), added=len(diff['added']), updated=len(updated_weapons))
+    store.close()
+    
+    print(f"\n=== Incremental Refresh Summary ===")
+    print(f"Unchanged pages: {len(diff['unchanged'])}")
+    print(f"Changed pages: {len(diff['changed'])}")
+    for title in diff['changed']:
+        print(f"  ~ {title} (rev {previous[title]} -> {current[title]})")
+    print(f"New pages: {len(diff['added'])}")
+    for title in diff['added']:
+        print(f"  + {title}")
+    if diff['removed']:
+        print(f"Pages no longer found: {len(diff['removed'])}")
+        for title in diff['removed']:
+            print(f"  - {title}")
+    failed = sorted(set(stale_titles) - set(refreshed_titles))
+    if failed:
+        print(f"Failed to refresh: {', '.join(failed)}")
+    print(f"Weapons updated in {store.path}: {len(updated_weapons)}")
+    for weapon in updated_weapons:
+        print(f"  - {weapon}")
+    print(f"Export them with: python scrape_store.py export")
+    print(f"Total API requests: {api.requests_made}")
+    
+    return diff
+
 def display_weapon_summary(weapon_data):
     """
     Display a formatted summary of weapon data.
@@ -1457,30 +803,30 @@ def main():
         print(f"\n=== Options ===")
         print("1. Fetch single weapon (first from first gallery)")
         print("2. Fetch all weapons (bulk mode)")
-        print("3. Exit")
+        print("3. Fetch all weapons (MediaWiki API batch mode)")
+        print("4. Refresh changed weapons only (incremental, MediaWiki API)")
+        print("5. Exit")
         
-        choice = input("\nEnter your choice (1-3): ").strip()
+        choice = input("\nEnter your choice (1-5): ").strip()
         
         if choice == "1":
             # Fetch the first weapon page
-            weapon_data = fetch_first_weapon_page(gallery_data)
+            weapon_data = fetch_first_weapon_page(gallery_data, build_dlc_index(gallery_data))
             
             if weapon_data:
                 display_weapon_summary(weapon_data)
         
-        elif choice == "2":
+        elif choice in ("2", "3"):
             # Fetch all weapons
-            all_weapons = fetch_all_weapons(gallery_data)
+            backend = "api" if choice == "3" else "html"
+            all_weapons = fetch_all_weapons(gallery_data, backend=backend)
             print(f"\n=== Bulk Fetch Summary ===")
             print(f"Total weapons processed: {len(all_weapons)}")
-            
-            # Save combined data
-            combined_filename = "all_weapons_data.json"
-            with open(combined_filename, 'w', encoding='utf-8') as f:
-                json.dump(all_weapons, f, indent=2, ensure_ascii=False)
-            print(f"Combined data saved to: {combined_filename}")
         
-        elif choice == "3":
+        elif choice == "4":
+            refresh_weapons(gallery_data)
+        
+        elif choice == "5":
             print("Exiting...")
         
         else:
@@ -1489,4 +835,8 @@ def main():
         print("No gallery data found")
 
 if __name__ == "__main__":
+    # --record <archive.zip> saves every HTTP exchange; --replay <archive.zip> serves them offline
+    configure_from_argv(wiki_client, sys.argv[1:])
+    # --parser html.parser|lxml|selectolax picks the HTML parser backend
+    configure_parser_from_argv(sys.argv[1:])
     main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Weapon and spell records shaped like the frontend's ProcessedItem.
+
+weaponsStore turns the loaded records into ProcessedItems (name, category,
+type, requiredAttributes, trackedDamageTypes, ...) and filtersStore filters
+those. `processed_items` does the same conversion, so the Python reference
+filters (requirement_matrix's object walk, rl1query's frontend_filter)
+read the same fields the frontend does, and the constants here are the
+ones from src/model/constants.ts and filtersStore.ts.
+
+Usage:
+    python frontend_items.py [resources_dir]   print the item count per type and category
+"""
+
+import sys
+from collections import Counter
+
+from data_bundle import load_resource_records
+
+WEAPON_ITEM = 'weapon'
+SPELL_ITEM = 'spell'
+
+# As in src/model/constants.ts and filtersStore.ts
+SHIELD_CATEGORIES = ('Greatshields', 'Small Shields', 'Medium Shields', 'Thrusting Shields')
+STAVE_AND_SEAL_CATEGORIES = ('Staves', 'Sacred Seals')
+
+# Damage types the frontend filters on, 'None' for spells without damage
+TRACKED_DAMAGE_TYPES = ('Physical', 'Fire', 'Lightning', 'Holy', 'Magic', 'None')
+
+def transform_name(name):
+    """
+    model/utils.ts transformName: the first é/É unaccented, then lowercased.
+    """
+    return name.replace('é', 'e', 1).replace('É', 'E', 1).lower()
+
+def tracked_damage_types(item_type, category, major, minor):
+    """
+    The damage types the frontend filters on (weaponsStore trackedDamageTypes).
+    For spells, `major` is the spell's damage type list and `minor` is unused.
+    """
+    if item_type == SPELL_ITEM:
+        return list(major) if major else ['None']
+    if category in STAVE_AND_SEAL_CATEGORIES:
+        return []
+    types = [damage_type for damage_type in [major, *(minor or [])] if damage_type]
+    if any(damage_type != 'Physical' for damage_type in types):
+        return [damage_type for damage_type in types if damage_type != 'Physical']
+    return ['Physical']
+
+def processed_items(weapons, spells):
+    """
+    Records shaped like weaponsStore's ProcessedItem (the fields filtersStore
+    reads), weapons first.
+    """
+    items = []
+    for weapon in weapons:
+        attributes = weapon.get('attributes') or {}
+        strength = attributes.get('strength') or {}
+        damage = weapon.get('damage_types') or {}
+        items.append({
+            'name': weapon['weapon_name'], 'category': weapon['weapon_type'], 'type': WEAPON_ITEM,
+            'requiredAttributes': {
+                'strengthOneHand': strength.get('one_hand') or 0, 'strengthTwoHand': strength.get('two_hand') or 0,
+                'dexterity': attributes.get('dexterity') or 0, 'intelligence': attributes.get('intelligence') or 0,
+                'faith': attributes.get('faith') or 0, 'arcane': attributes.get('arcane') or 0,
+            },
+            'trackedDamageTypes': tracked_damage_types(WEAPON_ITEM, weapon['weapon_type'],
+                                                       damage.get('major'), damage.get('minor')),
+            'attackTypes': weapon.get('attack_types') or {},
+            'statusBuildup': weapon.get('status_buildup'),
+            'dlcExclusive': bool(weapon.get('dlc_exclusive')),
+        })
+    for spell in spells:
+        requirements = spell['requirements']
+        items.append({
+            'name': spell['spell_name'], 'category': spell['spell_type'], 'type': SPELL_ITEM,
+            'requiredAttributes': {
+                'strengthOneHand': 0, 'strengthTwoHand': 0, 'dexterity': 0,
+                'intelligence': requirements['intelligence'] or 0, 'faith': requirements['faith'] or 0,
+                'arcane': requirements['arcane'] or 0,
+            },
+            'trackedDamageTypes': tracked_damage_types(SPELL_ITEM, spell['spell_type'], spell['damage_types'], None),
+            'attackTypes': {'primary': 'None', 'secondary': 'None'},
+            'statusBuildup': spell['status_buildup'] or 'None',
+            'dlcExclusive': bool(spell['dlc_exclusive']),
+        })
+    return items
+
+if __name__ == "__main__":
+    items = processed_items(*load_resource_records(*sys.argv[1:2]))
+    for (item_type, category), count in sorted(Counter((item['type'], item['category']) for item in items).items()):
+        print(f"{item_type:>6} | {category:<24} | {count:>4}")
+    print(f"{len(items)} items")
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive of raw HTML pages.
+
+Pages are stored once per distinct content: each blob is compressed (zstd
+when the zstandard package is installed, gzip otherwise) and appended to a
+single pack file, keyed by the SHA-256 of the uncompressed page. A small
+JSON index maps blob hashes to their place in the pack, and page names
+(like "weapons_page.html") to the history of blobs saved under them, so
+older snapshots stay readable and an unchanged page is never stored twice.
+
+Reads memory-map the pack file and decompress only the requested blob.
+
+`read_local_html` in the scrape scripts reads through `read_html`: a loose
+file on disk is read and, when its content differs from the latest
+snapshot under its name, archived; without a loose file the latest
+snapshot is served. Pages fetched during a scrape are archived too, under
+their URL, by ScrapeStore.save_page, so this is the one store of raw pages.
+
+Usage:
+    python html_archive.py add <file.html> ...   archive files (named by basename)
+    python html_archive.py get <name> [version]  print a page (version -1 is the latest)
+    python html_archive.py list                  names and snapshot counts
+    python html_archive.py stats                 raw vs stored size
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+
+DEFAULT_ARCHIVE_DIR = os.path.join("progress", "html_archive")
+PACK_FILENAME = "blobs.pack"
+INDEX_FILENAME = "index.json"
+ARCHIVE_INDEX_VERSION = 1
+
+ZSTD_LEVEL = 19
+GZIP_LEVEL = 9
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+def compress(data):
+    """
+    Compress with the best codec available. Returns (codec, compressed bytes).
+    """
+    zstandard = _zstd()
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return 'gzip', gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+def decompress(codec, data):
+    if codec == 'gzip':
+        return gzip.decompress(data)
+    if codec == 'zstd':
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError("This archive holds zstd blobs; install zstandard to read them")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown archive codec '{codec}'")
+
+class HtmlArchive:
+    """
+    A pack file of compressed blobs plus an index, in one directory.
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE_DIR):
+        self.path = path
+        self.pack_path = os.path.join(path, PACK_FILENAME)
+        self.index_path = os.path.join(path, INDEX_FILENAME)
+        self._blobs = {}  # sha256 -> [offset, length, codec, raw size]
+        self._names = {}  # name -> [{'sha256': ..., 'saved_at': ...}, ...], oldest first
+        self._map = None
+        self._map_file = None
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != ARCHIVE_INDEX_VERSION:
+                raise ValueError(f"Unsupported HTML archive index version {index.get('version')} in {self.index_path}")
+            self._blobs = index['blobs']
+            self._names = index['names']
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def names(self):
+        return sorted(self._names)
+
+    def history(self, name):
+        """
+        Snapshots saved under `name`, oldest first.
+        """
+        return list(self._names.get(name, []))
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': ARCHIVE_INDEX_VERSION, 'blobs': self._blobs, 'names': self._names},
+                      f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    def put(self, name, html):
+        """
+        Archive a page under `name`. Returns its SHA-256; content already in
+        the pack is not stored again.
+        """
+        data = html.encode('utf-8') if isinstance(html, str) else html
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._blobs:
+            codec, blob = compress(data)
+            os.makedirs(self.path, exist_ok=True)
+            # The blob is durable before the index points at it; a crash in
+            # between only leaves unreferenced bytes at the end of the pack
+            with open(self.pack_path, 'ab') as f:
+                offset = f.tell()
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            self._blobs[digest] = [offset, len(blob), codec, len(data)]
+        history = self._names.setdefault(name, [])
+        if not history or history[-1]['sha256'] != digest:
+            history.append({'sha256': digest, 'saved_at': time.time()})
+        self._save_index()
+        return digest
+
+    def _mapped(self, end):
+        """
+        Memory map of the pack covering at least `end` bytes.
+        """
+        if self._map is None or len(self._map) < end:
+            self.close()
+            self._map_file = open(self.pack_path, 'rb')
+            self._map = mmap.mmap(self._map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def get_blob(self, digest):
+        """
+        Raw bytes of a blob, or None.
+        """
+        entry = self._blobs.get(digest)
+        if entry is None:
+            return None
+        offset, length, codec, _ = entry
+        data = decompress(codec, self._mapped(offset + length)[offset:offset + length])
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"HTML archive blob {digest} is corrupt in {self.pack_path}")
+        return data
+
+    def get(self, name, version=-1):
+        """
+        The page saved under `name` (the latest snapshot by default), or None.
+        """
+        history = self._names.get(name)
+        if not history:
+            return None
+        data = self.get_blob(history[version]['sha256'])
+        return data.decode('utf-8') if data is not None else None
+
+    def stats(self):
+        """
+        Blob count, total raw size and stored (pack) size in bytes.
+        """
+        raw = sum(entry[3] for entry in self._blobs.values())
+        stored = sum(entry[1] for entry in self._blobs.values())
+        return {'blobs': len(self._blobs), 'names': len(self._names), 'raw_bytes': raw, 'stored_bytes': stored}
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._map_file is not None:
+            self._map_file.close()
+            self._map_file = None
+
+_default_archive = None
+
+def default_archive():
+    global _default_archive
+    if _default_archive is None:
+        _default_archive = HtmlArchive()
+    return _default_archive
+
+def read_html(filename, archive=None):
+    """
+    Read a page by filename: from disk when the file exists (archiving it
+    under its base name if it differs from the latest snapshot), otherwise
+    the latest snapshot in the archive. Returns None when neither has it.
+    """
+    archive = archive or default_archive()
+    name = os.path.basename(filename)
+    content = None
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error reading local HTML file {filename}: {e}")
+
+    if content is not None:
+        print(f"Successfully read local HTML file: {filename} ({len(content)} characters)")
+        history = archive.history(name)
+        if not history or history[-1]['sha256'] != hashlib.sha256(content.encode('utf-8')).hexdigest():
+            archive.put(name, content)
+            print(f"Archived {filename} in: {archive.path}")
+        return content
+    if name in archive:
+        content = archive.get(name)
+        print(f"Successfully read archived HTML: {name} ({len(content)} characters)")
+        return content
+    print(f"Local HTML file not found: {filename}")
+    return None
+
+def save_html(filename, html_content, archive=None):
+    """
+    Archive a page under the base name of `filename`. Returns its SHA-256.
+    """
+    archive = archive or default_archive()
+    return archive.put(os.path.basename(filename), html_content)
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    html_archive = default_archive()
+    if command == 'add' and len(sys.argv) > 2:
+        for filepath in sys.argv[2:]:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                digest = save_html(filepath, f.read(), html_archive)
+            print(f"{os.path.basename(filepath)}: {digest}")
+    elif command == 'get' and len(sys.argv) > 2:
+        page = html_archive.get(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else -1)
+        if page is None:
+            print(f"Not in the archive: {sys.argv[2]}")
+            sys.exit(1)
+        sys.stdout.write(page)
+    elif command == 'list':
+        for name in html_archive.names():
+            print(f"{name}: {len(html_archive.history(name))} snapshots")
+    elif command == 'stats':
+        stats = html_archive.stats()
+        ratio = stats['raw_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0.0
+        print(f"{stats['names']} names, {stats['blobs']} blobs: {stats['raw_bytes']} bytes raw, "
+              f"{stats['stored_bytes']} bytes stored ({ratio:.1f}x)")
+    else:
+        print(__doc__)
+        sys.exit(1)
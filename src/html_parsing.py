@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Parser backends and targeted parsing for the scrapers.
+
+Every extractor gets its BeautifulSoup tree from `parse_html`, which can use
+one of three backends:
+
+- "html.parser": Python's built-in parser (the default)
+- "lxml": the C parser from lxml, through BeautifulSoup
+- "selectolax": Lexbor's CSS engine picks out the target elements and only
+  those fragments are handed to BeautifulSoup
+
+Extractors pass the elements they actually read as `ParseTargets` (simple
+CSS selectors, optionally below one ancestor: `div#content img`). With
+html.parser and lxml those become a strainer, so no tree is built for
+anything outside the targets; the strainer sees every start and end tag
+to know when a descendant selector's ancestor is open. The tree returned for a
+given page is the same whichever backend is used: the outermost matching
+elements, in document order.
+
+Scripts choose a backend with `--parser <backend>`.
+"""
+
+import importlib.util
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_PARSER_BACKEND = 'html.parser'
+
+# Parser for the fragments selectolax picks out
+FRAGMENT_PARSER = 'html.parser'
+
+_parser_backend = DEFAULT_PARSER_BACKEND
+
+SELECTOR_PART_PATTERN = re.compile(r'([#.])([\w-]+)|\[([\w-]+)(?:="([^"]*)")?\]')
+TAG_PATTERN = re.compile(r'[a-zA-Z][\w-]*')
+# Whitespace between an ancestor and a descendant selector (not inside [...])
+SELECTOR_SPLIT_PATTERN = re.compile(r'\s+(?![^\[]*\])')
+
+class Selector:
+    """
+    One compound selector: `tag`, `#id`, `.class`, `[attr]` and
+    `[attr="exact value"]`, combined without spaces.
+    """
+
+    def __init__(self, css):
+        self.css = css
+        tag_match = TAG_PATTERN.match(css)
+        self.tag = tag_match.group(0).lower() if tag_match else None
+        position = tag_match.end() if tag_match else 0
+        # (attribute, value, mode) with mode 'equals', 'word' or 'present'
+        self.conditions = []
+        for part in SELECTOR_PART_PATTERN.finditer(css, position):
+            if part.start() != position:
+                break
+            prefix, name, attribute, value = part.groups()
+            if prefix == '#':
+                self.conditions.append(('id', name, 'equals'))
+            elif prefix == '.':
+                self.conditions.append(('class', name, 'word'))
+            elif value is None:
+                self.conditions.append((attribute, None, 'present'))
+            else:
+                self.conditions.append((attribute, value, 'equals'))
+            position = part.end()
+        if position != len(css):
+            raise ValueError(f"Unsupported selector: {css}")
+
+        # Precompiled find_all arguments for searching a parsed tree
+        self._find_attrs = {}
+        for attribute, value, mode in self.conditions:
+            if attribute in self._find_attrs:
+                raise ValueError(f"Selector repeats the {attribute} attribute: {css}")
+            # BeautifulSoup matches a single word against any class, and a
+            # string with spaces against the whole attribute value
+            self._find_attrs[attribute] = True if mode == 'present' else value
+
+    def find_all(self, root):
+        """
+        All matching elements below `root`, in document order.
+        """
+        return root.find_all(self.tag or True, attrs=self._find_attrs)
+
+    def find(self, root):
+        return root.find(self.tag or True, attrs=self._find_attrs)
+
+    def matches(self, name, attrs):
+        """
+        Check a tag's name and raw attributes (as seen while parsing).
+        """
+        if self.tag and name != self.tag:
+            return False
+        for attribute, value, mode in self.conditions:
+            actual = attrs.get(attribute) if attrs else None
+            if actual is None:
+                return False
+            if isinstance(actual, (list, tuple)):
+                actual = ' '.join(actual)
+            if mode == 'equals' and actual != value:
+                return False
+            if mode == 'word' and value not in actual.split():
+                return False
+        return True
+
+class ParseTargets:
+    """
+    Precompiled set of selectors naming the elements an extractor reads.
+    A selector may be `ancestor descendant`: the descendant only matches
+    inside an element matching the ancestor, which must name its tag.
+    """
+
+    def __init__(self, *selectors):
+        self.selectors = []  # (selector, ancestor selector or None)
+        for css in selectors:
+            parts = SELECTOR_SPLIT_PATTERN.split(css.strip())
+            if len(parts) > 2:
+                raise ValueError(f"Unsupported selector: {css}")
+            ancestor = Selector(parts[0]) if len(parts) == 2 else None
+            if ancestor is not None and ancestor.tag is None:
+                raise ValueError(f"Ancestor selector needs a tag name: {css}")
+            self.selectors.append((Selector(parts[-1]), ancestor))
+        self.ancestors = tuple(ancestor for _, ancestor in self.selectors if ancestor is not None)
+        self.css = ', '.join(selectors)
+
+    def matches(self, name, attrs, open_ancestors=()):
+        """
+        Check a tag; `open_ancestors` are the ancestor selectors it is inside.
+        """
+        return any(selector.matches(name, attrs) and (ancestor is None or ancestor in open_ancestors)
+                   for selector, ancestor in self.selectors)
+
+class TargetStrainer(SoupStrainer):
+    """
+    Strainer that builds only elements matching `targets` (and everything
+    inside them). Top-level text outside the targets is dropped. For
+    descendant selectors, `start_tag` and `end_tag` see every tag and keep
+    the nesting depth of each ancestor selector's tag while it is open.
+    """
+
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = targets
+        self.depths = {ancestor: 0 for ancestor in targets.ancestors}
+
+    def open_ancestors(self):
+        return [ancestor for ancestor, depth in self.depths.items() if depth]
+
+    def start_tag(self, name, attrs):
+        for ancestor, depth in self.depths.items():
+            if depth:
+                if name == ancestor.tag:
+                    self.depths[ancestor] = depth + 1
+            elif ancestor.matches(name, attrs):
+                self.depths[ancestor] = 1
+
+    def end_tag(self, name):
+        for ancestor, depth in self.depths.items():
+            if depth and name == ancestor.tag:
+                self.depths[ancestor] = depth - 1
+
+    # bs4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.targets.matches(name, attrs, self.open_ancestors())
+
+    def allow_string_creation(self, string):
+        return False
+
+    # bs4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        name = getattr(markup_name, 'name', markup_name)
+        attrs = getattr(markup_name, 'attrs', markup_attrs)
+        return self.targets.matches(name, dict(attrs or {}), self.open_ancestors())
+
+    def search(self, markup):
+        if isinstance(markup, str):
+            return None
+        return markup if self.search_tag(markup) else None
+
+class _TargetedSoup(BeautifulSoup):
+    """
+    BeautifulSoup that reports every start and end tag to its
+    TargetStrainer, including the ones it does not build.
+    """
+
+    def handle_starttag(self, name, namespace, nsprefix, attrs, *args, **kwargs):
+        self.parse_only.start_tag(name, attrs)
+        return super().handle_starttag(name, namespace, nsprefix, attrs, *args, **kwargs)
+
+    def handle_endtag(self, name, nsprefix=None):
+        self.parse_only.end_tag(name)
+        return super().handle_endtag(name, nsprefix)
+
+def set_parser_backend(backend):
+    """
+    Select the backend used when `parse_html` is not given one.
+    """
+    global _parser_backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}'. Choose one of: {', '.join(PARSER_BACKENDS)}")
+    _parser_backend = backend
+    print(f"Using HTML parser backend: {backend}")
+
+def get_parser_backend():
+    return _parser_backend
+
+def available_parser_backends():
+    """
+    Backends whose libraries are installed.
+    """
+    modules = {'lxml': 'lxml', 'selectolax': 'selectolax'}
+    return [
+        backend for backend in PARSER_BACKENDS
+        if backend not in modules or importlib.util.find_spec(modules[backend]) is not None
+    ]
+
+def _selectolax_fragments(html_content, targets):
+    """
+    Return the HTML of the outermost elements matching `targets`, in
+    document order, or None when selectolax is not installed.
+    """
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+
+    selected = LexborHTMLParser(html_content).css(targets.css)
+    selected_ids = {node.mem_id for node in selected}
+    fragments = []
+    for node in selected:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in selected_ids:
+            parent = parent.parent
+        if parent is None:
+            fragments.append(node.html)
+    return ''.join(fragments)
+
+def parse_html(html_content, targets=None, backend=None):
+    """
+    Parse HTML into a BeautifulSoup tree with the chosen backend.
+    With `targets`, only the matching elements are built.
+    """
+    backend = backend or _parser_backend
+
+    if backend == 'selectolax':
+        if targets is None:
+            # Nothing to select; parse the whole page
+            return BeautifulSoup(html_content, FRAGMENT_PARSER)
+        fragments = _selectolax_fragments(html_content, targets)
+        if fragments is not None:
+            return BeautifulSoup(fragments, FRAGMENT_PARSER)
+        print("selectolax backend selected but selectolax is not installed. Falling back to html.parser.")
+        backend = 'html.parser'
+
+    if backend == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            print("lxml backend selected but lxml is not installed. Falling back to html.parser.")
+            backend = 'html.parser'
+
+    if targets is None:
+        return BeautifulSoup(html_content, backend)
+    # Only descendant selectors need to see the tags outside the targets
+    soup_class = _TargetedSoup if targets.ancestors else BeautifulSoup
+    return soup_class(html_content, backend, parse_only=TargetStrainer(targets))
+
+def configure_parser_from_argv(argv):
+    """
+    Apply `--parser <backend>` from argv, if present.
+    """
+    if '--parser' not in argv:
+        return None
+    position = argv.index('--parser')
+    if position + 1 >= len(argv):
+        print(f"--parser needs one of: {', '.join(PARSER_BACKENDS)}")
+        return None
+    set_parser_backend(argv[position + 1])
+    return argv[position + 1]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Record/replay layer for the wiki client.
+
+In record mode every HTTP exchange made through a WikiClient (URL, request
+parameters, status, headers and body) is saved into a compact zip archive,
+with each body deflate-compressed. In replay mode the client answers every
+request from such an archive: no network and no rate limiting, so the full
+scrape pipeline can be profiled and regression-tested at CPU speed.
+
+Scripts enable it with `--record <archive.zip>` or `--replay <archive.zip>`.
+"""
+
+import atexit
+import hashlib
+import json
+import threading
+import zipfile
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+INDEX_MEMBER = "index.json"
+
+# Headers that describe the wire encoding, not the (already decoded) body we store
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+def exchange_key(method, url, params=None, data=None):
+    """
+    Build the lookup key for a request: method, full URL and a digest of any form body.
+    """
+    if params:
+        url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()))}"
+    key = f"{method.upper()} {url}"
+    if data:
+        body = urlencode(sorted(data.items())).encode('utf-8')
+        key += f" body:{hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+class ArchiveMissError(requests.exceptions.RequestException):
+    """
+    Raised in replay mode for a request that is not in the archive.
+    """
+
+class HttpRecorder:
+    """
+    Writes exchanges into a zip archive as they happen.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._index = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def record(self, method, url, params, data, response):
+        with self._lock:
+            member = f"bodies/{len(self._index):06d}"
+            self._zip.writestr(member, response.content)
+            self._index.append({
+                'key': exchange_key(method, url, params, data),
+                'url': response.url or url,
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {
+                    name: value for name, value in response.headers.items()
+                    if name.lower() not in DROPPED_HEADERS
+                },
+                'body': member
+            })
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._zip.writestr(INDEX_MEMBER, json.dumps(self._index, indent=1))
+            self._zip.close()
+            self._closed = True
+        print(f"Recorded {len(self._index)} HTTP exchanges to: {self.path}")
+
+class HttpReplayer:
+    """
+    Serves recorded exchanges. Repeated requests for the same key are served
+    in recording order, and the last one is reused once they run out.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, 'r')
+        self._by_key = {}
+        for exchange in json.loads(self._zip.read(INDEX_MEMBER)):
+            self._by_key.setdefault(exchange['key'], []).append(exchange)
+        self._served = {}
+        self._lock = threading.Lock()
+        print(f"Replaying {sum(len(v) for v in self._by_key.values())} HTTP exchanges from: {path}")
+
+    def response_for(self, method, url, params=None, data=None):
+        key = exchange_key(method, url, params, data)
+        with self._lock:
+            exchanges = self._by_key.get(key)
+            if not exchanges:
+                raise ArchiveMissError(f"No recorded exchange for {key}")
+            position = self._served.get(key, 0)
+            self._served[key] = position + 1
+            exchange = exchanges[min(position, len(exchanges) - 1)]
+            body = self._zip.read(exchange['body'])
+
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.reason = exchange['reason']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response.url = exchange['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = body
+        return response
+
+    def recorded(self):
+        """
+        Yield (exchange, body) for the first recording of every key.
+        """
+        for exchanges in self._by_key.values():
+            yield exchanges[0], self._zip.read(exchanges[0]['body'])
+
+    def close(self):
+        self._zip.close()
+
+def configure_from_argv(client, argv):
+    """
+    Attach a recorder or replayer to `client` from `--record <path>` or
+    `--replay <path>` in argv. Conditional requests are turned off in both
+    modes so that archives always hold complete responses.
+    """
+    for flag in ('--record', '--replay'):
+        if flag in argv:
+            position = argv.index(flag)
+            if position + 1 >= len(argv):
+                print(f"{flag} needs an archive path")
+                return None
+            path = argv[position + 1]
+            client.cache = None
+            if flag == '--record':
+                client.recorder = HttpRecorder(path)
+                atexit.register(client.recorder.close)
+                return client.recorder
+            client.replayer = HttpReplayer(path)
+            return client.replayer
+    return None
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Manifest of the exported data files and a diff against the previous one.
+
+resources/manifest.json lists every exported file with its SHA-256, size,
+record count and schema version. `data_version` is a hash over the hashes
+of the canonical files (the records, the bundle and the requirement
+matrix); files derived from those are listed but left out of it, so the
+version only moves when the data does. The manifest is rewritten whenever
+any listed file changes, derived ones included. It also keeps a short hash
+of every weapon and spell record, so the next export can tell which
+records were added, removed or changed.
+
+resources/manifest_diff.json describes the change from the previous
+manifest's data version to the new one: added records (in full), removed
+record names, and for changed records the fields that changed with their
+old and new values (dotted paths, e.g. "attributes.strength.one_hand").
+Field values need the previous records; the export reads them before
+overwriting the resource files. Without them (running this file on its
+own) changed records are listed without field details.
+
+Usage:
+    python manifest.py [resources_dir]   write the manifest and diff
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+from class_eligibility import ELIGIBILITY_FILENAME, ELIGIBILITY_VERSION
+from data_bundle import BUNDLE_FILENAME, BUNDLE_VERSION, DEFAULT_RESOURCES_DIR, load_resource_records
+from facets import FACET_DICTIONARY_FILENAME, FACET_DICTIONARY_VERSION
+from requirement_matrix import MATRIX_FILENAME, MATRIX_INDEX_FILENAME, MATRIX_VERSION
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_DIFF_FILENAME = "manifest_diff.json"
+MANIFEST_VERSION = 2
+
+# Version of the weapon and spell record layout in weapons_*.json / spells_*.json
+RECORD_SCHEMA_VERSION = 1
+
+# Hex digits of the data version and of record hashes
+HASH_LENGTH = 12
+
+# (glob pattern, schema version, canonical) of every file the manifest
+# covers; only canonical files feed data_version
+MANIFEST_FILES = [
+    ('weapons_*.json', RECORD_SCHEMA_VERSION, True),
+    ('spells_*.json', RECORD_SCHEMA_VERSION, True),
+    (FACET_DICTIONARY_FILENAME, FACET_DICTIONARY_VERSION, False),
+    (BUNDLE_FILENAME, BUNDLE_VERSION, True),
+    (MATRIX_FILENAME, MATRIX_VERSION, True),
+    (MATRIX_INDEX_FILENAME, MATRIX_VERSION, True),
+    (ELIGIBILITY_FILENAME, ELIGIBILITY_VERSION, False),
+]
+
+def _record_count(filename, data):
+    if filename.startswith(('weapons_', 'spells_')):
+        return len(json.loads(data))
+    if filename == BUNDLE_FILENAME:
+        bundle = json.loads(data)
+        return bundle['weapons']['count'] + bundle['spells']['count']
+    if filename == MATRIX_INDEX_FILENAME:
+        return json.loads(data)['rows']
+    return None
+
+def record_hash(record):
+    data = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def _record_maps(weapons, spells):
+    return {
+        'weapons': {weapon['weapon_name']: weapon for weapon in weapons},
+        'spells': {spell['spell_name']: spell for spell in spells},
+    }
+
+def build_manifest(resources_dir=DEFAULT_RESOURCES_DIR, weapons=None, spells=None):
+    """
+    The manifest of the files in `resources_dir` (records are read from
+    the resource files unless given).
+    """
+    files = {}
+    for pattern, schema_version, canonical in MANIFEST_FILES:
+        for path in sorted(glob.glob(os.path.join(resources_dir, pattern))):
+            filename = os.path.basename(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            files[filename] = {
+                'sha256': digest,
+                'size': len(data),
+                'records': _record_count(filename, data),
+                'schema_version': schema_version,
+                'canonical': canonical,
+            }
+    if weapons is None or spells is None:
+        weapons, spells = load_resource_records(resources_dir)
+    data_version = hashlib.sha256(
+        ''.join(f"{name}:{entry['sha256']}\n" for name, entry in sorted(files.items()) if entry['canonical']).encode('utf-8')
+    ).hexdigest()[:HASH_LENGTH]
+    return {
+        'version': MANIFEST_VERSION,
+        'data_version': data_version,
+        'generated_at': time.time(),
+        'files': files,
+        'records': {kind: {name: record_hash(record) for name, record in records.items()}
+                    for kind, records in _record_maps(weapons, spells).items()},
+    }
+
+def _flatten(value, prefix=''):
+    if isinstance(value, dict):
+        fields = {}
+        for key, item in value.items():
+            fields.update(_flatten(item, f"{prefix}{key}."))
+        return fields
+    return {prefix[:-1]: value}
+
+def field_changes(old, new):
+    """
+    {dotted field: [old value, new value]} for every field that differs.
+    A field missing on one side is None there.
+    """
+    old_fields = _flatten(old)
+    new_fields = _flatten(new)
+    return {field: [old_fields.get(field), new_fields.get(field)]
+            for field in sorted(set(old_fields) | set(new_fields))
+            if old_fields.get(field) != new_fields.get(field)}
+
+def build_diff(previous_manifest, manifest, previous_records=None, records=None):
+    """
+    The record-level diff between two manifests. `previous_records` and
+    `records` are (weapons, spells); with both given, changed records get
+    their field changes.
+    """
+    old_maps = _record_maps(*previous_records) if previous_records else None
+    new_maps = _record_maps(*records) if records else None
+    diff = {
+        'version': MANIFEST_VERSION,
+        'from': previous_manifest['data_version'] if previous_manifest else None,
+        'to': manifest['data_version'],
+        'files': sorted(name for name, entry in manifest['files'].items()
+                        if not previous_manifest or previous_manifest['files'].get(name, {}).get('sha256') != entry['sha256']),
+        'removed_files': sorted(set(previous_manifest['files']) - set(manifest['files'])) if previous_manifest else [],
+    }
+    for kind, hashes in manifest['records'].items():
+        old_hashes = previous_manifest['records'].get(kind, {}) if previous_manifest else {}
+        added = [name for name in hashes if name not in old_hashes]
+        changed = [name for name in hashes if name in old_hashes and old_hashes[name] != hashes[name]]
+        diff[kind] = {
+            'added': {name: new_maps[kind][name] if new_maps else None for name in added},
+            'removed': sorted(name for name in old_hashes if name not in hashes),
+            'changed': {
+                name: (field_changes(old_maps[kind][name], new_maps[kind][name])
+                       if old_maps and new_maps and name in old_maps[kind] else None)
+                for name in changed
+            },
+        }
+    return diff
+
+def _write_json(path, data):
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+def write_manifest(resources_dir=DEFAULT_RESOURCES_DIR, previous_records=None):
+    """
+    Write the manifest when any listed file changed, and the diff against the
+    previous manifest if there is one. `previous_records` is (weapons, spells)
+    as they were before this export. Returns the files written.
+    """
+    manifest_path = os.path.join(resources_dir, MANIFEST_FILENAME)
+    previous_manifest = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous_manifest = json.load(f)
+
+    records = load_resource_records(resources_dir)
+    manifest = build_manifest(resources_dir, *records)
+    # data_version leaves out derived files, so compare every file's hash
+    file_hashes = {name: entry['sha256'] for name, entry in manifest['files'].items()}
+    if (previous_manifest and previous_manifest.get('version') == MANIFEST_VERSION
+            and {name: entry['sha256'] for name, entry in previous_manifest['files'].items()} == file_hashes):
+        print(f"Data unchanged since manifest {manifest['data_version']}")
+        return []
+
+    _write_json(manifest_path, manifest)
+    print(f"✓ Wrote {manifest_path} (data version {manifest['data_version']}, {len(manifest['files'])} files)")
+    if previous_manifest is None:
+        # Nothing to diff against; consumers start from the full files
+        return [manifest_path]
+
+    diff = build_diff(previous_manifest, manifest, previous_records, records)
+    diff_path = os.path.join(resources_dir, MANIFEST_DIFF_FILENAME)
+    _write_json(diff_path, diff)
+    print(f"✓ Wrote {diff_path} ({diff['from']} -> {diff['to']}: " + ', '.join(
+        f"{kind} +{len(diff[kind]['added'])} -{len(diff[kind]['removed'])} ~{len(diff[kind]['changed'])}"
+        for kind in ('weapons', 'spells')) + ")")
+    return [manifest_path, diff_path]
+
+if __name__ == "__main__":
+    write_manifest(*sys.argv[1:2])
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+MediaWiki API backend for the wiki scrapers.
+
+Instead of one HTML request per weapon, titles are fetched in batches of up
+to 50: one `action=query&prop=revisions` call returns the wikitext and
+revision IDs, and one `action=parse` call renders the whole batch. The
+rendered HTML of each page is split back out and wrapped so the existing
+HTML extractors work on it unchanged.
+"""
+
+import html
+import json
+import os
+import re
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup
+
+from wiki_client import FetchResult
+
+DEFAULT_API_URL = "https://eldenring.wiki.gg/api.php"
+
+# MediaWiki's limit for `titles=` on a normal account
+MAX_TITLES_PER_REQUEST = 50
+
+# Title used as the parse context for a batch. Every place a page would
+# render its own name ({{PAGENAME}} in templates) renders this instead, and
+# it is swapped back for the real title after the batch is split.
+RENDER_PLACEHOLDER_TITLE = "RL1BatchRenderPlaceholder"
+
+BATCH_PAGE_CLASS = "rl1-batch-page"
+
+DEFAULT_REVISIONS_FILE = os.path.join("progress", "page_revisions.json")
+
+def title_from_href(href):
+    """
+    Convert a `/wiki/Some_Page%27s_Name` link into a page title.
+    """
+    if href.startswith('/wiki/'):
+        href = href[len('/wiki/'):]
+    return unquote(href).replace('_', ' ')
+
+def chunked(items, size=MAX_TITLES_PER_REQUEST):
+    """
+    Split a list into consecutive chunks of at most `size` items.
+    """
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def wrap_page_html(page_html):
+    """
+    Wrap a rendered page body the way a normal page view does, so that
+    lookups such as `div#mw-content-text` behave the same.
+    """
+    return (
+        '<html><body><div id="mw-content-text" class="mw-body-content">'
+        f'<div class="mw-parser-output">{page_html}</div>'
+        '</div></body></html>'
+    )
+
+class MediaWikiAPI:
+    """
+    Batched access to a MediaWiki API endpoint through a WikiClient, which
+    provides connection pooling, retries and the per-host rate limit.
+    """
+
+    def __init__(self, client, api_url=DEFAULT_API_URL):
+        self.client = client
+        self.api_url = api_url
+        self.requests_made = 0
+
+    def _call(self, params=None, data=None):
+        self.requests_made += 1
+        payload = dict(params or data)
+        payload.setdefault('format', 'json')
+        payload.setdefault('formatversion', '2')
+        if data is not None:
+            return self.client.fetch_json(self.api_url, data=payload)
+        return self.client.fetch_json(self.api_url, params=payload)
+
+    @staticmethod
+    def _resolve_titles(query, requested):
+        """
+        Map every requested title to the final page title after the API's
+        normalization and redirect resolution.
+        """
+        mapping = {title: title for title in requested}
+        for key in ('normalized', 'redirects'):
+            renames = {entry['from']: entry['to'] for entry in query.get(key, [])}
+            for title, current in mapping.items():
+                mapping[title] = renames.get(current, current)
+        return mapping
+
+    def query_revisions(self, titles, content=True):
+        """
+        Fetch the latest revision of each title, 50 per request.
+        Returns {requested title: {'title', 'revid', 'wikitext'}}; missing
+        pages are left out.
+        """
+        results = {}
+        rvprop = 'ids|content' if content else 'ids'
+        for batch in chunked(list(titles)):
+            params = {
+                'action': 'query',
+                'prop': 'revisions',
+                'rvprop': rvprop,
+                'titles': '|'.join(batch),
+                'redirects': '1'
+            }
+            if content:
+                params['rvslots'] = 'main'
+            response = self._call(params=params)
+            if not response or 'query' not in response:
+                print(f"Revision query failed for a batch of {len(batch)} titles")
+                continue
+
+            query = response['query']
+            pages = {page['title']: page for page in query.get('pages', [])}
+            for requested, final in self._resolve_titles(query, batch).items():
+                page = pages.get(final)
+                if not page or page.get('missing') or not page.get('revisions'):
+                    print(f"Page not found via API: {requested}")
+                    continue
+                revision = page['revisions'][0]
+                wikitext = None
+                if content:
+                    wikitext = revision.get('slots', {}).get('main', {}).get('content')
+                results[requested] = {
+                    'title': final,
+                    'revid': revision.get('revid'),
+                    'wikitext': wikitext
+                }
+        return results
+
+    def latest_revision_ids(self, titles):
+        """
+        Fetch only the latest revision ID of each title (no content).
+        Returns {requested title: revid}.
+        """
+        return {requested: info['revid'] for requested, info in self.query_revisions(titles, content=False).items()}
+
+    def render_pages(self, wikitexts):
+        """
+        Render {title: wikitext} with one `action=parse` call per batch.
+        Returns {title: page body HTML}.
+        """
+        rendered = {}
+        for batch in chunked(list(wikitexts.items())):
+            text = '\n'.join(
+                f'<div class="{BATCH_PAGE_CLASS}" data-title="{html.escape(title, quote=True)}">\n'
+                f'{wikitext}\n</div>'
+                for title, wikitext in batch
+            )
+            response = self._call(data={
+                'action': 'parse',
+                'title': RENDER_PLACEHOLDER_TITLE,
+                'contentmodel': 'wikitext',
+                'prop': 'text',
+                'disablelimitreport': '1',
+                'text': text
+            })
+            if not response or 'parse' not in response:
+                print(f"Parse request failed for a batch of {len(batch)} pages")
+                continue
+            rendered.update(split_rendered_batch(response['parse']['text']))
+        return rendered
+
+    def fetch_pages_html(self, titles):
+        """
+        Fetch and render many pages. Returns {requested title: wrapped HTML}
+        and {requested title: revision ID}.
+        """
+        revisions = self.query_revisions(titles)
+        rendered = self.render_pages({
+            info['title']: info['wikitext'] for info in revisions.values() if info['wikitext'] is not None
+        })
+        pages_html = {}
+        for requested, info in revisions.items():
+            if info['title'] in rendered:
+                pages_html[requested] = wrap_page_html(rendered[info['title']])
+        return pages_html, {requested: info['revid'] for requested, info in revisions.items()}
+
+def split_rendered_batch(batch_html):
+    """
+    Split the HTML of a rendered batch into {title: page body HTML}.
+    """
+    soup = BeautifulSoup(batch_html, 'html.parser')
+    pages = {}
+    for container in soup.find_all('div', class_=BATCH_PAGE_CLASS):
+        # Nested containers would mean a page leaked an unclosed div; skip them
+        if container.find_parent('div', class_=BATCH_PAGE_CLASS):
+            continue
+        title = container.get('data-title', '')
+        body = container.decode_contents()
+        pages[title] = body.replace(RENDER_PLACEHOLDER_TITLE, html.escape(title))
+    return pages
+
+def fetch_pages_via_api(api, jobs, handle):
+    """
+    API counterpart of `async_fetch.fetch_pages`: resolve each `(key, url)`
+    job to a page title, fetch all of them in batches and call
+    `handle(key, fetch_result)` for each one.
+    Returns {title: revid} for the pages that were fetched.
+    """
+    titled_jobs = [(key, title_from_href(re.sub(r'^https?://[^/]+', '', url))) for key, url in jobs]
+    pages_html, revision_ids = api.fetch_pages_html(sorted({title for _, title in titled_jobs}))
+    print(f"Fetched {len(pages_html)} pages with {api.requests_made} API requests")
+    for key, title in titled_jobs:
+        handle(key, FetchResult(pages_html.get(title), False))
+    return revision_ids
+
+def load_revision_ids(path=DEFAULT_REVISIONS_FILE):
+    """
+    Load the {title: revid} map saved by runs before revision IDs moved
+    into the scrape store; the refresh functions fall back to it.
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Could not load revision IDs from {path}: {e}")
+        return {}
+
+def diff_revision_ids(previous, current):
+    """
+    Compare two {title: revid} maps.
+    Returns a dict of sorted title lists: 'changed', 'added', 'removed', 'unchanged'.
+    """
+    return {
+        'changed': sorted(t for t in current if t in previous and previous[t] != current[t]),
+        'added': sorted(t for t in current if t not in previous),
+        'removed': sorted(t for t in previous if t not in current),
+        'unchanged': sorted(t for t in current if t in previous and previous[t] == current[t])
+    }
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the wiki's MediaWiki API, for testing the API backend
+offline.
+
+Serves `/api.php` for the two calls the scrapers make:
+  - action=query&prop=revisions  (title normalization, redirects, revids, wikitext)
+  - action=parse&text=...        (returns the stored HTML of each batched page)
+
+Fixtures are a JSON file of the form:
+  {"pages": {"Title": {"revid": 1, "wikitext": "...", "html": "..."}},
+   "redirects": {"Old Title": "Title"}}
+
+fixtures/mediawiki_fixtures.json is a small committed set: weapon pages
+rendered from the resource records (`fixtures_from_records`) in the
+layout the weapon page extractors read, so the API backend runs offline
+without a previous scrape. Regenerate it with `generate`.
+`fixture_page_views` wraps the same pages in the rest of a page view
+(head, navigation, navbox, footer) at about the size of a wiki.gg weapon
+page, for benchmarking the page extractors (see weapon_page.py).
+
+Usage:
+    python mediawiki_fixture_server.py [fixtures.json] [port]       serve fixtures (default: the committed set)
+    python mediawiki_fixture_server.py generate [fixtures.json]     rebuild the committed set from src/resources
+"""
+
+import html
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from bs4 import BeautifulSoup
+
+from mediawiki_api import BATCH_PAGE_CLASS
+from weapon_page import ATTRIBUTE_NAMES, DAMAGE_TYPE_NAMES
+
+BATCH_MARKER = re.compile(r'<div class="' + BATCH_PAGE_CLASS + r'" data-title="([^"]*)">')
+
+DEFAULT_FIXTURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "mediawiki_fixtures.json")
+
+# Weapons in the committed fixture set: one-hand/two-hand strength, elemental
+# damage, a seal, a staff, a shield and an accented name
+FIXTURE_WEAPONS = [
+    'Uchigatana',
+    'Zweihander',
+    'Bloodhound\'s Fang',
+    'Moonveil',
+    'Finger Seal',
+    'Glintstone Staff',
+    'Brass Shield',
+    'Miséricorde',
+]
+
+# Redirects in the committed fixture set
+FIXTURE_REDIRECTS = {'Bloodhounds Fang': "Bloodhound's Fang"}
+
+# Damage table values the fixtures render: the major type must come out highest
+MAJOR_DAMAGE_VALUE = 120
+MINOR_DAMAGE_VALUE = 80
+
+# Image every page shows before the weapon's own (the extractor takes the second)
+PAGE_ICON_SRC = "/images/thumb/Site_Icon.png/30px-Site_Icon.png"
+
+def load_fixtures(path):
+    """
+    Load a fixtures JSON file.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+    fixtures.setdefault('pages', {})
+    fixtures.setdefault('redirects', {})
+    return fixtures
+
+def fixtures_from_html_pages(pages_by_title, start_revid=1000):
+    """
+    Build fixtures from full page HTML (for example saved weapon pages).
+    The stored parse output is the content of the page's `mw-parser-output`
+    (or `mw-content-text`) element.
+    """
+    pages = {}
+    for offset, (title, page_html) in enumerate(sorted(pages_by_title.items())):
+        soup = BeautifulSoup(page_html, 'html.parser')
+        body = soup.find('div', class_='mw-parser-output') or soup.find('div', id='mw-content-text') or soup
+        pages[title] = {
+            'revid': start_revid + offset,
+            'wikitext': f"<!-- fixture for {title} -->",
+            'html': body.decode_contents()
+        }
+    return {'pages': pages, 'redirects': {}}
+
+def _stat_rows(values):
+    return ''.join(f'<tr><th>{label}</th><td><span>{value}</span></td></tr>' for label, value in values)
+
+def render_weapon_page(weapon):
+    """
+    The parse output of a weapon page for a weapon record: the infobox
+    with its title and image, then the damage and requirement tables.
+    """
+    attributes = weapon['attributes']
+    strength = attributes['strength']
+    damage = weapon['damage_types']
+    damage_rows = _stat_rows(
+        (name, MAJOR_DAMAGE_VALUE if name == damage['major'] else MINOR_DAMAGE_VALUE if name in damage['minor'] else 0)
+        for name in DAMAGE_TYPE_NAMES
+    )
+    strength_text = (f"{strength['one_hand']}\\1h {strength['two_hand']}\\2h"
+                     if strength['one_hand'] != strength['two_hand'] else str(strength['one_hand']) if strength['one_hand'] else '-')
+    requirement_rows = _stat_rows(
+        (name, strength_text if name == 'strength' else attributes[name] or '-') for name in ATTRIBUTE_NAMES
+    )
+    image = weapon['image']
+    header = '<tr><th colspan="2">{}</th></tr><tr><th>Type</th><th>Value</th></tr>'
+    return (
+        f'<img src="{PAGE_ICON_SRC}" alt="Site Icon.png">'
+        '<table class="infobox"><tbody>'
+        f'<tr><td><h2 data-source="title">{html.escape(weapon["weapon_name"])}</h2></td></tr>'
+        f'<tr><td><img src="{html.escape(image["src"], quote=True)}" alt="{html.escape(image["alt"], quote=True)}"></td></tr>'
+        '</tbody></table>'
+        f'<table class="mw-collapsible"><tbody>{header.format("Attack Power")}{damage_rows}<tr><th>Critical</th><td><span>100</span></td></tr></tbody></table>'
+        f'<table class="mw-collapsible"><tbody>{header.format("Requirements")}{requirement_rows}</tbody></table>'
+    )
+
+def fixtures_from_records(weapons, redirects=None, start_revid=1000):
+    """
+    Build fixtures from weapon records, titled after their wiki.gg links.
+    """
+    pages = {}
+    for offset, weapon in enumerate(weapons):
+        title = unquote(urlparse(weapon['wikiGGLink']).path[len('/wiki/'):]).replace('_', ' ')
+        pages[title] = {
+            'revid': start_revid + offset,
+            'wikitext': f"<!-- fixture for {title} -->",
+            'html': render_weapon_page(weapon)
+        }
+    return {'pages': pages, 'redirects': dict(redirects or {})}
+
+def generate_fixtures(path=DEFAULT_FIXTURES_FILE):
+    """
+    Write the committed fixture set from the resource records.
+    """
+    from data_bundle import load_resource_records
+
+    weapons, _ = load_resource_records()
+    by_name = {weapon['weapon_name']: weapon for weapon in weapons}
+    fixtures = fixtures_from_records([by_name[name] for name in FIXTURE_WEAPONS], FIXTURE_REDIRECTS)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(path + ".tmp", path)
+    print(f"✓ Wrote {len(fixtures['pages'])} fixture pages to: {path}")
+    return fixtures
+
+def render_page_view(title, page_html, link_titles):
+    """
+    A full page view around a page's parse output: head, header and
+    sidebar, the content area with the page, some prose and a navbox
+    linking `link_titles`, and the footer. Most of the markup, as on the
+    wiki, is navigation around the few elements the extractors read.
+    """
+    links = ''.join(
+        f'<li><a href="/wiki/{html.escape(link.replace(" ", "_"), quote=True)}" '
+        f'title="{html.escape(link, quote=True)}">{html.escape(link)}</a></li>'
+        for link in link_titles
+    )
+    escaped_title = html.escape(title)
+    head = (
+        f'<head><meta charset="UTF-8"><title>{escaped_title} - Elden Ring Wiki</title>'
+        + ''.join(f'<link rel="stylesheet" href="/load.php?modules=skin.{i}&amp;only=styles">' for i in range(20))
+        + '<script>RLCONF=' + json.dumps({'wgPageName': title, 'wgTitle': title,
+                                          'wgCategories': ['Weapons'] * 10, 'wgRelevantArticleId': 1000})
+        + ';</script></head>'
+    )
+    prose = ''.join(f'<p>{escaped_title} is a weapon in Elden Ring. Paragraph {i} of its description, '
+                    f'its location and its notes.</p>' for i in range(12))
+    return (
+        f'<!DOCTYPE html><html lang="en">{head}<body>'
+        '<header id="mw-header"><a href="/"><img src="/images/Wiki_Logo.png" alt="Elden Ring Wiki"></a>'
+        f'<form id="searchform"><input name="search" placeholder="Search"></form></header>'
+        f'<nav id="mw-panel"><ul>{links}</ul></nav>'
+        f'<main id="content"><h1 id="firstHeading">{escaped_title}</h1>'
+        f'<div id="mw-content-text" class="mw-body-content"><div class="mw-parser-output">{page_html}{prose}'
+        f'<table class="navbox"><tbody><tr><th>Weapons</th></tr><tr><td><ul>{links}</ul></td></tr></tbody></table>'
+        '</div></div><div id="catlinks"><ul><li><a href="/wiki/Category:Weapons">Weapons</a></li></ul></div></main>'
+        f'<footer id="footer"><ul>{links}</ul><img src="/images/poweredby_mediawiki.png" alt="Powered by MediaWiki"></footer>'
+        '</body></html>'
+    )
+
+def fixture_page_views(path=DEFAULT_FIXTURES_FILE):
+    """
+    Every page of a fixture set as a full page view (see render_page_view),
+    with a navbox of all weapon names.
+    """
+    from data_bundle import load_resource_records
+
+    link_titles = [weapon['weapon_name'] for weapon in load_resource_records()[0]]
+    pages = load_fixtures(path)['pages']
+    return [render_page_view(title, page['html'], link_titles) for title, page in sorted(pages.items())]
+
+def normalize_title(title):
+    """
+    Apply MediaWiki's basic title normalization (underscores, first letter).
+    """
+    title = title.replace('_', ' ').strip()
+    return title[:1].upper() + title[1:]
+
+class FixtureAPIServer(ThreadingHTTPServer):
+    """
+    HTTP server answering MediaWiki API calls from fixtures.
+    `request_count` counts API calls served.
+    """
+
+    def __init__(self, fixtures, port=0):
+        super().__init__(('127.0.0.1', port), FixtureAPIHandler)
+        self.fixtures = fixtures
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def api_url(self):
+        return f"http://127.0.0.1:{self.server_port}/api.php"
+
+    def start(self):
+        """
+        Serve in a background thread and return self.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def handle_query(self, params):
+        pages_fixture = self.fixtures['pages']
+        redirects_fixture = self.fixtures['redirects']
+        titles = params.get('titles', '').split('|') if params.get('titles') else []
+        with_content = 'content' in params.get('rvprop', '').split('|')
+
+        query = {'normalized': [], 'redirects': [], 'pages': []}
+        seen = set()
+        for title in titles:
+            normalized = normalize_title(title)
+            if normalized != title:
+                query['normalized'].append({'from': title, 'to': normalized})
+            final = normalized
+            if params.get('redirects') and normalized in redirects_fixture:
+                final = redirects_fixture[normalized]
+                query['redirects'].append({'from': normalized, 'to': final})
+            if final in seen:
+                continue
+            seen.add(final)
+
+            page = pages_fixture.get(final)
+            if not page:
+                query['pages'].append({'title': final, 'missing': True})
+                continue
+            revision = {'revid': page['revid']}
+            if with_content:
+                revision['slots'] = {'main': {'contentmodel': 'wikitext', 'content': page.get('wikitext', '')}}
+            query['pages'].append({'title': final, 'revisions': [revision]})
+
+        for key in ('normalized', 'redirects'):
+            if not query[key]:
+                del query[key]
+        return {'batchcomplete': True, 'query': query}
+
+    def handle_parse(self, params):
+        pages_fixture = self.fixtures['pages']
+        parts = ['<div class="mw-parser-output">']
+        for match in BATCH_MARKER.finditer(params.get('text', '')):
+            title = BeautifulSoup(match.group(1), 'html.parser').get_text()
+            page_html = pages_fixture.get(title, {}).get('html', '')
+            parts.append(f'{match.group(0)}{page_html}</div>')
+        parts.append('</div>')
+        return {'parse': {'title': params.get('title', 'API'), 'text': ''.join(parts)}}
+
+    def dispatch(self, params):
+        with self._lock:
+            self.request_count += 1
+        action = params.get('action')
+        if action == 'query':
+            return 200, self.handle_query(params)
+        if action == 'parse':
+            return 200, self.handle_parse(params)
+        return 400, {'error': {'code': 'badvalue', 'info': f"Unrecognized action: {action}"}}
+
+class FixtureAPIHandler(BaseHTTPRequestHandler):
+    def _respond(self, params):
+        if urlparse(self.path).path != '/api.php':
+            self.send_error(404)
+            return
+        status, payload = self.server.dispatch(params)
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._respond({key: values[0] for key, values in query.items()})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        self._respond({key: values[0] for key, values in form.items()})
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    if sys.argv[1:2] == ['generate']:
+        generate_fixtures(*sys.argv[2:3])
+        return
+    fixtures_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FIXTURES_FILE
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    server = FixtureAPIServer(load_fixtures(fixtures_path), port)
+    print(f"Serving MediaWiki API fixtures at {server.api_url} ({len(server.fixtures['pages'])} pages)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping fixture server")
+
+if __name__ == "__main__":
+    main()
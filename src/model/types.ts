@@ -8,7 +8,27 @@ export interface Weapon {
     attack_types: AttackTypes,
     status_buildup: string,
     image: Image,
-    dlc_exclusive: boolean
+    dlc_exclusive: boolean,
+    facets: WeaponFacets
+}
+
+// Facets: a single-valued facet is the index of its value in the facet's vocabulary in the
+// data bundle; damage_minor and damage_types are bitmasks, bit i set for value i
+export interface WeaponFacets {
+  weapon_type: number,
+  damage_major: number,
+  damage_minor: number,
+  attack_primary: number,
+  attack_secondary: number,
+  status_buildup: number,
+  dlc_exclusive: number
+}
+
+export interface SpellFacets {
+  spell_type: number,
+  damage_types: number,
+  status_buildup: number,
+  dlc_exclusive: number
 }
 
 export interface Attributes {
@@ -69,7 +89,8 @@ export interface Spell {
     status_buildup: string
     wikiGGLink: string
     wikiFextralifeLink: string
-    imageUrl: string
+    imageUrl: string | null
+    facets: SpellFacets
 }
 
 export enum DataType {
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Packed requirement matrix for "requirement <= my stat" queries.
+
+The export writes two files next to the data bundle:
+
+- requirements.u8: one row of REQUIREMENT_COLUMNS unsigned bytes per item,
+  weapons first, then spells, in data bundle order
+- requirements_index.json: the columns, the row range of each item kind
+  (row numbers are bundle positions) and the item names
+
+Spells have no strength or dexterity requirement and store 0 there, so the
+same comparison works for every row. A query compares each column with one
+stat using a 256-byte lookup table (`bytes.translate`) and ANDs the
+columns together, so a stat vector is evaluated in a few passes over the
+bytes instead of a walk over nested records. The frontend can do the same
+over a Uint8Array of the file.
+
+Usage:
+    python requirement_matrix.py [resources_dir]         write the matrix files
+    python requirement_matrix.py bench [resources_dir]   compare with the object walk
+"""
+
+import json
+import os
+import sys
+import time
+from itertools import compress
+
+from data_bundle import DEFAULT_RESOURCES_DIR, load_resource_records
+from frontend_items import WEAPON_ITEM, processed_items
+
+MATRIX_FILENAME = "requirements.u8"
+MATRIX_INDEX_FILENAME = "requirements_index.json"
+MATRIX_VERSION = 1
+
+# (column, path of keys into a weapon record, path into a spell record or None for 0)
+REQUIREMENT_COLUMNS = [
+    ('strength_one_hand', ('attributes', 'strength', 'one_hand'), None),
+    ('strength_two_hand', ('attributes', 'strength', 'two_hand'), None),
+    ('dexterity', ('attributes', 'dexterity'), None),
+    ('intelligence', ('attributes', 'intelligence'), ('requirements', 'intelligence')),
+    ('faith', ('attributes', 'faith'), ('requirements', 'faith')),
+    ('arcane', ('attributes', 'arcane'), ('requirements', 'arcane')),
+]
+ROW_SIZE = len(REQUIREMENT_COLUMNS)
+
+# The stat each column is compared with
+COLUMN_STATS = ['strength', 'strength', 'dexterity', 'intelligence', 'faith', 'arcane']
+
+# THRESHOLD_TABLES[limit] maps a requirement byte to 1 if it is <= limit, else 0
+THRESHOLD_TABLES = [bytes(1 if value <= limit else 0 for value in range(256)) for limit in range(256)]
+
+def _requirement(record, path):
+    if path is None:
+        return 0
+    for key in path:
+        record = record[key]
+    value = int(record or 0)
+    if not 0 <= value <= 255:
+        raise ValueError(f"Requirement {value} does not fit in a byte")
+    return value
+
+def build_requirement_matrix(weapons, spells):
+    """
+    The packed matrix bytes and its index for weapon and spell records.
+    """
+    rows = bytearray()
+    for records, kind in ((weapons, 1), (spells, 2)):
+        for record in records:
+            rows.extend(_requirement(record, column[kind]) for column in REQUIREMENT_COLUMNS)
+    index = {
+        'version': MATRIX_VERSION,
+        'columns': [column[0] for column in REQUIREMENT_COLUMNS],
+        'row_size': ROW_SIZE,
+        'rows': len(weapons) + len(spells),
+        'tables': {'weapons': [0, len(weapons)], 'spells': [len(weapons), len(spells)]},
+        'names': [weapon['weapon_name'] for weapon in weapons] + [spell['spell_name'] for spell in spells],
+    }
+    return bytes(rows), index
+
+def write_requirement_matrix(resources_dir=DEFAULT_RESOURCES_DIR, weapons=None, spells=None):
+    """
+    Write the matrix and its index (from the resource files unless records
+    are given). Returns the files written.
+    """
+    if weapons is None or spells is None:
+        weapons, spells = load_resource_records(resources_dir)
+    matrix, index = build_requirement_matrix(weapons, spells)
+    written = []
+    for filename, content in ((MATRIX_FILENAME, matrix),
+                              (MATRIX_INDEX_FILENAME, json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))):
+        path = os.path.join(resources_dir, filename)
+        with open(path + ".tmp", 'wb') as f:
+            f.write(content)
+        os.replace(path + ".tmp", path)
+        print(f"✓ Wrote {path} ({len(content)} bytes)")
+        written.append(path)
+    return written
+
+class RequirementMatrix:
+    """
+    The packed matrix and its index, queried with a stat vector.
+    """
+
+    def __init__(self, matrix, index):
+        if index.get('version') != MATRIX_VERSION:
+            raise ValueError(f"Unsupported requirement matrix version {index.get('version')} (expected {MATRIX_VERSION})")
+        if len(matrix) != index['rows'] * index['row_size']:
+            raise ValueError("Requirement matrix size does not match its index")
+        self.matrix = matrix
+        self.index = index
+        self.rows = index['rows']
+        self.names = index['names']
+        # One contiguous byte string per column, sliced once
+        self.columns = [matrix[i::index['row_size']] for i in range(index['row_size'])]
+
+    @classmethod
+    def load(cls, resources_dir=DEFAULT_RESOURCES_DIR):
+        with open(os.path.join(resources_dir, MATRIX_FILENAME), 'rb') as f:
+            matrix = f.read()
+        with open(os.path.join(resources_dir, MATRIX_INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        return cls(matrix, index)
+
+    def row_kind(self, row):
+        """
+        ('weapons' or 'spells', position in that table of the data bundle).
+        """
+        for kind, (start, count) in self.index['tables'].items():
+            if start <= row < start + count:
+                return kind, row - start
+        raise IndexError(f"Row {row} is out of range")
+
+    def eligible_mask(self, stats, two_handed=True):
+        """
+        One byte per row, 1 where every requirement is met by `stats`
+        ({'strength': ..., 'dexterity': ..., ...}). Strength is compared with
+        the two-handed requirement when `two_handed` is set, as in the
+        frontend's "account for two-handed" option.
+        """
+        skipped = 0 if two_handed else 1
+        combined = -1
+        for column_number, (column, stat) in enumerate(zip(self.columns, COLUMN_STATS)):
+            if column_number == skipped:
+                continue
+            table = THRESHOLD_TABLES[max(0, min(255, stats.get(stat, 0)))]
+            combined &= int.from_bytes(column.translate(table), 'little')
+        return combined.to_bytes(self.rows, 'little') if self.rows else b''
+
+    def eligible_rows(self, stats, two_handed=True):
+        """
+        Row numbers whose requirements are met by `stats`.
+        """
+        return list(compress(range(self.rows), self.eligible_mask(stats, two_handed)))
+
+def _object_walk(items, stats, two_handed=True):
+    """
+    filtersStore's meetsRequirements check, item by item.
+    """
+    rows = []
+    for row, item in enumerate(items):
+        required = item['requiredAttributes']
+        is_weapon = item['type'] == WEAPON_ITEM
+        strength = required['strengthTwoHand'] if two_handed else required['strengthOneHand']
+        if ((not is_weapon or strength <= stats['strength']) and
+                (not is_weapon or required['dexterity'] <= stats['dexterity']) and
+                required['intelligence'] <= stats['intelligence'] and
+                required['faith'] <= stats['faith'] and
+                required['arcane'] <= stats['arcane']):
+            rows.append(row)
+    return rows
+
+def benchmark(resources_dir=DEFAULT_RESOURCES_DIR, rounds=200):
+    """
+    Time the matrix query against the object walk for a spread of stat
+    vectors; both must return the same rows.
+    """
+    weapons, spells = load_resource_records(resources_dir)
+    matrix, index = build_requirement_matrix(weapons, spells)
+    requirement_matrix = RequirementMatrix(matrix, index)
+    items = processed_items(weapons, spells)
+    stat_vectors = [
+        {stat: level for stat in ('strength', 'dexterity', 'intelligence', 'faith', 'arcane')}
+        for level in (8, 10, 14, 20, 40, 99)
+    ]
+
+    results = []
+    for name, query in (("object walk", lambda stats, two: _object_walk(items, stats, two)),
+                        ("matrix", requirement_matrix.eligible_rows)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            answers = [query(stats, two) for stats in stat_vectors for two in (True, False)]
+        results.append((name, (time.perf_counter() - start) / (rounds * len(stat_vectors) * 2), answers))
+
+    baseline = results[0]
+    print(f"\n=== Requirement Filter Benchmark ({requirement_matrix.rows} items, "
+          f"{len(stat_vectors) * 2} stat vectors, {rounds} rounds) ===")
+    print(f"{'method':>11} | {'us/query':>8} | {'speedup':>7} | {'mismatches':>10}")
+    for name, seconds, answers in results:
+        mismatches = sum(1 for answer, expected in zip(answers, baseline[2]) if answer != expected)
+        print(f"{name:>11} | {seconds * 1e6:>8.1f} | {baseline[1] / seconds:>6.2f}x | {mismatches:>10}")
+    return results
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['bench']:
+        benchmark(*sys.argv[2:3])
+    else:
+        write_requirement_matrix(*sys.argv[1:2])
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for the wiki scrapers.
+
+Bodies are stored once, gzip-compressed and keyed by their SHA-256, under
+`blobs/`. A small JSON index maps each URL to its body hash and the
+validators (ETag / Last-Modified) needed for conditional GETs. Index
+changes are written every INDEX_FLUSH_INTERVAL stores and on `flush` /
+`close` (also at interpreter exit), not on every store.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join("progress", "http_cache")
+
+# Stores between index writes; a crash loses at most this many index entries
+INDEX_FLUSH_INTERVAL = 100
+
+class ResponseCache:
+    """
+    Content-addressed response cache keyed by URL.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._index = None
+        self._pending = 0  # stores not yet written to index.json
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,           # 304 Not Modified, served from cache
+            'misses': 0,         # no cached copy, full download
+            'revalidations': 0,  # conditional GETs sent
+            'changed': 0         # conditional GET returned a new body
+        }
+        atexit.register(self.flush)
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                try:
+                    with open(self.index_path, 'r', encoding='utf-8') as f:
+                        self._index = json.load(f)
+                    print(f"Loaded HTTP cache index with {len(self._index)} entries")
+                except Exception as e:
+                    print(f"Could not load HTTP cache index, starting empty: {e}")
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+        self._pending = 0
+
+    def flush(self):
+        """
+        Write the index if any stores are not in it yet.
+        """
+        with self._lock:
+            if self._pending:
+                self._save_index()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.gz")
+
+    def lookup(self, url):
+        """
+        Return the cache entry for a URL, or None if it has never been stored.
+        """
+        with self._lock:
+            entry = self._load_index().get(url)
+        if entry and not os.path.exists(self._blob_path(entry['sha256'])):
+            return None
+        return entry
+
+    def conditional_headers(self, url):
+        """
+        Build If-None-Match / If-Modified-Since headers for a cached URL.
+        """
+        entry = self.lookup(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """
+        Read and decompress the cached body for a URL.
+        """
+        entry = self.lookup(url)
+        if not entry:
+            return None
+        with gzip.open(self._blob_path(entry['sha256']), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def store(self, url, body, etag=None, last_modified=None, content_type=None):
+        """
+        Store a response body and its validators. Identical bodies share one blob.
+        """
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            # A temp file per writer: threads storing the same body must not share one
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(gzip.compress(data))
+                os.replace(tmp_path, blob_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        with self._lock:
+            self._load_index()[url] = {
+                'sha256': digest,
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': content_type,
+                'stored_at': time.time()
+            }
+            self._pending += 1
+            if self._pending >= INDEX_FLUSH_INTERVAL:
+                self._save_index()
+        return digest
+
+    def record(self, outcome):
+        """
+        Count a cache outcome: 'hits', 'misses', 'revalidations' or 'changed'.
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def report(self):
+        """
+        Print the hit/miss/revalidation counts for this run.
+        """
+        print(f"\n=== HTTP Cache Summary ===")
+        print(f"Hits (304 Not Modified): {self.stats['hits']}")
+        print(f"Misses (full download): {self.stats['misses']}")
+        print(f"Revalidations (conditional GETs): {self.stats['revalidations']}")
+        print(f"Changed on revalidation: {self.stats['changed']}")
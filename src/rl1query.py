@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Vectorized "what can I use at rune level 1" queries over the scraped data.
+
+RL1Query loads weapons and spells from the data bundle once into NumPy
+columns (requirements, facet codes, damage type bitmasks, shield/stave/DLC
+flags, search names) and answers a query with a handful of whole-column
+comparisons instead of a loop over nested records. The weapon type, spell
+type, attack type and status buildup columns are the records' facet codes
+(see facets.py), indexing the facet dictionary's vocabularies, so they are
+the codes the bundle and the frontend use.
+
+Queries follow the frontend's filtersStore exactly:
+
+- data type: "Weapons Only" excludes spells and staves/seals, "Spells
+  Only" is spells plus staves/seals, "Both" is everything
+- search: case-insensitive substring of the name (transformName)
+- weapon types, primary attack types and status buildups match when the
+  item's value is selected; attack types never match spells
+- damage types match the item's tracked damage types: elemental types
+  without Physical when there are any, Physical otherwise, none for
+  staves/seals, and "None" for spells without damage
+- stats: strength (two-handed requirement when two-handing) and dexterity
+  apply to weapons only; intelligence, faith and arcane to everything
+
+Two-handing uses each weapon's two-handed strength requirement, which the
+wiki derives from the 1.5x strength bonus of two-handing (ceil(one_hand /
+1.5), with some exceptions such as shields). The frontend compares that
+column, so this does too.
+
+Results are Selections: the matching row numbers plus the engine, giving
+the original record dicts (shared, not copied) and columns on demand.
+
+Usage:
+    python rl1query.py [strength dexterity intelligence faith arcane]   list usable weapons
+    python rl1query.py bench [items]                                    benchmark on synthetic data
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from data_bundle import DEFAULT_RESOURCES_DIR, decode_bundle, load_bundle, load_resource_records
+from facets import load_facet_dictionary
+from frontend_items import (SHIELD_CATEGORIES, SPELL_ITEM, STAVE_AND_SEAL_CATEGORIES, TRACKED_DAMAGE_TYPES,
+                            WEAPON_ITEM, processed_items, tracked_damage_types, transform_name)
+
+WEAPONS_ONLY = "Weapons Only"
+SPELLS_ONLY = "Spells Only"
+BOTH = "Both"
+
+# Facet code columns and the facet dictionary vocabulary their codes index
+FACET_COLUMNS = {
+    'weapon_type': 'weapon_type',
+    'spell_type': 'spell_type',
+    'attack_primary': 'attack_type',
+    'status_buildup': 'status_buildup',
+}
+
+# Stats a query compares, with the frontend's defaults
+DEFAULT_STATS = {'strength': 10, 'dexterity': 10, 'intelligence': 10, 'faith': 10, 'arcane': 10}
+
+WEAPON, SPELL = 0, 1
+NO_CODE = -1
+
+class Selection:
+    """
+    Rows of an RL1Query that matched a query.
+    """
+
+    def __init__(self, engine, rows):
+        self.engine = engine
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        """
+        The matching records themselves (the engine's dicts, not copies).
+        """
+        records = self.engine.records
+        return (records[row] for row in self.rows)
+
+    @property
+    def names(self):
+        return [self.engine.names[row] for row in self.rows]
+
+    def column(self, name):
+        """
+        One engine column for the matching rows.
+        """
+        return self.engine.columns[name][self.rows]
+
+class RL1Query:
+    """
+    Weapons and spells as NumPy columns. Build it with `load`,
+    `from_records` or `from_columns`, then call `query`.
+    """
+
+    def __init__(self, columns, vocabularies, names, records=None):
+        self.columns = columns
+        self.vocabularies = vocabularies  # facet dictionary vocabularies
+        self.names = names
+        self.records = records
+        self.size = len(names)
+        self._codes = {column: {value: code for code, value in enumerate(vocabularies[vocabulary])}
+                       for column, vocabulary in FACET_COLUMNS.items()}
+
+    @classmethod
+    def load(cls, resources_dir=DEFAULT_RESOURCES_DIR):
+        """
+        Build from the data bundle and the facet vocabularies stored in it.
+        """
+        bundle = load_bundle(resources_dir)
+        return cls.from_records(*decode_bundle(bundle), bundle['facet_vocabularies'])
+
+    @classmethod
+    def from_records(cls, weapons, spells, vocabularies=None):
+        """
+        Build the columns from exported weapon and spell records (weapons
+        first, with their facets). `vocabularies` are the facet dictionary's,
+        read from resources/facet_dictionary.json by default.
+        """
+        if vocabularies is None:
+            vocabularies = load_facet_dictionary()['vocabularies']
+
+        rows = []
+        for weapon in weapons:
+            attributes = weapon.get('attributes') or {}
+            strength = attributes.get('strength') or {}
+            damage = weapon.get('damage_types') or {}
+            facets = weapon['facets']
+            rows.append((
+                WEAPON, facets['weapon_type'], NO_CODE,
+                strength.get('one_hand') or 0, strength.get('two_hand') or 0, attributes.get('dexterity') or 0,
+                attributes.get('intelligence') or 0, attributes.get('faith') or 0, attributes.get('arcane') or 0,
+                tracked_damage_types(WEAPON_ITEM, weapon['weapon_type'], damage.get('major'), damage.get('minor')),
+                facets['attack_primary'], facets['status_buildup'], facets['dlc_exclusive'],
+            ))
+        for spell in spells:
+            requirements = spell['requirements']
+            facets = spell['facets']
+            rows.append((
+                SPELL, NO_CODE, facets['spell_type'],
+                0, 0, 0,
+                requirements['intelligence'] or 0, requirements['faith'] or 0, requirements['arcane'] or 0,
+                tracked_damage_types(SPELL_ITEM, spell['spell_type'], spell['damage_types'], None),
+                NO_CODE, facets['status_buildup'], facets['dlc_exclusive'],
+            ))
+
+        def column(position, dtype):
+            return np.fromiter((row[position] for row in rows), dtype=dtype, count=len(rows))
+
+        damage_bits = {damage_type: 1 << bit for bit, damage_type in enumerate(TRACKED_DAMAGE_TYPES)}
+        columns = {
+            'kind': column(0, np.uint8),
+            'weapon_type': column(1, np.int16),
+            'spell_type': column(2, np.int16),
+            'strength_one_hand': column(3, np.int16),
+            'strength_two_hand': column(4, np.int16),
+            'dexterity': column(5, np.int16),
+            'intelligence': column(6, np.int16),
+            'faith': column(7, np.int16),
+            'arcane': column(8, np.int16),
+            'damage': np.fromiter((sum(damage_bits[damage_type] for damage_type in set(row[9])) for row in rows),
+                                  dtype=np.uint8, count=len(rows)),
+            'attack_primary': column(10, np.int16),
+            'status_buildup': column(11, np.int16),
+            'dlc_exclusive': column(12, np.bool_),
+        }
+        names = [weapon['weapon_name'] for weapon in weapons] + [spell['spell_name'] for spell in spells]
+        return cls.from_columns(columns, vocabularies, names, list(weapons) + list(spells))
+
+    @classmethod
+    def from_columns(cls, columns, vocabularies, names, records=None):
+        """
+        Wrap prebuilt columns (as produced by from_records) and add the
+        derived shield, stave/seal and search columns.
+        """
+        weapon_types = vocabularies['weapon_type']
+        columns = dict(columns)
+        columns['shield'] = np.isin(
+            columns['weapon_type'], [code for code, category in enumerate(weapon_types) if category in SHIELD_CATEGORIES])
+        columns['stave_or_seal'] = np.isin(
+            columns['weapon_type'], [code for code, category in enumerate(weapon_types) if category in STAVE_AND_SEAL_CATEGORIES])
+        columns['search_name'] = np.array([transform_name(name) for name in names], dtype=np.str_)
+        return cls(columns, vocabularies, names, records)
+
+    def _codes_of(self, column, values):
+        return [self._codes[column][value] for value in values if value in self._codes[column]]
+
+    def mask(self, stats=None, two_handed=True, ignore_stats=False, data_type=WEAPONS_ONLY, search='',
+             weapon_types=(), damage_types=(), attack_types=(), status_buildups=(), show_dlc=True,
+             hide_shields=False):
+        """
+        Boolean column of the rows the frontend would show for these filters.
+        Missing stats default to DEFAULT_STATS.
+        """
+        columns = self.columns
+        stats = {**DEFAULT_STATS, **(stats or {})}
+        is_weapon = columns['kind'] == WEAPON
+
+        if data_type == WEAPONS_ONLY:
+            mask = is_weapon & ~columns['stave_or_seal']
+        elif data_type == SPELLS_ONLY:
+            mask = ~is_weapon | columns['stave_or_seal']
+        else:
+            mask = np.ones(self.size, dtype=np.bool_)
+
+        if search:
+            mask &= np.char.find(columns['search_name'], transform_name(search)) >= 0
+        if hide_shields:
+            mask &= ~columns['shield']
+        if weapon_types:
+            mask &= (np.isin(columns['weapon_type'], self._codes_of('weapon_type', weapon_types)) |
+                     np.isin(columns['spell_type'], self._codes_of('spell_type', weapon_types)))
+        if damage_types:
+            selected = sum(1 << bit for bit, damage_type in enumerate(TRACKED_DAMAGE_TYPES) if damage_type in damage_types)
+            mask &= (columns['damage'] & selected) != 0
+        if attack_types:
+            mask &= np.isin(columns['attack_primary'], self._codes_of('attack_primary', attack_types))
+        if status_buildups:
+            mask &= np.isin(columns['status_buildup'], self._codes_of('status_buildup', status_buildups))
+        if not show_dlc:
+            mask &= ~columns['dlc_exclusive']
+
+        if not ignore_stats:
+            strength = columns['strength_two_hand' if two_handed else 'strength_one_hand']
+            mask &= ~is_weapon | ((strength <= stats['strength']) & (columns['dexterity'] <= stats['dexterity']))
+            mask &= columns['intelligence'] <= stats['intelligence']
+            mask &= columns['faith'] <= stats['faith']
+            mask &= columns['arcane'] <= stats['arcane']
+        return mask
+
+    def query(self, stats=None, **filters):
+        """
+        The rows matching `filters` (see `mask`) as a Selection.
+        """
+        return Selection(self, np.flatnonzero(self.mask(stats, **filters)))
+
+def frontend_filter(items, stats=None, two_handed=True, ignore_stats=False, data_type=WEAPONS_ONLY, search='',
+                    weapon_types=(), damage_types=(), attack_types=(), status_buildups=(), show_dlc=True,
+                    hide_shields=False):
+    """
+    filtersStore's filteredWeapons, item by item: the reference RL1Query
+    is checked and benchmarked against. Returns matching positions.
+    """
+    stats = {**DEFAULT_STATS, **(stats or {})}
+    rows = []
+    for row, item in enumerate(items):
+        is_weapon = item['type'] == WEAPON_ITEM
+        is_spell = item['type'] == SPELL_ITEM
+        is_stave_or_seal = is_weapon and item['category'] in STAVE_AND_SEAL_CATEGORIES
+        if data_type == WEAPONS_ONLY:
+            matches_data_type = is_weapon and not is_stave_or_seal
+        elif data_type == SPELLS_ONLY:
+            matches_data_type = is_spell or is_stave_or_seal
+        else:
+            matches_data_type = True
+        matches_search = search == '' or transform_name(search) in transform_name(item['name'])
+        should_hide_shield = hide_shields and is_weapon and item['category'] in SHIELD_CATEGORIES
+        matches_item_type = not weapon_types or item['category'] in weapon_types
+        matches_damage_type = not damage_types or any(t in damage_types for t in item['trackedDamageTypes'])
+        matches_attack_type = not attack_types or (is_weapon and item['attackTypes']['primary'] in attack_types)
+        matches_status = not status_buildups or item['statusBuildup'] in status_buildups
+        matches_dlc = show_dlc or not item['dlcExclusive']
+        required = item['requiredAttributes']
+        meets_requirements = ignore_stats or (
+            ((required['strengthTwoHand'] if two_handed else required['strengthOneHand']) <= stats['strength']
+             if is_weapon else True) and
+            (required['dexterity'] <= stats['dexterity'] if is_weapon else True) and
+            required['intelligence'] <= stats['intelligence'] and
+            required['faith'] <= stats['faith'] and
+            required['arcane'] <= stats['arcane']
+        )
+        if (matches_data_type and matches_search and matches_item_type and matches_damage_type and
+                matches_attack_type and matches_status and matches_dlc and meets_requirements and
+                not should_hide_shield):
+            rows.append(row)
+    return rows
+
+def synthetic_records(count, seed=0, weapons=None, spells=None):
+    """
+    `count` weapon and spell records sampled from the real data's values
+    (categories, damage/attack/status types, requirements), about four
+    weapons per spell. Two-handed strength follows ceil(one_hand / 1.5).
+    Facets are the template record's, so the codes stay the exported ones.
+    """
+    if weapons is None or spells is None:
+        weapons, spells = load_resource_records()
+    rng = np.random.default_rng(seed)
+    weapon_count = count * 4 // 5
+    picks = rng.integers(0, len(weapons), weapon_count)
+    spell_picks = rng.integers(0, len(spells), count - weapon_count)
+    one_hand = rng.integers(0, 60, weapon_count)
+    stats = rng.integers(0, 50, (count, 4))
+    dlc = rng.random(count) < 0.3
+
+    synthetic_weapons = []
+    for i in range(weapon_count):
+        template = weapons[picks[i]]
+        synthetic_weapons.append({
+            'weapon_name': f"Weapon {i} {template['weapon_name']}",
+            'weapon_type': template['weapon_type'],
+            'attributes': {
+                'strength': {'one_hand': int(one_hand[i]), 'two_hand': -(-int(one_hand[i]) * 2 // 3)},
+                'dexterity': int(stats[i, 0]), 'intelligence': int(stats[i, 1] // 2),
+                'faith': int(stats[i, 2] // 2), 'arcane': int(stats[i, 3] // 3),
+            },
+            'damage_types': template['damage_types'],
+            'attack_types': template['attack_types'],
+            'status_buildup': template['status_buildup'],
+            'dlc_exclusive': bool(dlc[i]),
+            'facets': {**template['facets'], 'dlc_exclusive': int(dlc[i])},
+        })
+    synthetic_spells = []
+    for i in range(count - weapon_count):
+        template = spells[spell_picks[i]]
+        row = weapon_count + i
+        synthetic_spells.append({
+            'spell_name': f"Spell {i} {template['spell_name']}",
+            'spell_type': template['spell_type'],
+            'requirements': {'intelligence': int(stats[row, 1]), 'faith': int(stats[row, 2]),
+                             'arcane': int(stats[row, 3] // 2)},
+            'damage_types': template['damage_types'],
+            'status_buildup': template['status_buildup'],
+            'dlc_exclusive': bool(dlc[row]),
+            'facets': {**template['facets'], 'dlc_exclusive': int(dlc[row])},
+        })
+    return synthetic_weapons, synthetic_spells
+
+# Filter combinations the benchmark and check run
+BENCHMARK_QUERIES = [
+    {},
+    {'two_handed': False},
+    {'stats': {'strength': 20, 'dexterity': 20, 'intelligence': 20, 'faith': 20, 'arcane': 20}, 'data_type': BOTH},
+    {'data_type': SPELLS_ONLY, 'stats': {'intelligence': 30, 'faith': 25}},
+    {'damage_types': ['Fire', 'Holy'], 'attack_types': ['Slash'], 'hide_shields': True},
+    {'status_buildups': ['Blood Loss', 'None'], 'show_dlc': False, 'data_type': BOTH},
+    {'weapon_types': ['Katanas', 'Greatswords', 'Sorcery'], 'data_type': BOTH, 'ignore_stats': True},
+    {'search': 'sword', 'data_type': BOTH},
+]
+
+def check(weapons, spells, queries=BENCHMARK_QUERIES):
+    """
+    Compare RL1Query with frontend_filter for every query. Returns the mismatching queries.
+    """
+    engine = RL1Query.from_records(weapons, spells)
+    items = processed_items(weapons, spells)
+    mismatches = []
+    for filters in queries:
+        if engine.query(**filters).rows.tolist() != frontend_filter(items, **filters):
+            mismatches.append(filters)
+    return mismatches
+
+def benchmark(count=1_000_000, reference_count=100_000):
+    """
+    Time RL1Query on `count` synthetic items against the item-by-item
+    frontend filter, which runs on the first `reference_count` of them
+    (and is scaled up) to keep the run short. Results are compared on
+    those items.
+    """
+    start = time.perf_counter()
+    weapons, spells = synthetic_records(count)
+    generated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = RL1Query.from_records(weapons, spells)
+    loaded = time.perf_counter() - start
+
+    reference_weapons = weapons[:reference_count * 4 // 5]
+    reference_spells = spells[:reference_count - len(reference_weapons)]
+    mismatches = check(reference_weapons, reference_spells)
+    items = processed_items(reference_weapons, reference_spells)
+
+    print(f"\n=== RL1 Query Benchmark ({count} synthetic items, generated in {generated:.1f}s, "
+          f"columns built in {loaded:.1f}s) ===")
+    print(f"{'query':>5} | {'matches':>7} | {'numpy ms':>8} | {'loop ms (scaled)':>16} | {'speedup':>7}")
+    results = []
+    for number, filters in enumerate(BENCHMARK_QUERIES):
+        start = time.perf_counter()
+        selection = engine.query(**filters)
+        vectorized = time.perf_counter() - start
+        start = time.perf_counter()
+        frontend_filter(items, **filters)
+        loop = (time.perf_counter() - start) * count / len(items)
+        results.append((number, len(selection), vectorized, loop))
+        print(f"{number:>5} | {len(selection):>7} | {vectorized * 1000:>8.1f} | {loop * 1000:>16.1f} | "
+              f"{loop / vectorized:>6.1f}x")
+    print(f"Mismatches against the frontend filter on {len(items)} items: {len(mismatches)}")
+    return results, mismatches
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['bench']:
+        benchmark(*(int(arg) for arg in sys.argv[2:3]))
+    else:
+        levels = [int(arg) for arg in sys.argv[1:6]]
+        query_stats = dict(zip(DEFAULT_STATS, levels)) if levels else None
+        rl1 = RL1Query.load()
+        results = rl1.query(query_stats)
+        for weapon_name in results.names:
+            print(weapon_name)
+        print(f"{len(results)} weapons usable with {({**DEFAULT_STATS, **(query_stats or {})})}")
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+SQLite store for scrape state: gallery items, fetched pages, extracted
+weapons and spells, page revisions and run metadata, in one database
+(progress/scrape.db) in WAL mode. The HTML of fetched pages goes to the
+content-addressed HTML archive next to the database (html_archive.py),
+under the page URL; the pages table keeps its hash, revision and fetch
+times.
+
+Resume, dedupe and "what changed" checks are indexed lookups rather than
+whole JSON files loaded into sets. Weapons and spells keep their insertion
+order, which is the order of the exported files. The exporter writes
+src/resources/weapons_*.json and spells_*.json from one read transaction,
+so the files always come from a single consistent state, and then rebuilds
+the facet dictionary, the frontend's data bundle, the requirement matrix
+and the starting class bitsets (see facets.py, data_bundle.py,
+requirement_matrix.py and class_eligibility.py), and last the manifest of
+all of them with a diff against the previous export (manifest.py).
+Records are exported with their facet codes and masks.
+
+Usage:
+    python scrape_store.py export [resources_dir]   write the resource and derived data files
+    python scrape_store.py import [progress_dir]    load the legacy progress/*.json files
+    python scrape_store.py seed [resources_dir]     load the exported resource files into the store
+    python scrape_store.py runs                     list runs
+    python scrape_store.py changes [run_id]         records changed by a run (default: last)
+Add `--db <path>` to use another database file.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+from class_eligibility import write_class_eligibility
+from data_bundle import load_resource_records, write_bundle
+from facets import annotate_all, load_facet_dictionary, write_facet_dictionary
+from html_archive import HtmlArchive
+from manifest import write_manifest
+from requirement_matrix import write_requirement_matrix
+
+DEFAULT_STORE_FILE = os.path.join("progress", "scrape.db")
+DEFAULT_RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+STORE_SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS gallery_items (
+    href TEXT PRIMARY KEY,
+    weapon_type TEXT NOT NULL,
+    gallery_index INTEGER NOT NULL,
+    item_index INTEGER NOT NULL,
+    text TEXT,
+    dlc_exclusive INTEGER NOT NULL DEFAULT 0,
+    run_id INTEGER REFERENCES runs(id)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    revision INTEGER,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    run_id INTEGER REFERENCES runs(id)
+);
+CREATE INDEX IF NOT EXISTS pages_sha256 ON pages(sha256);
+CREATE TABLE IF NOT EXISTS page_revisions (
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (kind, title)
+);
+CREATE TABLE IF NOT EXISTS weapons (
+    id INTEGER PRIMARY KEY,
+    href TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    weapon_type TEXT NOT NULL,
+    weapon_name TEXT NOT NULL,
+    record TEXT NOT NULL,
+    run_id INTEGER REFERENCES runs(id),
+    updated_at REAL NOT NULL,
+    UNIQUE (weapon_type, weapon_name)
+);
+CREATE INDEX IF NOT EXISTS weapons_by_type ON weapons(weapon_type, id);
+CREATE INDEX IF NOT EXISTS weapons_by_run ON weapons(run_id);
+CREATE TABLE IF NOT EXISTS processed (
+    href TEXT PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    processed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spells (
+    id INTEGER PRIMARY KEY,
+    spell_name TEXT NOT NULL UNIQUE,
+    spell_type TEXT NOT NULL,
+    record TEXT NOT NULL,
+    run_id INTEGER REFERENCES runs(id),
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spells_by_type ON spells(spell_type, id);
+CREATE INDEX IF NOT EXISTS spells_by_run ON spells(run_id);
+"""
+
+def weapon_resource_filename(weapon_type):
+    """Per-type JSON filename for a weapon type (as written by fetch-weapons.py)."""
+    return f"weapons_{weapon_type.lower().replace(' ', '_').replace('-', '_')}.json"
+
+def spell_resource_filename(spell_type):
+    """Per-type JSON filename for a spell type (as written by fetch-spells.py)."""
+    return f"spells_{spell_type.lower().replace(' ', '_').replace('-', '_').replace('/', '_')}.json"
+
+def _existing_resource_filenames(resources_dir):
+    """
+    {(type field, type): filename} of the resource files already in
+    `resources_dir`, so an export keeps their names.
+    """
+    filenames = {}
+    for pattern, field in (('weapons_*.json', 'weapon_type'), ('spells_*.json', 'spell_type')):
+        for path in sorted(glob.glob(os.path.join(resources_dir, pattern))):
+            with open(path, 'r', encoding='utf-8') as f:
+                for record in json.load(f):
+                    filenames.setdefault((field, record[field]), os.path.basename(path))
+    return filenames
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+class ScrapeStore:
+    """
+    One connection to the scrape database, shared by the fetch and writer
+    threads behind a lock. Writes join the open transaction until `commit`.
+    Page HTML is kept in `archive` (by default html_archive/ next to the
+    database).
+    """
+
+    def __init__(self, path=DEFAULT_STORE_FILE, archive=None):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self.archive = archive or HtmlArchive(os.path.join(directory, "html_archive"))
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, 1, STORE_SCHEMA_VERSION):
+            raise ValueError(f"Unsupported scrape store version {version} in {path} (expected {STORE_SCHEMA_VERSION})")
+        if version == 1:
+            self._move_pages_to_archive()
+        self._db.executescript(SCHEMA)
+        self._db.execute(f"PRAGMA user_version={STORE_SCHEMA_VERSION}")
+        self.run_id = None
+
+    def commit(self):
+        with self._lock:
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+            self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # Runs
+
+    def start_run(self, kind, **metadata):
+        """
+        Record the start of a scrape run; later writes are tagged with it.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO runs (kind, started_at, metadata) VALUES (?, ?, ?)",
+                (kind, time.time(), json.dumps(metadata))
+            )
+            self._db.commit()
+            self.run_id = cursor.lastrowid
+            return self.run_id
+
+    def finish_run(self, **metadata):
+        with self._lock:
+            if self.run_id is None:
+                return
+            row = self._db.execute("SELECT metadata FROM runs WHERE id = ?", (self.run_id,)).fetchone()
+            merged = {**json.loads(row[0]), **metadata}
+            self._db.execute(
+                "UPDATE runs SET finished_at = ?, metadata = ? WHERE id = ?",
+                (time.time(), json.dumps(merged), self.run_id)
+            )
+            self._db.commit()
+
+    def runs(self):
+        with self._lock:
+            rows = self._db.execute("SELECT id, kind, started_at, finished_at, metadata FROM runs ORDER BY id").fetchall()
+        return [
+            {'id': run_id, 'kind': kind, 'started_at': started, 'finished_at': finished, **json.loads(metadata)}
+            for run_id, kind, started, finished, metadata in rows
+        ]
+
+    # Gallery items
+
+    def save_gallery_items(self, items):
+        """
+        Store `(href, weapon_type, gallery_index, item_index, text, dlc_exclusive)` rows.
+        """
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO gallery_items (href, weapon_type, gallery_index, item_index, text, dlc_exclusive, run_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(href) DO UPDATE SET "
+                "weapon_type = excluded.weapon_type, gallery_index = excluded.gallery_index, "
+                "item_index = excluded.item_index, text = excluded.text, dlc_exclusive = excluded.dlc_exclusive, "
+                "run_id = excluded.run_id",
+                [(*item, self.run_id) for item in items]
+            )
+
+    def gallery_summary(self):
+        """
+        {weapon type: weapon count}, in gallery order.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT weapon_type, COUNT(*) FROM weapons GROUP BY weapon_type "
+                "ORDER BY (SELECT MIN(gallery_index) FROM gallery_items g WHERE g.weapon_type = weapons.weapon_type), "
+                "weapon_type"
+            ).fetchall()
+        return dict(rows)
+
+    # Pages
+
+    def _move_pages_to_archive(self):
+        """
+        Version 1 stores kept zlib-compressed page HTML in the pages table;
+        move it into the archive and drop the column.
+        """
+        for url, html in self._db.execute("SELECT url, html FROM pages").fetchall():
+            self.archive.put(url, zlib.decompress(html))
+        self._db.execute("ALTER TABLE pages DROP COLUMN html")
+        self._db.commit()
+
+    def save_page(self, url, html, revision=None):
+        """
+        Store a fetched page in the archive and record it. Returns True if
+        its content changed. An unchanged page only has its fetch time (and
+        revision) updated.
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM pages WHERE url = ?", (url,)).fetchone()
+            if row and row[0] == digest:
+                self._db.execute(
+                    "UPDATE pages SET fetched_at = ?, revision = COALESCE(?, revision) WHERE url = ?",
+                    (now, revision, url)
+                )
+                return False
+            self.archive.put(url, data)
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, sha256, revision, size, fetched_at, changed_at, run_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, revision, len(data), now, now, self.run_id)
+            )
+            return True
+
+    def page_html(self, url):
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM pages WHERE url = ?", (url,)).fetchone()
+            data = self.archive.get_blob(row[0]) if row else None
+        return data.decode('utf-8') if data is not None else None
+
+    # Revisions
+
+    def revision_ids(self, kind):
+        """
+        {title: revid} saved for `kind` ("weapons" or "spells").
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT title, revision FROM page_revisions WHERE kind = ?", (kind,)).fetchall()
+        return dict(rows)
+
+    def save_revision_ids(self, kind, revision_ids, replace=False):
+        with self._lock:
+            if replace:
+                self._db.execute("DELETE FROM page_revisions WHERE kind = ?", (kind,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO page_revisions (kind, title, revision) VALUES (?, ?, ?)",
+                [(kind, title, revid) for title, revid in revision_ids.items()]
+            )
+            self._db.commit()
+        print(f"Saved {len(revision_ids)} {kind} revision IDs to: {self.path}")
+
+    # Weapons
+
+    def is_processed(self, href):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM processed WHERE href = ?", (href,)).fetchone() is not None
+
+    def processed_count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+
+    def mark_processed(self, href):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO processed (href, run_id, processed_at) VALUES (?, ?, ?)",
+                (href, self.run_id, time.time())
+            )
+
+    def add_weapon(self, href, record, processed=True):
+        """
+        Insert an extracted weapon unless its URL or its name within its
+        type is already stored, and mark it processed (unless `processed`
+        is False). Returns True if inserted.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO weapons (href, url, weapon_type, weapon_name, record, run_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (href, record['wikiGGLink'], record['weapon_type'], record['weapon_name'],
+                 _dumps(record), self.run_id, time.time())
+            )
+            if processed:
+                self.mark_processed(href)
+            return cursor.rowcount == 1
+
+    def upsert_weapon(self, href, record):
+        """
+        Insert a weapon or replace the stored record with the same type and
+        name, keeping its position. A renamed page updates the stored URL.
+        Returns True if anything changed.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO weapons (href, url, weapon_type, weapon_name, record, run_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(weapon_type, weapon_name) DO UPDATE SET "
+                "href = excluded.href, url = excluded.url, record = excluded.record, "
+                "run_id = excluded.run_id, updated_at = excluded.updated_at "
+                "WHERE weapons.record != excluded.record OR weapons.url != excluded.url",
+                (href, record['wikiGGLink'], record['weapon_type'], record['weapon_name'],
+                 _dumps(record), self.run_id, time.time())
+            )
+            self.mark_processed(href)
+            return cursor.rowcount == 1
+
+    def weapons(self, weapon_type=None):
+        """
+        Weapon records, in insertion order, optionally of one type.
+        """
+        with self._lock:
+            if weapon_type is None:
+                rows = self._db.execute("SELECT record FROM weapons ORDER BY id").fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT record FROM weapons WHERE weapon_type = ? ORDER BY id", (weapon_type,)
+                ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    # Spells
+
+    def upsert_spells(self, spells):
+        """
+        Insert or update spell records by name. Returns the names that changed.
+        """
+        changed = []
+        now = time.time()
+        with self._lock:
+            for spell in spells:
+                cursor = self._db.execute(
+                    "INSERT INTO spells (spell_name, spell_type, record, run_id, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(spell_name) DO UPDATE SET spell_type = excluded.spell_type, "
+                    "record = excluded.record, run_id = excluded.run_id, updated_at = excluded.updated_at "
+                    "WHERE spells.record != excluded.record",
+                    (spell['spell_name'], spell['spell_type'], _dumps(spell), self.run_id, now)
+                )
+                if cursor.rowcount == 1:
+                    changed.append(spell['spell_name'])
+            self._db.commit()
+        return changed
+
+    def spells(self, spell_type=None):
+        with self._lock:
+            if spell_type is None:
+                rows = self._db.execute("SELECT record FROM spells ORDER BY id").fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT record FROM spells WHERE spell_type = ? ORDER BY id", (spell_type,)
+                ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    # Queries and export
+
+    def changes(self, run_id=None):
+        """
+        Names of the weapons and spells written by a run (default: the last one).
+        """
+        with self._lock:
+            if run_id is None:
+                run_id = self._db.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+            weapons = self._db.execute(
+                "SELECT weapon_type, weapon_name FROM weapons WHERE run_id = ? ORDER BY id", (run_id,)
+            ).fetchall()
+            spells = self._db.execute(
+                "SELECT spell_type, spell_name FROM spells WHERE run_id = ? ORDER BY id", (run_id,)
+            ).fetchall()
+        return {'run_id': run_id, 'weapons': weapons, 'spells': spells}
+
+    def export_resources(self, resources_dir=DEFAULT_RESOURCES_DIR):
+        """
+        Write weapons_<type>.json and spells_<type>.json (with facets)
+        from one read transaction, removing the files of types with no
+        records left, then the data files built from them
+        (facet dictionary, bundle, requirement matrix, class bitsets) and
+        the manifest with its diff. Files already exported keep their names.
+        Raises ValueError, writing nothing, when the store has no weapons
+        or no spells. Returns the files written.
+        """
+        with self._lock:
+            self._db.commit()
+            self._db.execute("BEGIN")
+            try:
+                weapon_rows = self._db.execute("SELECT weapon_type, record FROM weapons ORDER BY id").fetchall()
+                spell_rows = self._db.execute("SELECT spell_type, record FROM spells ORDER BY id").fetchall()
+            finally:
+                self._db.commit()
+        # An empty table would delete every file of its kind and export an empty bundle
+        empty = [kind for kind, rows in (('weapons', weapon_rows), ('spells', spell_rows)) if not rows]
+        if empty:
+            raise ValueError(f"The store has no {' and no '.join(empty)}; run the scrapers or "
+                             f"`python scrape_store.py seed` before exporting")
+
+        existing = _existing_resource_filenames(resources_dir) if os.path.isdir(resources_dir) else {}
+        files = {}
+        weapons = []
+        spells = []
+        for weapon_type, record in weapon_rows:
+            weapons.append(json.loads(record))
+            filename = existing.get(('weapon_type', weapon_type)) or weapon_resource_filename(weapon_type)
+            files.setdefault(filename, []).append(weapons[-1])
+        for spell_type, record in spell_rows:
+            spells.append(json.loads(record))
+            filename = existing.get(('spell_type', spell_type)) or spell_resource_filename(spell_type)
+            files.setdefault(filename, []).append(spells[-1])
+
+        os.makedirs(resources_dir, exist_ok=True)
+        # Extend the stored vocabularies so existing facet codes keep their meaning
+        facet_dictionary = annotate_all(weapons, spells, load_facet_dictionary(resources_dir))
+        # The records as they were, for the manifest diff's field changes
+        previous_records = load_resource_records(resources_dir)
+        written = []
+        # Types that no longer have any records must not keep shipping their old file
+        for filename in sorted(os.listdir(resources_dir)):
+            if (filename.startswith(('weapons_', 'spells_')) and filename.endswith('.json')
+                    and filename not in files):
+                os.remove(os.path.join(resources_dir, filename))
+                print(f"✓ Removed stale {filename}")
+        for filename, records in sorted(files.items()):
+            filepath = os.path.join(resources_dir, filename)
+            tmp_path = filepath + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, filepath)
+            written.append(filepath)
+            print(f"✓ Exported {len(records)} records to: {filepath}")
+        written.extend(write_facet_dictionary(facet_dictionary, resources_dir))
+        written.extend(write_bundle(resources_dir))
+        written.extend(write_requirement_matrix(resources_dir))
+        written.extend(write_class_eligibility(resources_dir))
+        written.extend(write_manifest(resources_dir, previous_records))
+        return written
+
+    def seed(self, resources_dir=DEFAULT_RESOURCES_DIR):
+        """
+        Load the exported resource files into the store, in their order,
+        so a new database exports the data it started from. Seeded weapons
+        are not marked processed. Returns (weapons added, spells changed).
+        """
+        weapons, spells = load_resource_records(resources_dir)
+        with self._lock:
+            added = sum(self.add_weapon(urlparse(weapon['wikiGGLink']).path, weapon, processed=False)
+                        for weapon in weapons)
+            self._db.commit()
+        changed = self.upsert_spells(spells)
+        print(f"Seeded {added} weapons and {len(changed)} spells from {resources_dir}")
+        return added, len(changed)
+
+    def import_progress(self, progress_dir="progress"):
+        """
+        Load the legacy progress files (per-type weapon files and the
+        processed list in weapon_fetch_progress.json) into the store.
+        Returns the number of weapons added.
+        """
+        processed = []
+        progress_file = os.path.join(progress_dir, "weapon_fetch_progress.json")
+        if os.path.exists(progress_file):
+            with open(progress_file, 'r', encoding='utf-8') as f:
+                processed = json.load(f).get('processed_weapons', [])
+        added = 0
+        filenames = sorted(name for name in os.listdir(progress_dir)
+                           if name.startswith('weapons_') and name.endswith('.json')) if os.path.isdir(progress_dir) else []
+        with self._lock:
+            for filename in filenames:
+                with open(os.path.join(progress_dir, filename), 'r', encoding='utf-8') as f:
+                    for record in json.load(f):
+                        if self.add_weapon(urlparse(record['wikiGGLink']).path, record):
+                            added += 1
+            for href in processed:
+                self.mark_processed(href)
+            self._db.commit()
+        print(f"Imported {added} weapons and {len(processed)} processed pages from {progress_dir}")
+        return added
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    db_path = DEFAULT_STORE_FILE
+    if '--db' in args:
+        position = args.index('--db')
+        db_path = args[position + 1]
+        del args[position:position + 2]
+    command = args[0] if args else None
+
+    with ScrapeStore(db_path) as store:
+        if command == 'export':
+            store.export_resources(*args[1:2])
+        elif command == 'import':
+            store.import_progress(*args[1:2])
+        elif command == 'seed':
+            store.seed(*args[1:2])
+        elif command == 'runs':
+            for run in store.runs():
+                print(json.dumps(run))
+        elif command == 'changes':
+            changes = store.changes(int(args[1]) if len(args) > 1 else None)
+            print(f"Run {changes['run_id']}: {len(changes['weapons'])} weapons, {len(changes['spells'])} spells")
+            for weapon_type, name in changes['weapons']:
+                print(f"  weapon {weapon_type}: {name}")
+            for spell_type, name in changes['spells']:
+                print(f"  spell {spell_type}: {name}")
+        else:
+            print(__doc__)
+            sys.exit(1)
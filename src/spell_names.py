@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Spell name aliases and image lookup.
+
+The fextralife spells table and the wiki.gg spells page spell some names
+differently ("Aspect of the Crucible: Horns" vs "Aspects of the
+Crucible:Horns", typos, disambiguation suffixes). Names are canonicalized
+through a fixed alias table, and image lookups go through SpellImageIndex,
+which matches on a normalized key first and falls back to a trigram
+candidate search scored by edit similarity.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+# Source spelling -> canonical (wiki.gg) spelling
+SPELL_NAME_ALIASES = {
+    "Land of Shadow (Incantation)": "Land of Shadow",
+    "Gurrang's Beast Claw": "Gurranq's Beast Claw",
+    "Flame, Grant me Strength": "Flame, Grant Me Strength",
+}
+
+CRUCIBLE_PREFIX = "Aspects of the Crucible:"
+CRUCIBLE_PATTERN = re.compile(r'^Aspects? of the Crucible\s*:\s*(.+)$')
+
+QUOTE_TRANSLATION = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"'})
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+FUZZY_MATCH_THRESHOLD = 0.85  # Minimum similarity for a fuzzy image match
+FUZZY_CANDIDATES = 5  # Candidates (by shared trigrams) scored per lookup
+
+def canonical_spell_name(spell_name):
+    """
+    Map a spell name from either wiki to its canonical spelling.
+    """
+    spell_name = SPELL_NAME_ALIASES.get(spell_name, spell_name)
+    crucible = CRUCIBLE_PATTERN.match(spell_name)
+    if crucible:
+        return f"{CRUCIBLE_PREFIX} {crucible.group(1)}"
+    return spell_name
+
+def spell_name_key(spell_name):
+    """
+    Lookup key for a spell name: canonical spelling, casefolded, with
+    punctuation and colon spacing removed.
+    """
+    key = unicodedata.normalize('NFKC', canonical_spell_name(spell_name)).translate(QUOTE_TRANSLATION)
+    key = PUNCTUATION_PATTERN.sub(' ', key.casefold())
+    return WHITESPACE_PATTERN.sub(' ', key).strip()
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SpellImageIndex:
+    """
+    Built once from {spell name: image URL}; answers lookups by normalized
+    key, then by fuzzy match among the entries not used yet.
+    """
+
+    def __init__(self, image_map):
+        self._entries = {}  # key -> (name in image_map, url)
+        self._by_trigram = {}
+        for name, url in image_map.items():
+            key = spell_name_key(name)
+            if key in self._entries:
+                continue
+            self._entries[key] = (name, url)
+            for gram in trigrams(key):
+                self._by_trigram.setdefault(gram, set()).add(key)
+        self._used = set()
+
+    def _fuzzy_key(self, key):
+        shared = {}
+        for gram in trigrams(key):
+            for candidate in self._by_trigram.get(gram, ()):
+                if candidate not in self._used:
+                    shared[candidate] = shared.get(candidate, 0) + 1
+        best_key, best_score = None, 0.0
+        for candidate in sorted(shared, key=lambda k: (-shared[k], k))[:FUZZY_CANDIDATES]:
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_score >= FUZZY_MATCH_THRESHOLD:
+            return best_key, best_score
+        return None, best_score
+
+    def lookup(self, spell_name):
+        """
+        Find the image for a spell. Returns (name in image_map, url, score)
+        with score 1.0 for a normalized match, or None. A normalized match
+        may return an entry already used; a fuzzy match never does.
+        """
+        key = spell_name_key(spell_name)
+        score = 1.0
+        if key not in self._entries:
+            key, score = self._fuzzy_key(key)
+            if key is None:
+                return None
+        self._used.add(key)
+        name, url = self._entries[key]
+        return name, url, score
+
+    def lookup_all(self, spell_names):
+        """
+        Look up every spell at once: normalized matches are reserved before
+        any fuzzy matching runs, so a fuzzy match cannot take an image that
+        belongs to a later spell. Returns {spell name: lookup result or None}.
+        """
+        for spell_name in spell_names:
+            key = spell_name_key(spell_name)
+            if key in self._entries:
+                self._used.add(key)
+        return {spell_name: self.lookup(spell_name) for spell_name in spell_names}
+
+    def unused(self):
+        """
+        {name: url} for image entries no spell was matched to.
+        """
+        return {name: url for key, (name, url) in self._entries.items() if key not in self._used}
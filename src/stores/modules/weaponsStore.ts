@@ -114,11 +114,11 @@ export const useWeaponsStore = defineStore('weapons', () => {
 
   // Initialize weapons and spells data
   const initializeWeapons = () => {
-    const allWeaponArrays = loadWeaponsData()
+    const allWeapons = loadWeaponsData()
     const allSpells = loadSpellsData()
 
     // Process weapons
-    const processedWeapons = (allWeaponArrays.flat() as Weapon[]).map((weapon: Weapon) => {
+    const processedWeapons = allWeapons.map((weapon: Weapon) => {
       let strengthOneHand = 0
       let strengthTwoHand = 0
       let dexterity = 0
@@ -185,7 +185,7 @@ export const useWeaponsStore = defineStore('weapons', () => {
       return {
         id: spell.spell_name,
         name: spell.spell_name,
-        image: spell.imageUrl,
+        image: spell.imageUrl ?? undefined,
         category: spell.spell_type,
         type: 'spell' as const,
         attack: {
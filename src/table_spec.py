@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Declarative table extraction shared by the weapon and spell scrapers.
+
+A TableSpec says where a table is (a path of selectors, compiled once),
+which rows to read and how each Field maps to a cell: which column, how to
+read the cell, and which parser turns the text into a value. Specs run
+against an already parsed tree, so any number of them share one parse of
+the page, and adding a field is a change to the spec rather than another
+walk over the document.
+
+Two layouts are supported:
+
+- `records=False`: the table describes one item and each field is a row
+  (weapon requirement and damage tables). `extract` returns {field: value}.
+- `records=True`: every row is an item and fields are columns (the spells
+  table). `extract` returns a list of (row number, {field: value}).
+"""
+
+from html_parsing import Selector
+
+def _first_span(cell):
+    spans = cell.find_all('span')
+    return spans[0].get_text(strip=True) if spans else None
+
+def _first_span_or_text(cell):
+    spans = cell.find_all('span')
+    return spans[0].get_text(strip=True) if spans else cell.get_text(strip=True)
+
+def _text(cell):
+    return cell.get_text(strip=True)
+
+def _link_href(cell):
+    link = cell.find('a')
+    return link.get('href') if link else None
+
+# How a field reads its cell; a reader returns None when the cell has no value
+CELL_READERS = {
+    'text': _text,
+    'first_span': _first_span,
+    'first_span_or_text': _first_span_or_text,
+    'link_href': _link_href,
+}
+
+# Cell values treated as empty when a field has an `empty` value
+EMPTY_CELL_VALUES = ('', '-')
+
+class Field:
+    """
+    One extracted value: the cell at (`row`, `column`) of the selected rows
+    (`row` is unused for record tables), read with `read` and converted
+    with `parse`. With `empty` set, blank and "-" cells become that value
+    before parsing.
+    """
+
+    def __init__(self, name, column, row=None, read='text', parse=None, empty=None, label=None):
+        if read not in CELL_READERS:
+            raise ValueError(f"Unknown cell reader '{read}' for field {name}")
+        self.name = name
+        self.column = column
+        self.row = row
+        self.read = CELL_READERS[read]
+        self.parse = parse
+        self.empty = empty
+        self.label = label or name
+
+    def value_from(self, cell):
+        """
+        Read and parse a cell. Raises ValueError when the text does not parse.
+        Returns None when the cell holds no value for this reader.
+        """
+        text = self.read(cell)
+        if text is None:
+            return None
+        if self.empty is not None and text in EMPTY_CELL_VALUES:
+            text = self.empty
+        return self.parse(text) if self.parse else text
+
+class TableSpec:
+    """
+    Where a table is and how its cells map to fields.
+
+    `table` is a path of selectors: each step searches inside the previous
+    match, and the last step picks match number `table_index`. `rows` is a
+    slice of the tbody rows; tables with fewer than `min_rows` rows are
+    rejected. For record tables, rows without exactly `cell_count` cells
+    are skipped.
+    """
+
+    def __init__(self, name, table, fields, table_index=0, rows=slice(None), min_rows=1,
+                 records=False, cell_count=None):
+        self.name = name
+        self.path = [Selector(css) for css in table]
+        self.fields = list(fields)
+        self.table_index = table_index
+        self.rows = rows
+        self.min_rows = min_rows
+        self.records = records
+        self.cell_count = cell_count
+
+    def locate(self, soup):
+        """
+        Find the table, or print why it is missing and return None.
+        """
+        root = soup
+        for selector in self.path[:-1]:
+            root = selector.find(root)
+            if root is None:
+                print(f"{self.name}: no {selector.css} found")
+                return None
+        matches = self.path[-1].find_all(root)
+        if len(matches) <= self.table_index:
+            print(f"{self.name}: not enough {self.path[-1].css} tables found. Found: {len(matches)}")
+            return None
+        return matches[self.table_index]
+
+    def table_rows(self, table):
+        """
+        The selected tbody rows as (row number, row), or None.
+        """
+        tbody = table.find('tbody')
+        if not tbody:
+            print(f"{self.name}: no tbody found in the table")
+            return None
+        rows = tbody.find_all('tr')
+        if len(rows) < self.min_rows:
+            print(f"{self.name}: not enough rows in tbody. Found: {len(rows)}")
+            return None
+        return list(enumerate(rows, start=1))[self.rows]
+
+    def _read_field(self, field, cells, row_number):
+        if len(cells) <= field.column:
+            print(f"Row {row_number} doesn't have enough cells")
+            return None, False
+        try:
+            value = field.value_from(cells[field.column])
+        except ValueError:
+            print(f"Could not parse {field.label} value")
+            return None, False
+        if value is None:
+            print(f"No {field.label} found in row {row_number}")
+            return None, False
+        return value, True
+
+    def extract(self, soup):
+        """
+        Run the spec over a parsed tree. Returns None when the table is missing.
+        """
+        table = self.locate(soup)
+        if table is None:
+            return None
+        rows = self.table_rows(table)
+        if rows is None:
+            return None
+
+        if not self.records:
+            values = {}
+            for field in self.fields:
+                if field.row >= len(rows):
+                    print(f"Row for {field.label} not found")
+                    continue
+                row_number, row = rows[field.row]
+                value, found = self._read_field(field, row.find_all(['td', 'th']), row_number)
+                if found:
+                    values[field.name] = value
+                    print(f"Found {field.label}: {value}")
+            return values
+
+        records = []
+        for row_number, row in rows:
+            cells = row.find_all(['td', 'th'])
+            if self.cell_count is not None and len(cells) != self.cell_count:
+                print(f"Skipping row {row_number}: Expected {self.cell_count} columns, found {len(cells)}")
+                continue
+            record = {}
+            for field in self.fields:
+                record[field.name] = field.value_from(cells[field.column])
+            records.append((row_number, record))
+        return records
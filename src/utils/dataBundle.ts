@@ -0,0 +1,68 @@
+import bundleData from '../resources/data_bundle.json'
+
+// Written by src/data_bundle.py; bump both together when the layout changes
+const BUNDLE_VERSION = 1
+
+/**
+ * One kind of item stored column by column: row i of every column is item i
+ */
+export interface ColumnTable {
+  count: number
+  prefixes: Record<string, string>
+  columns: Record<string, unknown[]>
+}
+
+export interface DataBundle {
+  version: number
+  enums: Record<string, string[]>
+  weapons: ColumnTable
+  spells: ColumnTable
+  facet_vocabularies?: Record<string, (string | boolean)[]>
+}
+
+const bundle = bundleData as DataBundle
+
+if (bundle.version !== BUNDLE_VERSION) {
+  throw new Error(`Unsupported data bundle version ${bundle.version} (expected ${BUNDLE_VERSION})`)
+}
+
+export const weaponTable = bundle.weapons
+export const spellTable = bundle.spells
+
+const column = <T>(table: ColumnTable, name: string): T[] => {
+  const values = table.columns[name]
+  if (!values) {
+    throw new Error(`Data bundle is missing the ${name} column`)
+  }
+  return values as T[]
+}
+
+export const textColumn = (table: ColumnTable, name: string): string[] =>
+  column<string>(table, name)
+
+export const numberColumn = (table: ColumnTable, name: string): number[] =>
+  column<number>(table, name)
+
+export const booleanColumn = (table: ColumnTable, name: string): boolean[] =>
+  column<number>(table, name).map((value) => value === 1)
+
+/**
+ * URLs with the column's shared prefix put back
+ */
+export const urlColumn = (table: ColumnTable, name: string): (string | null)[] => {
+  const prefix = table.prefixes[name] ?? ''
+  return column<string | null>(table, name).map((value) => (value === null ? null : prefix + value))
+}
+
+/**
+ * Integer codes looked up in one of the bundle's enum tables
+ */
+export const enumColumn = (table: ColumnTable, name: string, enumName: string): string[] => {
+  const lookup = bundle.enums[enumName]
+  return column<number>(table, name).map((code) => lookup[code])
+}
+
+export const enumListColumn = (table: ColumnTable, name: string, enumName: string): string[][] => {
+  const lookup = bundle.enums[enumName]
+  return column<number[]>(table, name).map((codes) => codes.map((code) => lookup[code]))
+}
@@ -1,10 +1,57 @@
 import type { Spell } from '../model/types'
-import spellsSorcery from '../resources/spells_sorcery.json'
-import spellsIncantation from '../resources/spells_incantation.json'
+import {
+  booleanColumn,
+  enumColumn,
+  enumListColumn,
+  numberColumn,
+  spellTable,
+  textColumn,
+  urlColumn,
+} from './dataBundle'
 
 export function loadSpellsData(): Spell[] {
-  return [
-    ...(spellsSorcery as Spell[]),
-    ...(spellsIncantation as Spell[])
-  ]
+  const table = spellTable
+  const names = textColumn(table, 'spell_name')
+  const types = enumColumn(table, 'spell_type', 'spell_type')
+  const intelligence = numberColumn(table, 'intelligence')
+  const faith = numberColumn(table, 'faith')
+  const arcane = numberColumn(table, 'arcane')
+  const bonuses = enumColumn(table, 'bonus', 'bonus')
+  const dlcExclusive = booleanColumn(table, 'dlc_exclusive')
+  const damageTypes = enumListColumn(table, 'damage_types', 'damage_type')
+  const statusBuildups = enumColumn(table, 'status_buildup', 'status_buildup')
+  const wikiGGLinks = urlColumn(table, 'wikiGGLink')
+  const wikiFextralifeLinks = urlColumn(table, 'wikiFextralifeLink')
+  const imageUrls = urlColumn(table, 'imageUrl')
+  const spellTypeFacets = numberColumn(table, 'facet_spell_type')
+  const damageTypeFacets = numberColumn(table, 'facet_damage_types')
+  const statusBuildupFacets = numberColumn(table, 'facet_status_buildup')
+  const dlcExclusiveFacets = numberColumn(table, 'facet_dlc_exclusive')
+
+  const spells: Spell[] = new Array(table.count)
+  for (let i = 0; i < table.count; i++) {
+    spells[i] = {
+      spell_name: names[i],
+      spell_type: types[i] as Spell['spell_type'],
+      requirements: {
+        intelligence: intelligence[i],
+        faith: faith[i],
+        arcane: arcane[i],
+      },
+      bonus: bonuses[i],
+      dlc_exclusive: dlcExclusive[i],
+      damage_types: damageTypes[i],
+      status_buildup: statusBuildups[i],
+      wikiGGLink: wikiGGLinks[i] ?? '',
+      wikiFextralifeLink: wikiFextralifeLinks[i] ?? '',
+      imageUrl: imageUrls[i],
+      facets: {
+        spell_type: spellTypeFacets[i],
+        damage_types: damageTypeFacets[i],
+        status_buildup: statusBuildupFacets[i],
+        dlc_exclusive: dlcExclusiveFacets[i],
+      },
+    }
+  }
+  return spells
 }
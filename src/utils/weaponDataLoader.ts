@@ -1,93 +1,88 @@
-import weaponsThrustingShields from '../resources/weapons_thrusting_shields.json'
-import weaponsGreatshields from '../resources/weapons_greatshields.json'
-import weaponsMediumShields from '../resources/weapons_medium_shields.json'
-import weaponsSmallShields from '../resources/weapons_small_shields.json'
-import weaponsTorches from '../resources/weapons_torches.json'
-import weaponsSacredSeals from '../resources/weapons_sacred_seals.json'
-import weaponsStaves from '../resources/weapons_staves.json'
-import weaponsBallista from '../resources/weapons_ballista.json'
-import weaponsCrossbows from '../resources/weapons_crossbows.json'
-import weaponsGreatbows from '../resources/weapons_greatbows.json'
-import weaponsBows from '../resources/weapons_bows.json'
-import weaponsLightBows from '../resources/weapons_light_bows.json'
-import weaponsPerfumeBottles from '../resources/weapons_perfume_bottles.json'
-import weaponsBeastClaws from '../resources/weapons_beast_claws.json'
-import weaponsClaws from '../resources/weapons_claws.json'
-import weaponsHandToHand from '../resources/weapons_hand_to_hand.json'
-import weaponsFists from '../resources/weapons_fists.json'
-import weaponsWhips from '../resources/weapons_whips.json'
-import weaponsReapers from '../resources/weapons_reapers.json'
-import weaponsHalberds from '../resources/weapons_halberds.json'
-import weaponsGreatSpears from '../resources/weapons_great_spears.json'
-import weaponsSpears from '../resources/weapons_spears.json'
-import weaponsColossalWeapons from '../resources/weapons_colossal_weapons.json'
-import weaponsGreatHammers from '../resources/weapons_great_hammers.json'
-import weaponsFlails from '../resources/weapons_flails.json'
-import weaponsHammers from '../resources/weapons_hammers.json'
-import weaponsGreataxes from '../resources/weapons_greataxes.json'
-import weaponsAxes from '../resources/weapons_axes.json'
-import weaponsTwinblades from '../resources/weapons_twinblades.json'
-import weaponsGreatKatanas from '../resources/weapons_great_katanas.json'
-import weaponsKatanas from '../resources/weapons_katanas.json'
-import weaponsBackhandBlades from '../resources/weapons_backhand_blades.json'
-import weaponsCurvedGreatswords from '../resources/weapons_curved_greatswords.json'
-import weaponsCurvedSwords from '../resources/weapons_curved_swords.json'
-import weaponsHeavyThrustingSwords from '../resources/weapons_heavy_thrusting_swords.json'
-import weaponsThrustingSwords from '../resources/weapons_thrusting_swords.json'
-import weaponsColossalSwords from '../resources/weapons_colossal_swords.json'
-import weaponsGreatswords from '../resources/weapons_greatswords.json'
-import weaponsLightGreatswords from '../resources/weapons_light_greatswords.json'
-import weaponsStraightSwords from '../resources/weapons_straight_swords.json'
-import weaponsDaggers from '../resources/weapons_daggers.json'
-import weaponsThrowingBlades from '../resources/weapons_throwing_blades.json'
-import type { Weapon } from '../model/types'
+import type { AttackType, DamageType, Weapon } from '../model/types'
+import {
+  booleanColumn,
+  enumColumn,
+  enumListColumn,
+  numberColumn,
+  textColumn,
+  urlColumn,
+  weaponTable,
+} from './dataBundle'
 
 /**
- * Loads and returns all weapon data from JSON files
+ * Loads and returns all weapon data from the columnar data bundle
  */
-export const loadWeaponsData = (): Weapon[][] => {
-  return [
-    weaponsThrustingShields,
-    weaponsGreatshields,
-    weaponsMediumShields,
-    weaponsSmallShields,
-    weaponsTorches,
-    weaponsSacredSeals,
-    weaponsStaves,
-    weaponsBallista,
-    weaponsCrossbows,
-    weaponsGreatbows,
-    weaponsBows,
-    weaponsLightBows,
-    weaponsPerfumeBottles,
-    weaponsBeastClaws,
-    weaponsClaws,
-    weaponsHandToHand,
-    weaponsFists,
-    weaponsWhips,
-    weaponsReapers,
-    weaponsHalberds,
-    weaponsGreatSpears,
-    weaponsSpears,
-    weaponsColossalWeapons,
-    weaponsGreatHammers,
-    weaponsFlails,
-    weaponsHammers,
-    weaponsGreataxes,
-    weaponsAxes,
-    weaponsTwinblades,
-    weaponsGreatKatanas,
-    weaponsKatanas,
-    weaponsBackhandBlades,
-    weaponsCurvedGreatswords,
-    weaponsCurvedSwords,
-    weaponsHeavyThrustingSwords,
-    weaponsThrustingSwords,
-    weaponsColossalSwords,
-    weaponsGreatswords,
-    weaponsLightGreatswords,
-    weaponsStraightSwords,
-    weaponsDaggers,
-    weaponsThrowingBlades,
-  ] as Weapon[][]
+export const loadWeaponsData = (): Weapon[] => {
+  const table = weaponTable
+  const names = textColumn(table, 'weapon_name')
+  const types = enumColumn(table, 'weapon_type', 'weapon_type')
+  const wikiGGLinks = urlColumn(table, 'wikiGGLink')
+  const wikiFextralifeLinks = urlColumn(table, 'wikiFextralifeLink')
+  const strengthOneHand = numberColumn(table, 'strength_one_hand')
+  const strengthTwoHand = numberColumn(table, 'strength_two_hand')
+  const dexterity = numberColumn(table, 'dexterity')
+  const intelligence = numberColumn(table, 'intelligence')
+  const faith = numberColumn(table, 'faith')
+  const arcane = numberColumn(table, 'arcane')
+  const majorDamage = enumColumn(table, 'damage_major', 'damage_type')
+  const minorDamage = enumListColumn(table, 'damage_minor', 'damage_type')
+  const primaryAttacks = enumColumn(table, 'attack_primary', 'attack_type')
+  const secondaryAttacks = enumColumn(table, 'attack_secondary', 'attack_type')
+  const statusBuildups = enumColumn(table, 'status_buildup', 'status_buildup')
+  const imageSources = urlColumn(table, 'image_src')
+  const imageAlts = textColumn(table, 'image_alt')
+  const imageTitles = textColumn(table, 'image_title')
+  const dlcExclusive = booleanColumn(table, 'dlc_exclusive')
+  const weaponTypeFacets = numberColumn(table, 'facet_weapon_type')
+  const damageMajorFacets = numberColumn(table, 'facet_damage_major')
+  const damageMinorFacets = numberColumn(table, 'facet_damage_minor')
+  const attackPrimaryFacets = numberColumn(table, 'facet_attack_primary')
+  const attackSecondaryFacets = numberColumn(table, 'facet_attack_secondary')
+  const statusBuildupFacets = numberColumn(table, 'facet_status_buildup')
+  const dlcExclusiveFacets = numberColumn(table, 'facet_dlc_exclusive')
+
+  const weapons: Weapon[] = new Array(table.count)
+  for (let i = 0; i < table.count; i++) {
+    weapons[i] = {
+      weapon_name: names[i],
+      weapon_type: types[i],
+      wikiGGLink: wikiGGLinks[i] ?? '',
+      wikiFextralifeLink: wikiFextralifeLinks[i] ?? '',
+      attributes: {
+        strength: {
+          one_hand: strengthOneHand[i],
+          two_hand: strengthTwoHand[i],
+        },
+        dexterity: dexterity[i],
+        intelligence: intelligence[i],
+        faith: faith[i],
+        arcane: arcane[i],
+      },
+      damage_types: {
+        major: majorDamage[i] as DamageType,
+        minor: minorDamage[i] as DamageType[],
+      },
+      attack_types: {
+        primary: primaryAttacks[i] as AttackType,
+        secondary: secondaryAttacks[i] as AttackType,
+      },
+      status_buildup: statusBuildups[i],
+      image: {
+        src: imageSources[i] ?? '',
+        alt: imageAlts[i],
+        title: imageTitles[i],
+      },
+      dlc_exclusive: dlcExclusive[i],
+      facets: {
+        weapon_type: weaponTypeFacets[i],
+        damage_major: damageMajorFacets[i],
+        damage_minor: damageMinorFacets[i],
+        attack_primary: attackPrimaryFacets[i],
+        attack_secondary: attackSecondaryFacets[i],
+        status_buildup: statusBuildupFacets[i],
+        dlc_exclusive: dlcExclusiveFacets[i],
+      },
+    }
+  }
+  return weapons
 }
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Single-pass extraction of a weapon page.
+
+A weapon page is parsed into one BeautifulSoup tree, and the name,
+requirements, damage types and image are all read from that same tree. The
+`extract_*` functions in fetch-weapons.py are thin wrappers over the
+`*_from_soup` helpers here. The requirement and damage tables are described
+declaratively as TableSpecs (see table_spec.py). `build_weapon_record`
+turns a page into a full weapon record and is what the extractor worker
+processes run.
+
+Only the elements the extractors read are built (see `WEAPON_PAGE_TARGETS`),
+with whichever parser backend html_parsing is set to.
+
+Run this file directly with saved pages (HTML files, directories of them or
+`--record` archives), or with `--fixtures` for the committed fixture pages
+as full page views, to compare CPU time per page across parser backends
+and against parsing once per field. README.md has the results.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import zipfile
+from collections import namedtuple
+
+from classification import load_classification_index
+from html_parsing import ParseTargets, available_parser_backends, parse_html
+from table_spec import Field, TableSpec
+
+WIKI_BASE_URL = "https://eldenring.wiki.gg"
+
+ATTRIBUTE_NAMES = ['strength', 'dexterity', 'intelligence', 'faith', 'arcane']
+DAMAGE_TYPE_NAMES = ['Physical', 'Magic', 'Fire', 'Lightning', 'Holy']
+
+# Elements the weapon extractors read: the title, the stat tables, the
+# infobox and the images in the content area (not the whole content area,
+# which is nearly the whole page)
+WEAPON_PAGE_TARGETS = ParseTargets(
+    'div#mw-content-text img',
+    'h2[data-source="title"]',
+    'table.infobox',
+    'table.mw-collapsible',
+)
+
+# Everything a weapon page contributes to a weapon record
+WeaponPage = namedtuple('WeaponPage', ['name', 'attributes', 'damage_types', 'image'])
+
+def parse_page(html_content, backend=None, targets=WEAPON_PAGE_TARGETS):
+    """
+    Parse a page once; every `*_from_soup` helper reads from the result.
+    """
+    return parse_html(html_content, targets=targets, backend=backend)
+
+def extract_weapon_page(html_content, backend=None, targets=WEAPON_PAGE_TARGETS):
+    """
+    Parse a weapon page once and extract every field from it.
+    Returns a WeaponPage, or None for an empty page.
+    """
+    if not html_content:
+        return None
+
+    soup = parse_page(html_content, backend, targets)
+    name = weapon_name_from_soup(soup)
+    return WeaponPage(
+        name=name,
+        attributes=weapon_attributes_from_soup(soup),
+        damage_types=damage_types_from_soup(soup),
+        image=weapon_image_from_soup(soup, name)
+    )
+
+def build_weapon_record(weapon_html, weapon_link, weapon_type, weapon_url, dlc_exclusive, backend=None):
+    """
+    Extract every field of one weapon page into a weapon record.
+    """
+    classification_index = load_classification_index()
+    page = extract_weapon_page(weapon_html, backend)
+    
+    final_weapon_name = page.name or weapon_link['text']
+    
+    return {
+        'weapon_name': final_weapon_name,
+        'weapon_type': weapon_type,
+        'wikiGGLink': weapon_url,
+        'wikiFextralifeLink': f"https://eldenring.wiki.fextralife.com/{final_weapon_name.replace(' ', '+')}",
+        'attributes': page.attributes,
+        'damage_types': page.damage_types,
+        'attack_types': classification_index.weapon_attack_types(final_weapon_name, weapon_type),
+        'status_buildup': classification_index.weapon_status_buildup(final_weapon_name),
+        'image': page.image,
+        'dlc_exclusive': dlc_exclusive
+    }
+
+def extract_weapon_record(job):
+    """
+    Extractor worker entry point (see extract_pipeline): `job` holds the
+    build_weapon_record arguments, with the parser backend last.
+    """
+    return build_weapon_record(*job)
+
+def weapon_name_from_soup(soup):
+    """
+    Extract weapon name from the h2 tag with data-source="title" attribute.
+    """
+    title_h2 = soup.find('h2', attrs={'data-source': 'title'})
+
+    if title_h2:
+        weapon_name = title_h2.get_text(strip=True)
+        print(f"Found weapon name: {weapon_name}")
+        return weapon_name
+    else:
+        print("No h2 tag with data-source='title' found")
+        return None
+
+def weapon_attributes_from_soup(soup):
+    """
+    Extract weapon attributes from the second mw-collapsible table:
+    rows 3-7 of tbody, second td, first span (or the cell text).
+    Stats order: strength, dexterity, intelligence, faith, arcane.
+    """
+    return ATTRIBUTE_TABLE_SPEC.extract(soup)
+
+def parse_strength_requirement(strength_text):
+    """
+    Parse strength requirement text into one-hand and two-hand values.
+    Pattern: "[one_hand]\\1h[two_hand]\\2h" or single number.
+    """
+    print(f"Parsing strength requirement: {strength_text}")
+    if not strength_text:
+        return {"one_hand": 0, "two_hand": 0}
+
+    # Check if the text contains the dual-hand pattern
+    if "\\1h" in strength_text and "\\2h" in strength_text:
+        try:
+            # Split by "\\1h" to get the one-hand value
+            parts = strength_text.split("\\1h")
+            if len(parts) >= 2:
+                one_hand = parts[0].strip()
+                print(f"One-hand value: {one_hand}")
+                # Get the two-hand value by splitting the remaining part
+                two_hand_part = parts[1].split("\\2h")[0].strip()
+
+                return {
+                    "one_hand": int(one_hand),
+                    "two_hand": int(two_hand_part)
+                }
+        except (ValueError, IndexError) as e:
+            print(f"Error parsing strength requirement '{strength_text}': {e}")
+            # Fallback to single value
+            try:
+                single_value = int(''.join(filter(str.isdigit, strength_text)))
+                return {
+                    "one_hand": single_value,
+                    "two_hand": single_value
+                }
+            except ValueError:
+                return {"one_hand": 0, "two_hand": 0}
+    else:
+        # Single value - use for both one-hand and two-hand
+        try:
+            single_value = int(''.join(filter(str.isdigit, strength_text)))
+            return {
+                "one_hand": single_value,
+                "two_hand": single_value
+            }
+        except ValueError:
+            return {"one_hand": 0, "two_hand": 0}
+
+# Requirement table: rows 3-7 of the second collapsible table. Blank and "-"
+# cells mean no requirement; strength may hold one-hand and two-hand values.
+ATTRIBUTE_TABLE_SPEC = TableSpec(
+    "Requirements table",
+    table=['table.mw-collapsible'],
+    table_index=1,
+    rows=slice(2, 7),
+    min_rows=7,
+    fields=[
+        Field(name, column=1, row=row, read='first_span_or_text', empty=0,
+              parse=parse_strength_requirement if name == 'strength' else int)
+        for row, name in enumerate(ATTRIBUTE_NAMES)
+    ]
+)
+
+# Damage table: rows 3-7 of the first collapsible table, value in the first span
+DAMAGE_TABLE_SPEC = TableSpec(
+    "Damage table",
+    table=['table.mw-collapsible'],
+    table_index=0,
+    rows=slice(2, 7),
+    min_rows=7,
+    fields=[
+        Field(name, column=1, row=row, read='first_span', parse=int, label=f"{name} damage")
+        for row, name in enumerate(DAMAGE_TYPE_NAMES)
+    ]
+)
+
+def damage_types_from_soup(soup):
+    """
+    Extract damage types from the first mw-collapsible table.
+    Rows 3-7 contain damage values in order: physical, magic, fire, lightning, holy.
+    """
+    damage_values = DAMAGE_TABLE_SPEC.extract(soup)
+    if damage_values is None:
+        return None
+
+    if not damage_values:
+        print("No damage values found")
+        return None
+
+    # Find the major damage type (highest value)
+    major_type = max(damage_values, key=damage_values.get)
+    major_value = damage_values[major_type]
+
+    # Find minor damage types (all types with >0 damage, excluding major)
+    minor_types = [
+        damage_type for damage_type, value in damage_values.items()
+        if value > 0 and damage_type != major_type
+    ]
+
+    print(f"Major damage type: {major_type} ({major_value})")
+    print(f"Minor damage types: {minor_types}")
+
+    return {
+        'major': major_type,
+        'minor': minor_types
+    }
+
+def _absolute_src(src):
+    if src.startswith('//'):
+        return 'https:' + src
+    if src.startswith('/'):
+        return WIKI_BASE_URL + src
+    return src
+
+def weapon_image_from_soup(soup, weapon_name):
+    """
+    Extract the weapon image URL from the weapon page.
+    Returns only the second image found, which is typically the weapon image itself.
+    """
+    image = []
+
+    # 1. Main content area image; a tree parsed with WEAPON_PAGE_TARGETS
+    # holds only content-area images, without the div around them
+    content_div = soup.find('div', {'id': 'mw-content-text'}) or soup
+    if content_div:
+        for img in content_div.find_all('img'):
+            src = img.get('src', '')
+            if src and not src.startswith('data:'):  # Skip data URLs
+                image.append({
+                    'src': _absolute_src(src),
+                    'alt': img.get('alt', ''),
+                    'title': weapon_name
+                })
+
+    # 2. Look for specific weapon image (often in infoboxes)
+    for infobox in soup.find_all('table', class_='infobox'):
+        for img in infobox.find_all('img'):
+            src = img.get('src', '')
+            if src and not src.startswith('data:'):
+                src = _absolute_src(src)
+                image.append({
+                    'src': src,
+                    'alt': img.get('alt', ''),
+                    'title': img.get('title', '')
+                })
+                print(f"Found infobox image: {src}")
+
+    # Remove duplicates based on src
+    unique_images = []
+    seen_srcs = set()
+    for img in image:
+        if img['src'] not in seen_srcs:
+            unique_images.append(img)
+            seen_srcs.add(img['src'])
+
+    # Return only the second image (the weapon image itself)
+    if len(unique_images) >= 2:
+        weapon_image = unique_images[1]
+        print(f"Selected weapon image: {weapon_image['src']}")
+        return weapon_image
+    elif len(unique_images) == 1:
+        print(f"Only one image found, using: {unique_images[0]['src']}")
+        return unique_images[0]
+    else:
+        print("No image found")
+        return None
+
+def load_benchmark_pages(paths):
+    """
+    Collect HTML pages from files, directories of .html files and
+    `--record` zip archives (every text/html response in them).
+    """
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            pages.extend(load_benchmark_pages(
+                sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.html'))
+            ))
+        elif zipfile.is_zipfile(path):
+            from http_archive import HttpReplayer
+            replayer = HttpReplayer(path)
+            for exchange, body in replayer.recorded():
+                content_type = {k.lower(): v for k, v in exchange['headers'].items()}.get('content-type', '')
+                if exchange['status'] == 200 and 'text/html' in content_type:
+                    pages.append(body.decode('utf-8', errors='replace'))
+            replayer.close()
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+def _extract_parsing_per_field(html_content, backend=None, targets=None):
+    """
+    The original approach: one full parse for each extracted field.
+    """
+    name = weapon_name_from_soup(parse_page(html_content, backend, targets))
+    return WeaponPage(
+        name=name,
+        attributes=weapon_attributes_from_soup(parse_page(html_content, backend, targets)),
+        damage_types=damage_types_from_soup(parse_page(html_content, backend, targets)),
+        image=weapon_image_from_soup(parse_page(html_content, backend, targets), name)
+    )
+
+def benchmark(pages, rounds=3):
+    """
+    Compare CPU seconds per page for each parser backend, parsing the whole
+    page or only WEAPON_PAGE_TARGETS, against one full html.parser parse per
+    field. Every variant must return the same records as the baseline.
+    """
+    variants = [("html.parser", "per field", _extract_parsing_per_field, 'html.parser', None)]
+    for backend in available_parser_backends():
+        if backend != 'selectolax':
+            variants.append((backend, "full page", extract_weapon_page, backend, None))
+        variants.append((backend, "targeted", extract_weapon_page, backend, WEAPON_PAGE_TARGETS))
+
+    results = []
+    baseline_records = None
+    for backend, mode, extract, backend_name, targets in variants:
+        best = None
+        for _ in range(rounds):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.process_time()
+                records = [extract(page, backend_name, targets) for page in pages]
+                elapsed = time.process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if baseline_records is None:
+            baseline_records = records
+        mismatches = sum(1 for record, expected in zip(records, baseline_records) if record != expected)
+        results.append((backend, mode, best, mismatches))
+
+    baseline = results[0][2]
+    print(f"\n=== Weapon Page Extraction Benchmark ({len(pages)} pages, best of {rounds}) ===")
+    print(f"{'backend':>11} | {'parse':>9} | {'CPU ms/page':>11} | {'speedup':>7} | {'mismatches':>10}")
+    for backend, mode, elapsed, mismatches in results:
+        print(f"{backend:>11} | {mode:>9} | {elapsed / len(pages) * 1000:>11.2f} | "
+              f"{baseline / elapsed:>6.2f}x | {mismatches:>10}")
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python weapon_page.py <page.html | pages_dir | archive.zip> ... | --fixtures")
+        sys.exit(1)
+    if sys.argv[1] == '--fixtures':
+        from mediawiki_fixture_server import fixture_page_views
+        benchmark_pages = fixture_page_views()
+    else:
+        benchmark_pages = load_benchmark_pages(sys.argv[1:])
+    if not benchmark_pages:
+        print("No HTML pages found")
+        sys.exit(1)
+    benchmark(benchmark_pages)
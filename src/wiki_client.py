@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the wiki scrapers.
+
+Keeps one keep-alive connection pool per host and rate limits each host with
+its own token bucket, so bulk scrapes stop paying a TCP+TLS handshake and a
+fixed sleep for every page.
+"""
+
+import gzip
+import random
+import threading
+import time
+import zlib
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default politeness budget: one request every 15 seconds, no bursting
+DEFAULT_MIN_INTERVAL = 15
+DEFAULT_BURST = 1
+
+# Fraction of a token charged for a 304 revalidation, which costs the host
+# almost nothing compared to rendering a full page
+NOT_MODIFIED_COST = 0.1
+
+# Retry policy: exponential backoff with jitter between attempts, capped,
+# unless the server says how long to wait with Retry-After
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 2  # Seconds before the first retry (before jitter)
+BACKOFF_CAP = 120  # Longest backoff between two attempts
+MAX_RETRY_AFTER = 600  # Give up instead of honouring a longer Retry-After
+
+# Circuit breaker: after this many consecutive failures on a host, fail fast
+# for the cooldown instead of sleeping through every remaining URL
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 300
+
+# Result of a fetch: the page text and whether it came from the cache via a 304
+FetchResult = namedtuple('FetchResult', ['text', 'not_modified'])
+
+def get_headers():
+    """
+    Get consistent headers for all requests.
+    """
+    return {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',  # Request compressed content
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Cache-Control': 'max-age=0',
+    }
+
+def decompress_content(response):
+    """
+    Decompress response content based on encoding.
+    """
+    content_encoding = response.headers.get('content-encoding', '').lower()
+
+    if content_encoding == 'gzip':
+        try:
+            decompressed_content = gzip.decompress(response.content).decode('utf-8')
+            print(f"Successfully fetched and decompressed {len(decompressed_content)} characters (was {len(response.content)} compressed)")
+            return decompressed_content
+        except Exception as e:
+            print(f"Gzip decompression failed: {e}. Falling back to raw content.")
+            return response.text
+
+    elif content_encoding == 'deflate':
+        try:
+            decompressed_content = zlib.decompress(response.content).decode('utf-8')
+            print(f"Successfully fetched and decompressed {len(decompressed_content)} characters (was {len(response.content)} compressed)")
+            return decompressed_content
+        except Exception as e:
+            print(f"Deflate decompression failed: {e}. Falling back to raw content.")
+            return response.text
+
+    elif content_encoding == 'br':
+        try:
+            import brotli
+            decompressed_content = brotli.decompress(response.content).decode('utf-8')
+            print(f"Successfully fetched and decompressed {len(decompressed_content)} characters (was {len(response.content)} compressed)")
+            return decompressed_content
+        except ImportError:
+            print("Brotli compression detected but brotli library not installed. Falling back to uncompressed.")
+            return response.text
+        except Exception as e:
+            print(f"Brotli decompression failed: {e}. Falling back to raw content.")
+            return response.text
+
+    else:
+        print(f"Successfully fetched {len(response.text)} characters (uncompressed)")
+        return response.text
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiter.
+    Refills at one token every `min_interval` seconds and holds at most `burst`
+    tokens, so a host that allows it can take a short burst of requests.
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, burst=DEFAULT_BURST):
+        self.min_interval = min_interval
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.min_interval <= 0:
+            self.tokens = float(self.burst)
+        else:
+            elapsed = now - self.updated_at
+            self.tokens = min(float(self.burst), self.tokens + elapsed / self.min_interval)
+        self.updated_at = now
+
+    def acquire(self, cost=1.0):
+        """
+        Take `cost` tokens, sleeping until they are available.
+        Returns the number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return waited
+                wait_time = (cost - self.tokens) * self.min_interval
+            print(f"Rate limiting: waiting {wait_time:.1f} seconds...")
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def refund(self, amount):
+        """
+        Give back tokens for a request that turned out cheaper than budgeted.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(float(self.burst), self.tokens + amount)
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a request while a host's circuit breaker is open.
+    """
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. Opens after `threshold` consecutive failures.
+    Once `cooldown` seconds have passed it is half-open: `allow` lets a
+    single trial request through and refuses the rest until that request
+    is recorded. A successful trial closes the breaker; a failed one opens
+    it for another cooldown.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False  # A trial request is in flight
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        """
+        Seconds until the breaker allows a trial request (0 when closed).
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self):
+        """
+        Whether a request may be sent now. In the half-open state only the
+        first caller is allowed, and its request is the trial.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() < self.opened_at + self.cooldown:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing:
+                self.probing = False
+                self.opened_at = time.monotonic()
+                print(f"Circuit breaker trial request failed, pausing host for another {self.cooldown}s")
+            elif self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"Circuit breaker open after {self.failures} consecutive failures, pausing host for {self.cooldown}s")
+                self.opened_at = time.monotonic()
+
+def parse_retry_after(response):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+    Returns None when the header is missing or malformed.
+    """
+    value = response.headers.get('retry-after') if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """
+    Exponential backoff with equal jitter for the given (0-based) attempt.
+    """
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+class WikiClient:
+    """
+    Reusable HTTP client with one pooled keep-alive session and one token
+    bucket per host.
+
+    `host_limits` maps a host name to a `(min_interval, burst)` tuple and
+    overrides the defaults for that host. When a `cache` (ResponseCache) is
+    given, cached URLs are revalidated with conditional GETs. Failed requests
+    are retried with exponential backoff (or the server's Retry-After), and a
+    per-host circuit breaker stops hammering a host that keeps failing.
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, burst=DEFAULT_BURST,
+                 host_limits=None, headers=None, timeout=30, max_retries=3, pool_size=4,
+                 cache=None):
+        self.min_interval = min_interval
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+        self.headers = headers or get_headers()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.cache = cache
+        # Optional http_archive.HttpRecorder / HttpReplayer
+        self.recorder = None
+        self.replayer = None
+        self._sessions = {}
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url):
+        """
+        Return the host part of a URL (or the value itself if it is a bare host).
+        """
+        return urlparse(url).netloc or url
+
+    def limiter_for(self, url):
+        """
+        Get (creating on first use) the token bucket for the URL's host.
+        """
+        host = self.host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                min_interval, burst = self.host_limits.get(host, (self.min_interval, self.burst))
+                bucket = TokenBucket(min_interval, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def breaker_for(self, url):
+        """
+        Get (creating on first use) the circuit breaker for the URL's host.
+        """
+        host = self.host_of(url)
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker()
+                self._breakers[host] = breaker
+            return breaker
+
+    def wait_for_breakers(self):
+        """
+        Sleep until every open circuit breaker allows a trial request again.
+        """
+        with self._lock:
+            remaining = max([breaker.remaining() for breaker in self._breakers.values()] or [0])
+        if remaining > 0:
+            print(f"Waiting {remaining:.0f} seconds for the circuit breaker cooldown...")
+            time.sleep(remaining)
+
+    def session_for(self, url):
+        """
+        Get (creating on first use) the pooled session for the URL's host.
+        """
+        host = self.host_of(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method, url, params=None, data=None, headers=None):
+        """
+        Perform a single rate-limited request and return the response.
+        Raises requests.exceptions.RequestException on failure.
+        """
+        if self.replayer:
+            # Replay: answer from the archive with no network and no rate limiting
+            response = self.replayer.response_for(method, url, params, data)
+            response.raise_for_status()
+            return response
+
+        breaker = self.breaker_for(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.host_of(url)} ({breaker.remaining():.0f}s left)")
+
+        self.limiter_for(url).acquire()
+        try:
+            response = self.session_for(url).request(
+                method, url, params=params, data=data, headers=headers, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+
+        if self.recorder:
+            self.recorder.record(method, url, params, data, response)
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        response.raise_for_status()
+        return response
+
+    def get(self, url, headers=None):
+        """
+        Perform a single rate-limited GET and return the response.
+        Raises requests.exceptions.RequestException on failure.
+        """
+        return self.request('GET', url, headers=headers)
+
+    def _with_retries(self, url, attempt_fn, failure_value=None):
+        """
+        Call `attempt_fn()` until it succeeds or the retries run out.
+        Only connection errors and 429/5xx responses are retried; the wait is
+        the server's Retry-After when given, otherwise exponential backoff.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                print(f"Fetching content from: {url} (attempt {attempt + 1}/{self.max_retries})")
+                return attempt_fn()
+            except CircuitOpenError as e:
+                print(f"Not fetching {url}: {e}")
+                return failure_value
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                print(f"Error fetching {url} (attempt {attempt + 1}): {e}")
+                if status not in RETRYABLE_STATUS_CODES:
+                    print(f"HTTP {status} is not retryable, giving up")
+                    return failure_value
+                wait_time = parse_retry_after(e.response)
+                if wait_time is not None and wait_time > MAX_RETRY_AFTER:
+                    print(f"Server asked to retry after {wait_time:.0f}s, giving up for now")
+                    return failure_value
+                if wait_time is None:
+                    wait_time = backoff_delay(attempt)
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching {url} (attempt {attempt + 1}): {e}")
+                wait_time = backoff_delay(attempt)
+
+            if self.breaker_for(url).remaining() > 0:
+                print(f"Circuit open for {self.host_of(url)}, not retrying {url}")
+                return failure_value
+            if attempt < self.max_retries - 1:
+                print(f"Waiting {wait_time:.1f} seconds before retry...")
+                time.sleep(wait_time)
+            else:
+                print("All retry attempts failed")
+        return failure_value
+
+    def fetch_json(self, url, params=None, data=None):
+        """
+        GET (or POST, when `data` is given) a JSON API endpoint with retries.
+        Returns the decoded JSON, or None if every attempt failed.
+        """
+        method = 'POST' if data is not None else 'GET'
+        return self._with_retries(url, lambda: self.request(method, url, params=params, data=data).json())
+
+    def fetch(self, url):
+        """
+        Fetch HTML content from a wiki page with retries.
+        Returns the decoded page text, or None if every attempt failed.
+        """
+        return self.fetch_result(url).text
+
+    def fetch_result(self, url):
+        """
+        Fetch a page like `fetch`, but return a FetchResult so callers can
+        skip re-parsing pages the server reported as not modified.
+        """
+        def attempt():
+            conditional = self.cache.conditional_headers(url) if self.cache else {}
+            response = self.get(url, headers=conditional or None)
+
+            if response.status_code == 304 and conditional:
+                self.limiter_for(url).refund(1 - NOT_MODIFIED_COST)
+                self.cache.record('revalidations')
+                self.cache.record('hits')
+                print(f"Not modified, using cached copy of {url}")
+                return FetchResult(self.cache.load_body(url), True)
+
+            # Check if we got HTML content
+            if 'text/html' in response.headers.get('content-type', ''):
+                text = decompress_content(response)
+            else:
+                print(f"Warning: Response is not HTML. Content-Type: {response.headers.get('content-type')}")
+                text = response.text
+
+            if self.cache:
+                if conditional:
+                    self.cache.record('revalidations')
+                    self.cache.record('changed')
+                else:
+                    self.cache.record('misses')
+                self.cache.store(
+                    url, text,
+                    etag=response.headers.get('etag'),
+                    last_modified=response.headers.get('last-modified'),
+                    content_type=response.headers.get('content-type')
+                )
+            return FetchResult(text, False)
+
+        return self._with_retries(url, attempt, FetchResult(None, False))
+
+    def close(self):
+        """
+        Close every pooled session.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Minimum stats for a wishlist of weapons and spells used together.
+
+Given item names (e.g. a seal, two incantations and a katana),
+WishlistSolver works out:
+
+- `minimum_stats`: the smallest stat vector that unlocks every item, the
+  per-stat maximum of their requirements. Each weapon uses the grip with
+  the lower strength requirement among those allowed (two-handing only
+  for the weapons in `two_handed`, or all of them when it is True), and
+  the result says which weapons that strength leaves two-handed.
+- `rank_classes`: starting classes ordered by how far their stats fall
+  short of that vector, each with the fewest stat items that close the gap
+  (among those it can wear at once) and the grip of each weapon at the
+  class's own strength with those items: two-handing only where that
+  strength is still short of the one-handed requirement
+- `alternatives`: the best k wishlists a class can use, replacing items it
+  cannot (or any items, at a cost) with usable items of the same weapon
+  or spell type. Lists are ranked by the number of replacements, then by
+  the sum of their minimum stats (lower leaves more room).
+
+`alternatives` is a depth-first branch and bound over the wishlist slots.
+Requirements for the whole catalogue are loaded once from the requirement
+matrix into an array, candidates that the class cannot use are removed in
+one vectorized comparison, and for every slot the per-stat maxima of the
+cheapest candidates still to come are precomputed, so a partial list is
+dropped as soon as its running maximum plus those bounds cannot beat the
+k-th best list found.
+
+Usage:
+    python wishlist_solver.py <item> [<item>...] [--one-hand] [--class <class> [-k <n>]]
+"""
+
+import heapq
+import sys
+from itertools import count
+
+import numpy as np
+
+from batch_eligibility import requirement_array
+from class_eligibility import STARTING_CLASSES, STATS, STAT_ITEMS, class_stats, loadout_key, stat_loadouts
+from data_bundle import DEFAULT_RESOURCES_DIR, load_resource_records
+from requirement_matrix import RequirementMatrix
+
+# Requirement matrix columns of the stats after strength
+OTHER_STAT_COLUMNS = [2, 3, 4, 5]
+
+ONE_HAND = 'one_hand'
+TWO_HAND = 'two_hand'
+
+class WishlistSolver:
+    """
+    The catalogue's requirements, kinds and categories as arrays, for
+    answering wishlist queries. Build it with `load`.
+    """
+
+    def __init__(self, requirement_matrix, weapons, spells):
+        if requirement_matrix.names != ([weapon['weapon_name'] for weapon in weapons] +
+                                        [spell['spell_name'] for spell in spells]):
+            raise ValueError("Requirement matrix rows do not match the resource records")
+        self.names = requirement_matrix.names
+        self.requirements = requirement_array(requirement_matrix).astype(np.int32)
+        self.is_weapon = np.zeros(requirement_matrix.rows, dtype=np.bool_)
+        self.is_weapon[:len(weapons)] = True
+        categories = [weapon['weapon_type'] for weapon in weapons] + [spell['spell_type'] for spell in spells]
+        self.category_names = sorted(set(categories))
+        self.categories = np.array([self.category_names.index(category) for category in categories], dtype=np.int16)
+        self.rows = {}  # name -> row, weapons first
+        for row, name in enumerate(self.names):
+            self.rows.setdefault(name, row)
+
+    @classmethod
+    def load(cls, resources_dir=DEFAULT_RESOURCES_DIR):
+        return cls(RequirementMatrix.load(resources_dir), *load_resource_records(resources_dir))
+
+    def row(self, name):
+        if name not in self.rows:
+            raise ValueError(f"Unknown item '{name}'")
+        return self.rows[name]
+
+    def _two_handable(self, two_handed, name):
+        return two_handed is True or (bool(two_handed) and name in two_handed)
+
+    def _needs(self, rows, two_handable):
+        """
+        (len(rows) x 5) stat needs: strength is the lower of the allowed
+        grips' requirements (0 for spells), then the other stats.
+        """
+        requirements = self.requirements[rows]
+        strength = np.where(two_handable, np.minimum(requirements[:, 0], requirements[:, 1]), requirements[:, 0])
+        return np.column_stack([strength, requirements[:, OTHER_STAT_COLUMNS]])
+
+    def _grip(self, row, strength, two_handable):
+        if not self.is_weapon[row]:
+            return None
+        one_hand, two_hand = self.requirements[row, 0], self.requirements[row, 1]
+        return ONE_HAND if one_hand <= strength or not two_handable or two_hand > one_hand else TWO_HAND
+
+    def _grips(self, rows, two_handable, strength):
+        return {self.names[row]: self._grip(row, strength, allowed)
+                for row, allowed in zip(rows, two_handable) if self.is_weapon[row]}
+
+    def minimum_stats(self, wishlist, two_handed=True):
+        """
+        {'stats': {stat: level}, 'grips': {weapon: 'one_hand' or 'two_hand'}}:
+        the least stats that unlock every item in `wishlist` and the grip
+        each weapon needs at them. `two_handed` is True, False or the names
+        of the weapons that may be two-handed.
+        """
+        rows = [self.row(name) for name in wishlist]
+        two_handable = [self._two_handable(two_handed, self.names[row]) for row in rows]
+        needs = self._needs(rows, two_handable).max(axis=0) if rows else np.zeros(len(STATS), dtype=np.int32)
+        stats = dict(zip(STATS, (int(value) for value in needs)))
+        return {'stats': stats, 'grips': self._grips(rows, two_handable, stats['strength'])}
+
+    def rank_classes(self, wishlist, two_handed=True):
+        """
+        Starting classes from closest to furthest from the wishlist's minimum
+        stats: dicts with the class, its per-stat shortfall, the total
+        shortfall, the fewest stat items that remove it (None if no
+        wearable combination of STAT_ITEMS does) and each weapon's grip at
+        the class's strength with those items (without items if none help).
+        """
+        needs = self.minimum_stats(wishlist, two_handed)['stats']
+        rows = [self.row(name) for name in wishlist]
+        two_handable = [self._two_handable(two_handed, self.names[row]) for row in rows]
+        loadouts = stat_loadouts()
+        ranking = []
+        for class_name in STARTING_CLASSES:
+            stats = class_stats(class_name)
+            shortfall = {stat: max(0, needs[stat] - stats[stat]) for stat in STATS}
+            items = next((items for items in loadouts
+                          if all(level >= needs[stat] for stat, level in class_stats(class_name, items).items())), None)
+            strength = class_stats(class_name, items or ())['strength']
+            ranking.append({
+                'class': class_name,
+                'shortfall': shortfall,
+                'missing': sum(shortfall.values()),
+                'items': items,
+                'grips': self._grips(rows, two_handable, strength),
+            })
+        # Closest first, then fewest stat items (the sort keeps the game's class order for ties)
+        ranking.sort(key=lambda entry: (entry['missing'],
+                                        len(entry['items']) if entry['items'] is not None else len(STAT_ITEMS) + 1))
+        return ranking
+
+    def alternatives(self, wishlist, class_name, k=5, two_handed=True, items=()):
+        """
+        Up to `k` wishlists usable by `class_name` with the stat `items`,
+        best first: dicts with the items, the number of replaced items and
+        the minimum stats. Each slot holds the wished item or a different
+        item of the same weapon or spell type.
+        """
+        target = np.array([class_stats(class_name, items)[stat] for stat in STATS], dtype=np.int32)
+        rows = [self.row(name) for name in wishlist]
+        if not rows or k <= 0:
+            return []
+
+        wished = set(rows)
+        slots = []  # per slot: [(replaced, need tuple, row)], wished items first, then by need total
+        for row in rows:
+            two_handable = self._two_handable(two_handed, self.names[row])
+            candidates = np.flatnonzero((self.categories == self.categories[row]) &
+                                        (self.is_weapon == self.is_weapon[row]))
+            needs = self._needs(candidates, two_handable)
+            usable = (needs <= target).all(axis=1)
+            options = sorted(((int(int(candidate) not in wished), tuple(int(value) for value in need), int(candidate))
+                              for candidate, need in zip(candidates[usable], needs[usable])),
+                             key=lambda option: (option[0], sum(option[1]), option[2]))
+            if not options:
+                return []
+            slots.append((options, two_handable))
+
+        # Slots with the same candidates are interchangeable: only lists
+        # with increasing rows across them are searched
+        previous = []
+        last_slot = {}
+        groups = {}  # slots of each interchangeable group
+        for i, row in enumerate(rows):
+            group = (int(self.categories[row]), bool(self.is_weapon[row]), slots[i][1])
+            previous.append(last_slot.get(group))
+            last_slot[group] = i
+            groups.setdefault(group, []).append(i)
+
+        def in_wished_order(chosen_rows):
+            """
+            The rows with every kept wished item back in its own slot; the
+            replacements fill the other slots of its group in row order.
+            """
+            ordered = list(chosen_rows)
+            for group_slots in groups.values():
+                remaining = [chosen_rows[i] for i in group_slots]
+                kept = {}
+                for i in group_slots:
+                    if rows[i] in remaining:
+                        remaining.remove(rows[i])
+                        kept[i] = rows[i]
+                for i in group_slots:
+                    ordered[i] = kept[i] if i in kept else remaining.pop(0)
+            return ordered
+
+        # Lower bound on the needs of the slots from i on: the per-stat
+        # maxima of each slot's smallest needs
+        floors = [(0,) * len(STATS)] * (len(slots) + 1)
+        for i in range(len(slots) - 1, -1, -1):
+            options = slots[i][0]
+            slot_floor = tuple(min(option[1][stat] for option in options) for stat in range(len(STATS)))
+            floors[i] = tuple(map(max, floors[i + 1], slot_floor))
+        # Wished items the class can use; every other remaining slot is a replacement
+        usable_wished = {option[2] for options, _ in slots for option in options if not option[0]}
+
+        best = []  # heap of (-replaced, -total, -found, chosen rows, needs): worst list on top
+        chosen = []
+        found = count()
+
+        def search(i, replaced, needs):
+            unavoidable = max(0, len(slots) - i - len(usable_wished.difference(chosen)))
+            bound = (replaced + unavoidable, sum(map(max, needs, floors[i])))
+            if len(best) == k and bound >= (-best[0][0], -best[0][1]):
+                return
+            if i == len(slots):
+                entry = (-replaced, -sum(needs), -next(found), list(chosen), needs)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                else:
+                    heapq.heapreplace(best, entry)
+                return
+            floor_row = chosen[previous[i]] if previous[i] is not None else -1
+            for option_replaced, option_needs, option_row in slots[i][0]:
+                if option_row <= floor_row or option_row in chosen:
+                    continue
+                chosen.append(option_row)
+                search(i + 1, replaced + option_replaced, tuple(map(max, needs, option_needs)))
+                chosen.pop()
+
+        search(0, 0, (0,) * len(STATS))
+        results = []
+        for negative_replaced, _, _, chosen_rows, needs in sorted(best, key=lambda entry: (-entry[0], -entry[1], -entry[2])):
+            chosen_rows = in_wished_order(chosen_rows)
+            results.append({
+                'items': [self.names[row] for row in chosen_rows],
+                'replaced': -negative_replaced,
+                'stats': dict(zip(STATS, needs)),
+                # At the class's own strength: two-handed only where that is short one-handed
+                'grips': self._grips(chosen_rows, [allowed for _, allowed in slots], int(target[0])),
+            })
+        return results
+
+def _format_stats(stats):
+    return ', '.join(f"{stat[:3].upper()} {level}" for stat, level in stats.items())
+
+def _format_two_handed(grips):
+    two_handed = [name for name, grip in grips.items() if grip == TWO_HAND]
+    return f"; two-hand {', '.join(two_handed)}" if two_handed else ''
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    class_arg = args[args.index('--class') + 1] if '--class' in args else None
+    best_count = int(args[args.index('-k') + 1]) if '-k' in args else 5
+    wished = [arg for i, arg in enumerate(args)
+              if not arg.startswith('-') and (i == 0 or args[i - 1] not in ('--class', '-k'))]
+    two_hand = '--one-hand' not in args
+    solver = WishlistSolver.load()
+
+    try:
+        minimum = solver.minimum_stats(wished, two_hand)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Minimum stats: {_format_stats(minimum['stats'])}{_format_two_handed(minimum['grips'])}")
+    print("\nStarting classes:")
+    for entry in solver.rank_classes(wished, two_hand):
+        items_text = 'usable' if not entry['missing'] else (
+            f"with {loadout_key(entry['items'])}" if entry['items'] is not None else "not reachable with stat items")
+        print(f"  {entry['class']:>10}: {entry['missing']:>3} short ({items_text}{_format_two_handed(entry['grips'])})")
+    if class_arg:
+        print(f"\nBest {best_count} wishlists for {class_arg}:")
+        for alternative in solver.alternatives(wished, class_arg, best_count, two_hand):
+            print(f"  {alternative['replaced']} replaced | {_format_stats(alternative['stats'])} | "
+                  f"{', '.join(alternative['items'])}{_format_two_handed(alternative['grips'])}")
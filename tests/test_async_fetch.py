@@ -0,0 +1,50 @@
+import time
+
+from async_fetch import fetch_pages, start_stub_server
+from wiki_client import WikiClient
+
+LATENCY = 0.05
+PAGES = 24
+
+def _fetch_all(urls, concurrency, per_host_concurrency):
+    client = WikiClient(min_interval=0, max_retries=1, pool_size=concurrency)
+    handled = []
+    start = time.perf_counter()
+    try:
+        fetch_pages(client, list(enumerate(urls)), lambda key, result: handled.append((key, result.text)),
+                    concurrency=concurrency, per_host_concurrency=per_host_concurrency)
+    finally:
+        client.close()
+    return time.perf_counter() - start, handled
+
+def test_concurrency_scales_throughput():
+    server = start_stub_server(LATENCY)
+    try:
+        urls = [f"http://127.0.0.1:{server.server_port}/wiki/Page_{i}" for i in range(PAGES)]
+        serial, serial_handled = _fetch_all(urls, 1, 1)
+        parallel, parallel_handled = _fetch_all(urls, 8, 8)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert sorted(key for key, _ in serial_handled) == list(range(PAGES))
+    assert sorted(key for key, _ in parallel_handled) == list(range(PAGES))
+    assert all(text for _, text in parallel_handled)
+    # 8 workers against a fixed latency: well over 3x the single-worker rate
+    assert parallel < serial / 3, f"concurrency 8 took {parallel:.2f}s, concurrency 1 took {serial:.2f}s"
+
+def test_per_host_limit_caps_in_flight_requests():
+    server = start_stub_server(LATENCY)
+    try:
+        hosts = [f"127.0.0.1:{server.server_port}", f"localhost:{server.server_port}"]
+        urls = [f"http://{hosts[i % 2]}/wiki/Page_{i}" for i in range(PAGES)]
+        _, handled = _fetch_all(urls, 8, 2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(handled) == PAGES
+    assert set(server.peak_in_flight) == set(hosts)
+    assert all(peak <= 2 for peak in server.peak_in_flight.values()), server.peak_in_flight
+    # Both hosts were busy at once: the global limit is not what capped them
+    assert all(peak == 2 for peak in server.peak_in_flight.values()), server.peak_in_flight
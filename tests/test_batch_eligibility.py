@@ -0,0 +1,36 @@
+import pytest
+
+from batch_eligibility import batch_eligibility, stat_grid
+from class_eligibility import (GREAT_RUNES, LOADOUTS, STARTING_CLASSES, TALISMAN_SLOTS, class_stats,
+                               load_class_eligibility, loadout_key)
+from requirement_matrix import RequirementMatrix
+
+def test_no_grid_row_wears_more_talismans_than_slots():
+    labels, stats = stat_grid()
+    assert len(labels) == len(stats)
+    for class_name, key in labels:
+        items = set(key.split(' + ')) if key else set()
+        assert len(items - GREAT_RUNES) <= TALISMAN_SLOTS, (class_name, key)
+        assert len(items & GREAT_RUNES) <= 1, (class_name, key)
+    # The grid still reaches each class with the Great Rune and four talismans
+    assert max(len(key.split(' + ')) for _, key in labels) == TALISMAN_SLOTS + 1
+
+def test_class_stats_rejects_a_fifth_talisman():
+    talismans = ["Radagon's Soreseal", "Marika's Soreseal", "Starscourge Heirloom",
+                 "Prosthesis-Wearer Heirloom", "Stargazer Heirloom"]
+    class_stats('Wretch', talismans[:TALISMAN_SLOTS])
+    with pytest.raises(ValueError):
+        class_stats('Wretch', talismans)
+
+def test_grid_rows_match_the_class_bitsets():
+    requirement_matrix = RequirementMatrix.load()
+    eligibility = load_class_eligibility()
+    labels, stats = stat_grid()
+    keys = {loadout_key(items) for items in LOADOUTS}
+    for two_handed in (False, True):
+        packed = batch_eligibility(requirement_matrix, stats, two_handed, packed=True)
+        for (class_name, key), row in zip(labels, packed):
+            if key in keys:
+                items = key.split(' + ') if key else ()
+                assert row.tobytes() == eligibility.bitset(class_name, two_handed, items), (class_name, key)
+    assert {class_name for class_name, _ in labels} == set(STARTING_CLASSES)
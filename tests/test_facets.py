@@ -0,0 +1,46 @@
+import copy
+
+from data_bundle import load_resource_records
+from facets import (CODE, MASK, MAX_MASK_BITS, SPELL_FACETS, WEAPON_FACETS, annotate_all, decode_facet,
+                    field_values, load_facet_dictionary)
+
+def test_committed_facets_decode_to_the_record_fields():
+    weapons, spells = load_resource_records()
+    dictionary = load_facet_dictionary()
+    for records, facets in ((weapons, WEAPON_FACETS), (spells, SPELL_FACETS)):
+        for record in records:
+            for facet, path, vocabulary, encoding in facets:
+                values = field_values(record, path)
+                decoded = decode_facet(dictionary, vocabulary, encoding, record['facets'][facet])
+                if encoding == CODE:
+                    assert [decoded] == values, (facet, record)
+                else:
+                    assert set(decoded) == set(values), (facet, record)
+
+def test_reexport_matches_the_committed_facets():
+    weapons, spells = load_resource_records()
+    committed = [record['facets'] for record in weapons + spells]
+    dictionary = annotate_all(weapons, spells, load_facet_dictionary())
+    assert dictionary == load_facet_dictionary()
+    assert [record['facets'] for record in weapons + spells] == committed
+
+def test_new_values_are_appended_without_moving_existing_codes():
+    weapons, spells = load_resource_records()
+    previous = load_facet_dictionary()
+    committed = [record['facets'] for record in weapons + spells]
+    new_weapon = copy.deepcopy(weapons[0])
+    new_weapon['weapon_type'] = 'Aaa New Type'
+    new_weapon['damage_types']['minor'] = ['Aaa New Damage']
+
+    dictionary = annotate_all(weapons + [new_weapon], spells, previous)
+    assert dictionary['vocabularies']['weapon_type'] == previous['vocabularies']['weapon_type'] + ['Aaa New Type']
+    assert dictionary['vocabularies']['damage_type'] == previous['vocabularies']['damage_type'] + ['Aaa New Damage']
+    assert [record['facets'] for record in weapons + spells] == committed
+    assert new_weapon['facets']['weapon_type'] == len(previous['vocabularies']['weapon_type'])
+
+def test_masks_fit_in_32_bit_integers():
+    dictionary = load_facet_dictionary()
+    for facets in (WEAPON_FACETS, SPELL_FACETS):
+        for _, _, vocabulary, encoding in facets:
+            if encoding == MASK:
+                assert len(dictionary['vocabularies'][vocabulary]) <= MAX_MASK_BITS
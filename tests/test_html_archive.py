@@ -0,0 +1,31 @@
+import os
+
+from html_archive import HtmlArchive, read_html
+from scrape_store import ScrapeStore
+
+def test_a_refreshed_local_file_wins_over_the_archive(tmp_path):
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    page_path = str(tmp_path / "weapons_page.html")
+    with open(page_path, 'w', encoding='utf-8') as f:
+        f.write("<html>old</html>")
+    assert read_html(page_path, archive) == "<html>old</html>"
+
+    with open(page_path, 'w', encoding='utf-8') as f:
+        f.write("<html>new</html>")
+    assert read_html(page_path, archive) == "<html>new</html>"
+    assert len(archive.history("weapons_page.html")) == 2
+    # Reading it again does not add a snapshot
+    read_html(page_path, archive)
+    assert len(archive.history("weapons_page.html")) == 2
+
+    os.remove(page_path)
+    assert read_html(page_path, archive) == "<html>new</html>"
+
+def test_store_pages_are_kept_in_the_archive(tmp_path):
+    with ScrapeStore(str(tmp_path / "scrape.db")) as store:
+        assert store.save_page("https://example.org/wiki/A", "<p>same</p>")
+        assert store.save_page("https://example.org/wiki/B", "<p>same</p>")
+        assert not store.save_page("https://example.org/wiki/A", "<p>same</p>")
+        assert store.page_html("https://example.org/wiki/B") == "<p>same</p>"
+        assert store.archive.stats()['blobs'] == 1
+    assert os.path.exists(tmp_path / "html_archive" / "index.json")
@@ -0,0 +1,27 @@
+import hashlib
+import json
+import os
+import shutil
+
+from data_bundle import DEFAULT_RESOURCES_DIR
+from manifest import MANIFEST_FILENAME, write_manifest
+
+def test_a_changed_derived_file_rewrites_the_manifest(tmp_path):
+    resources_dir = str(tmp_path / "resources")
+    shutil.copytree(DEFAULT_RESOURCES_DIR, resources_dir)
+    manifest_path = os.path.join(resources_dir, MANIFEST_FILENAME)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        before = json.load(f)
+    assert write_manifest(resources_dir) == []
+
+    eligibility_path = os.path.join(resources_dir, 'class_eligibility.json')
+    with open(eligibility_path, 'ab') as f:
+        f.write(b' ')
+    assert manifest_path in write_manifest(resources_dir)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        after = json.load(f)
+    with open(eligibility_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    assert after['files']['class_eligibility.json']['sha256'] == digest
+    # Derived files are listed but do not move the data version
+    assert after['data_version'] == before['data_version']
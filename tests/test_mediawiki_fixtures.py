@@ -0,0 +1,33 @@
+import contextlib
+import io
+
+from data_bundle import load_resource_records
+from mediawiki_api import MediaWikiAPI
+from mediawiki_fixture_server import DEFAULT_FIXTURES_FILE, FIXTURE_REDIRECTS, FixtureAPIServer, load_fixtures
+from weapon_page import extract_weapon_page
+from wiki_client import WikiClient
+
+def test_committed_fixtures_extract_like_the_resource_records():
+    fixtures = load_fixtures(DEFAULT_FIXTURES_FILE)
+    weapons = {weapon['weapon_name']: weapon for weapon in load_resource_records()[0]}
+    server = FixtureAPIServer(fixtures).start()
+    try:
+        api = MediaWikiAPI(WikiClient(min_interval=0), server.api_url)
+        titles = list(fixtures['pages']) + list(FIXTURE_REDIRECTS)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pages_html, revision_ids = api.fetch_pages_html(titles)
+            pages = {title: extract_weapon_page(page_html) for title, page_html in pages_html.items()}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert sorted(pages) == sorted(titles)
+    assert api.requests_made == 2
+    for redirect, target in FIXTURE_REDIRECTS.items():
+        assert revision_ids[redirect] == revision_ids[target]
+    for title, page in pages.items():
+        weapon = weapons[page.name]
+        assert page.attributes == weapon['attributes'], title
+        assert page.damage_types['major'] == weapon['damage_types']['major'], title
+        assert set(page.damage_types['minor']) == set(weapon['damage_types']['minor']), title
+        assert page.image == weapon['image'], title
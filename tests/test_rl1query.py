@@ -0,0 +1,17 @@
+from data_bundle import load_resource_records
+from facets import facet_code, load_facet_dictionary
+from rl1query import BOTH, RL1Query, check, synthetic_records
+
+def test_query_matches_the_frontend_filter():
+    weapons, spells = load_resource_records()
+    assert check(weapons, spells) == []
+    assert check(*synthetic_records(5000, weapons=weapons, spells=spells)) == []
+
+def test_codes_are_the_facet_dictionary_codes():
+    dictionary = load_facet_dictionary()
+    engine = RL1Query.load()
+    katanas = engine.query(data_type=BOTH, weapon_types=['Katanas'], ignore_stats=True)
+    assert len(katanas) and set(katanas.column('weapon_type')) == {facet_code(dictionary, 'weapon_type', 'Katanas')}
+    bleed = engine.query(data_type=BOTH, status_buildups=['Blood Loss'], ignore_stats=True)
+    assert set(bleed.column('status_buildup')) == {facet_code(dictionary, 'status_buildup', 'Blood Loss')}
+    assert all(record['status_buildup'] == 'Blood Loss' for record in bleed)
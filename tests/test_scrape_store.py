@@ -0,0 +1,36 @@
+import os
+import shutil
+
+import pytest
+
+from data_bundle import DEFAULT_RESOURCES_DIR
+from scrape_store import ScrapeStore
+
+def _resources_copy(tmp_path):
+    resources_dir = str(tmp_path / "resources")
+    shutil.copytree(DEFAULT_RESOURCES_DIR, resources_dir)
+    return resources_dir
+
+def _resource_files(resources_dir):
+    return sorted(name for name in os.listdir(resources_dir) if name.startswith(('weapons_', 'spells_')))
+
+def test_export_refuses_a_store_without_spells(tmp_path):
+    resources_dir = _resources_copy(tmp_path)
+    before = _resource_files(resources_dir)
+    with ScrapeStore(str(tmp_path / "scrape.db")) as store:
+        store.add_weapon('/wiki/Hand_Axe', {'wikiGGLink': 'https://eldenring.wiki.gg/wiki/Hand_Axe',
+                                            'weapon_type': 'Axes', 'weapon_name': 'Hand Axe'})
+        with pytest.raises(ValueError):
+            store.export_resources(resources_dir)
+    assert _resource_files(resources_dir) == before
+
+def test_seeded_store_exports_the_same_files(tmp_path):
+    resources_dir = _resources_copy(tmp_path)
+    with ScrapeStore(str(tmp_path / "scrape.db")) as store:
+        store.seed(resources_dir)
+        store.export_resources(resources_dir)
+    assert _resource_files(resources_dir) == _resource_files(DEFAULT_RESOURCES_DIR)
+    for name in _resource_files(resources_dir) + ['data_bundle.json', 'requirements.u8']:
+        with open(os.path.join(resources_dir, name), 'rb') as exported, \
+                open(os.path.join(DEFAULT_RESOURCES_DIR, name), 'rb') as committed:
+            assert exported.read() == committed.read(), name
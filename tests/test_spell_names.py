@@ -0,0 +1,17 @@
+from spell_names import SpellImageIndex
+
+IMAGES = {"Glintstone Pebbles": "pebbles.png", "Glintstone Pebble": "pebble.png"}
+
+def test_exact_matches_are_reserved_before_fuzzy_matching():
+    # Looked up first on its own, the misspelling takes the other spell's image
+    assert SpellImageIndex(IMAGES).lookup("Glintstone Pebbless")[1] == "pebbles.png"
+    index = SpellImageIndex(IMAGES)
+    matches = index.lookup_all(["Glintstone Pebbless", "Glintstone Pebbles"])
+    assert matches["Glintstone Pebbles"][1:] == ("pebbles.png", 1.0)
+    assert matches["Glintstone Pebbless"][1] == "pebble.png"
+    assert index.unused() == {}
+
+def test_unused_lists_the_images_no_spell_took():
+    index = SpellImageIndex({"Rock Sling": "rock.png", "Comet": "comet.png"})
+    index.lookup_all(["Rock Sling", "Unknown Spell"])
+    assert index.unused() == {"Comet": "comet.png"}
@@ -0,0 +1,21 @@
+import contextlib
+import io
+
+from html_parsing import available_parser_backends, parse_html
+from mediawiki_fixture_server import fixture_page_views
+from weapon_page import WEAPON_PAGE_TARGETS, extract_weapon_page
+
+def test_targeted_parsing_matches_the_full_page_on_every_backend():
+    pages = fixture_page_views()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [extract_weapon_page(page, 'html.parser', None) for page in pages]
+        for backend in available_parser_backends():
+            assert [extract_weapon_page(page, backend) for page in pages] == expected, backend
+
+def test_targeted_tree_keeps_only_content_area_images():
+    page = fixture_page_views()[0]
+    for backend in available_parser_backends():
+        soup = parse_html(page, WEAPON_PAGE_TARGETS, backend)
+        sources = [img['src'] for img in soup.find_all('img')]
+        assert sources and not any('Wiki_Logo' in src or 'poweredby' in src for src in sources), backend
+        assert soup.find('a') is None, backend
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from wiki_client import CircuitBreaker
+
+def _open_breaker(cooldown=0.05):
+    breaker = CircuitBreaker(threshold=2, cooldown=cooldown)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+    return breaker
+
+def test_half_open_breaker_lets_exactly_one_trial_through():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    allowed = []
+    threads = [threading.Thread(target=lambda: allowed.append(breaker.allow())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert allowed.count(True) == 1
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.remaining() > 0
+    time.sleep(0.06)
+    assert breaker.allow()
+
+def test_successful_trial_closes_the_breaker():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+    assert breaker.remaining() == 0
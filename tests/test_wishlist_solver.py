@@ -0,0 +1,44 @@
+import pytest
+
+from class_eligibility import GREAT_RUNES, TALISMAN_SLOTS, class_stats
+from wishlist_solver import ONE_HAND, TWO_HAND, WishlistSolver
+
+def test_rank_classes_suggests_two_handing_only_when_strength_is_short():
+    solver = WishlistSolver.load()
+    one_hand, two_hand = (int(value) for value in solver.requirements[solver.row('Claymore'), :2])
+    assert two_hand < one_hand
+    for entry in solver.rank_classes(['Claymore']):
+        strength = class_stats(entry['class'], entry['items'] or ())['strength']
+        expected = ONE_HAND if strength >= one_hand else TWO_HAND
+        assert entry['grips'] == {'Claymore': expected}, entry
+
+def test_rank_classes_items_are_wearable():
+    solver = WishlistSolver.load()
+    for entry in solver.rank_classes(['Zweihander', 'Greatsword', 'Moonveil']):
+        if entry['items'] is not None:
+            items = set(entry['items'])
+            assert len(items - GREAT_RUNES) <= TALISMAN_SLOTS, entry
+            assert len(items & GREAT_RUNES) <= 1, entry
+
+def test_alternatives_grips_use_the_class_strength():
+    solver = WishlistSolver.load()
+    strength = class_stats('Hero')['strength']
+    for alternative in solver.alternatives(['Claymore'], 'Hero', k=3):
+        for name, grip in alternative['grips'].items():
+            one_hand = int(solver.requirements[solver.row(name), 0])
+            assert grip == (ONE_HAND if one_hand <= strength else TWO_HAND), alternative
+
+def test_alternatives_keep_wished_items_in_their_slots():
+    solver = WishlistSolver.load()
+    wishlist = ['Uchigatana', 'Glintstone Pebble', 'Glintstone Staff', 'Carian Slicer', 'Rock Sling']
+    alternatives = solver.alternatives(wishlist, 'Astrologer', k=3, items=("Radagon's Soreseal",))
+    assert alternatives
+    for alternative in alternatives:
+        kept = [wished == item for wished, item in zip(wishlist, alternative['items'])]
+        assert sum(kept) == len(wishlist) - alternative['replaced'], alternative
+        assert kept[:4] == [True] * 4, alternative
+
+def test_unknown_items_are_named():
+    solver = WishlistSolver.load()
+    with pytest.raises(ValueError, match="'Uchigatna'"):
+        solver.minimum_stats(['Uchigatna'])
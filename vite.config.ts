@@ -13,6 +13,10 @@ export default defineConfig({
     vueJsx(),
     vueDevTools(),
   ],
+  json: {
+    // Emit imported JSON (the data bundle) as JSON.parse('...'), which parses faster than an object literal
+    stringify: true,
+  },
   resolve: {
     alias: {
       '@': fileURLToPath(new URL('./src', import.meta.url))